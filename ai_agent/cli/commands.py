@@ -1,34 +1,33 @@
 """CLI commands for the AI agent."""
 
+import io
 import os
+import re
 import sys
+import stat
+import time
+import atexit
+import contextlib
+import fnmatch
+import zipfile
+import threading
+import functools
 import click
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional, List, Dict, Any, Sequence, Iterable
 import logging
 from datetime import datetime
 
-from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn
-from rich.prompt import Prompt, Confirm
-from rich.markdown import Markdown
-
-try:
-    from docx import Document as DocxDocument
-except ImportError:
-    DocxDocument = None
-
-from ..core.document_manager import DocumentManager, DocumentManagerError
+# Core components load ChromaDB and Ollama, rich takes a quarter of the
+# import time of this module; both are imported where used
 from ..models.document import DocumentCategory
-from ..core.session_manager import SessionManager, SessionManagerError
-from ..core.query_processor import QueryProcessor, QueryProcessorError
-from ..core.ollama_client import OllamaClient, OllamaConnectionError
 from ..utils.logging_config import get_logger
 from ..utils.performance_monitor import performance_monitor
 from ..utils.cache_manager import cache_manager
-from ..utils.async_processor import async_processor
+from ..utils.embedding_cache import EmbeddingCache
+from ..utils.parse_cache import ParseCache
+from ..utils.json_utils import dumps as json_dumps
 from ..utils.performance_monitor import performance_tracker
 from ..utils.error_handling import (
     handle_error, create_error, ErrorCategory, ErrorSeverity,
@@ -37,69 +36,500 @@ from ..utils.error_handling import (
 from ..utils.health_monitor import health_monitor
 
 
-console = Console()
+class _LazyConsole:
+    """Rich console created on first use.
+    
+    Attribute access and the context manager protocol (used by Live to
+    lock the console) are forwarded to the console, so ``--help`` and other
+    output-free paths never import rich.
+    """
+    
+    def __init__(self):
+        self._console = None
+        self._lock = threading.Lock()
+    
+    def _get_console(self):
+        if self._console is None:
+            with self._lock:
+                if self._console is None:
+                    from rich.console import Console
+                    self._console = Console()
+        return self._console
+    
+    def __getattr__(self, name):
+        return getattr(self._get_console(), name)
+    
+    def __enter__(self):
+        return self._get_console().__enter__()
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._get_console().__exit__(exc_type, exc_value, traceback)
+
+
+console = _LazyConsole()
 logger = get_logger(__name__)
 
+# Category option values; click.Choice has already validated them
+_CATEGORY_MAP = {c.value: c for c in DocumentCategory}
+_CATEGORY_CHOICES = sorted(_CATEGORY_MAP)
+
+# Metadata options of the form key=value
+_KV_RE = re.compile(r'([^=]+)=(.*)', re.DOTALL)
+
+# Batch upload patterns of the form "*.ext" are matched by suffix
+_SUFFIX_PATTERN_RE = re.compile(r'^\*\.[^*?\[\].]+$')
+
+# Text extracted from files, reused until the file changes
+_parse_cache = ParseCache()
+
+# Description and extraction features shown by the formats command
+_FORMAT_INFO = {
+    '.txt': ('Plain Text', 'Базовое извлечение текста'),
+    '.md': ('Markdown', 'Извлечение текста с подсчетом элементов'),
+    '.docx': ('Microsoft Word', 'Текст, таблицы, метаданные документа'),
+    '.pdf': ('PDF Document', 'Текст по страницам, метаданные'),
+    '.rtf': ('Rich Text Format', 'Извлечение форматированного текста')
+}
+
+# File size units, each 1024 times the previous one
+_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
+# Default number of parallel batch upload workers
+_DEFAULT_UPLOAD_WORKERS = min(8, os.cpu_count() or 1)
+
+# Threads taking the sizes of found files, stat is a round trip on
+# network file systems
+_SCAN_STAT_WORKERS = 8
+
+# Files uploaded per batched DocumentManager call; a failed batch is
+# retried file by file, so smaller batches redo less work
+_BATCH_UPLOAD_SIZE = int(os.getenv('AI_AGENT_BATCH_SIZE', '100'))
+
+# File tables longer than the limit show only their first and last rows
+_FILE_TABLE_ROW_LIMIT = 200
+_FILE_TABLE_HEAD_ROWS = 100
+_FILE_TABLE_TAIL_ROWS = 20
+
+# Longer responses are printed as plain text instead of Markdown
+_MARKDOWN_RESPONSE_LIMIT = 8000
+
+# Characters and line starts that can make text render differently as Markdown
+_MARKDOWN_SYNTAX_RE = re.compile(
+    r'[#*_`\[\]|>~<&\\]|^ *(?:[-+]|\d+[.)])\s|^ *(?:=+|-+) *$|^ {4}', re.MULTILINE
+)
+
+# Shortest CPU usage sampling window of the status command, in seconds
+_CPU_SAMPLE_MIN_INTERVAL = 0.1
+
+# Document and session stats shown by status are reused for this many seconds
+_STATUS_STATS_TTL = 2.0
+_status_stats = None
+
+# Minimum interval between re-renders of a streamed response, in seconds
+_STREAM_REFRESH_INTERVAL = 0.125
+
+def _parse_kv(items: Sequence[str]) -> Dict[str, str]:
+    """Parse key=value option values into a dict.
+    
+    Args:
+        items: Option values; items without '=' are ignored.
+        
+    Returns:
+        Parsed metadata dict.
+    """
+    return {m.group(1): m.group(2) for m in map(_KV_RE.fullmatch, items) if m}
+
+
+def _parse_csv(value: Optional[str]) -> List[str]:
+    """Parse a comma-separated option value into a list.
+    
+    Args:
+        value: Option value, may be None.
+        
+    Returns:
+        Stripped non-empty items.
+    """
+    if not value:
+        return []
+    return [item for item in map(str.strip, value.split(',')) if item]
+
+
+def _ellipsize(text: str, limit: int) -> str:
+    """Shorten text to ``limit`` characters followed by an ellipsis."""
+    return text if len(text) <= limit else f"{text[:limit]}…"
+
+
+def _short_id(item_id: str) -> str:
+    """Shorten a document or session ID for display."""
+    return f"{item_id[:8]}..."
+
+
+def _format_tags(tags: Any, limit: Optional[int] = None) -> str:
+    """Format document tags for a table cell.
+    
+    Args:
+        tags: Tags as a list or a comma-separated string, as stored in metadata.
+        limit: Maximum number of tags to show, the rest are counted as "+N".
+        
+    Returns:
+        Comma-separated tags, or "нет" if there are none.
+    """
+    if not tags:
+        return "нет"
+    if not isinstance(tags, str):
+        tags = ','.join(tags)
+    return _format_tag_string(tags, limit)
+
+
+@functools.lru_cache(maxsize=1024)
+def _format_tag_string(tags: str, limit: Optional[int]) -> str:
+    """Format a comma-separated tag string, cached since listings repeat tags."""
+    tag_list = tags.split(',')
+    if limit is None or len(tag_list) <= limit:
+        return ', '.join(tag_list)
+    return f"{', '.join(tag_list[:limit])} +{len(tag_list) - limit}"
+
+
+def _confirm(prompt: str, assume_yes: bool = False) -> bool:
+    """Ask for confirmation unless it was given up front.
+
+    Args:
+        prompt: Question to ask.
+        assume_yes: True if the command was run with --yes.
+
+    Returns:
+        True if the action is confirmed. Without a terminal on stdin
+        (scripts, pipes, xargs) nobody can answer, so the action is confirmed.
+    """
+    if assume_yes or not sys.stdin.isatty():
+        return True
+    
+    from rich.prompt import Confirm
+    return Confirm.ask(prompt)
+
+
+# Confirmation prompts of the delete options, also asked by the daemon client
+_DELETE_PROMPTS = {
+    'docs': "Удалить документ {}?",
+    'session': "Удалить сессию {}?",
+}
+
+
+def _current_parse_cache() -> Optional[ParseCache]:
+    """Get the parse cache, or None if the command was run with --no-cache."""
+    ctx = click.get_current_context(silent=True)
+    if ctx is not None and ctx.find_root().params.get('no_cache'):
+        return None
+    return _parse_cache
+
+
+# Spinner progress shared by all commands, created on first use
+_shared_progress = None
+_progress_lock = threading.Lock()
+_active_progress_tasks = 0
+
+# The spinner is only shown for operations still running after this many
+# seconds; faster ones finish without starting the live display
+_SPINNER_DELAY = 0.15
+_progress_timer: Optional[threading.Timer] = None
+_progress_shown = False
+
+
+def _get_progress():
+    """Get the shared spinner progress, creating it on first use.
+    
+    Returns:
+        Shared Progress instance.
+    """
+    global _shared_progress
+    
+    with _progress_lock:
+        if _shared_progress is None:
+            from rich.progress import Progress, SpinnerColumn, TextColumn
+            
+            _shared_progress = Progress(
+                SpinnerColumn(),
+                TextColumn("[progress.description]{task.description}"),
+                console=console
+            )
+        return _shared_progress
+
+
+def _start_progress_task(description: str):
+    """Add a spinner task to the shared progress.
+    
+    The spinner is shown once the task has been running for
+    ``_SPINNER_DELAY`` seconds.
+    
+    Args:
+        description: Initial task description.
+        
+    Returns:
+        Task ID to pass to _finish_progress_task.
+    """
+    global _active_progress_tasks, _progress_timer
+    
+    progress = _get_progress()
+    with _progress_lock:
+        if _active_progress_tasks == 0:
+            timer = threading.Timer(_SPINNER_DELAY, lambda: _show_progress(progress, timer))
+            timer.daemon = True
+            _progress_timer = timer
+            timer.start()
+        _active_progress_tasks += 1
+        return progress.add_task(description, total=None)
+
+
+def _show_progress(progress, timer: threading.Timer) -> None:
+    """Start the spinner display unless its tasks finished in the meantime."""
+    global _progress_shown
+    
+    with _progress_lock:
+        if _progress_timer is timer and _active_progress_tasks and not _progress_shown:
+            progress.start()
+            _progress_shown = True
+
+
+def _finish_progress_task(task) -> None:
+    """Remove a spinner task from the shared progress.
+    
+    The live display is paused when no tasks are left, so prompts are not
+    redrawn over by the spinner. The last task state stays on screen.
+    
+    Args:
+        task: Task ID returned by _start_progress_task.
+    """
+    global _active_progress_tasks, _progress_timer, _progress_shown
+    
+    progress = _get_progress()
+    with _progress_lock:
+        _active_progress_tasks -= 1
+        if _active_progress_tasks == 0:
+            if _progress_timer is not None:
+                _progress_timer.cancel()
+                _progress_timer = None
+            if _progress_shown:
+                progress.stop()
+                _progress_shown = False
+        progress.remove_task(task)
+
+
+@contextlib.contextmanager
+def _progress_task(description: str):
+    """Show a spinner task for the duration of a block.
+    
+    Args:
+        description: Initial task description.
+        
+    Yields:
+        Tuple of the shared progress and the task ID, for status updates.
+    """
+    task = _start_progress_task(description)
+    try:
+        yield _get_progress(), task
+    finally:
+        _finish_progress_task(task)
+
+
+def _stop_progress() -> None:
+    """Stop the shared progress display at interpreter exit."""
+    if _shared_progress is not None:
+        _shared_progress.stop()
+
+
+atexit.register(_stop_progress)
+
+
+def _exit_with_error(message: str, suggestions: Optional[List[str]] = None) -> None:
+    """Print an error with its suggestions and exit with status 1.
+    
+    Args:
+        message: Error message without the leading icon.
+        suggestions: Suggestions shown below the message, if any.
+    """
+    lines = [f"[red]❌ {message}"]
+    if suggestions:
+        lines.append("[yellow]💡 Рекомендации:")
+        lines.extend(f"  • {suggestion}" for suggestion in suggestions)
+    console.print(*lines, sep="\n")
+    sys.exit(1)
+
+
+# Worker thread for blocking file reads, created on first use
+_file_io_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _run_file_io(func, *args, description: str):
+    """Run a blocking file read in a worker thread while the spinner is shown.
+    
+    The main thread only waits for the result, so the spinner keeps
+    animating and Ctrl-C interrupts the wait right away. An interrupted read
+    finishes in the background and its result is discarded.
+    
+    Args:
+        func: Function performing the read.
+        *args: Arguments for the function.
+        description: Spinner description.
+        
+    Returns:
+        Result of the function.
+        
+    Raises:
+        KeyboardInterrupt: If the user interrupted the wait.
+    """
+    global _file_io_executor
+    
+    if _file_io_executor is None:
+        _file_io_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='cli-file-io')
+    
+    with _progress_task(description):
+        return _file_io_executor.submit(func, *args).result()
+
 
 class AIAgentCLI:
-    """CLI interface for the AI agent."""
+    """CLI interface for the AI agent.
+    
+    Core components are created on first access, so commands that do not
+    use them neither load ChromaDB nor connect to Ollama.
+    """
     
     def __init__(self):
-        """Initialize CLI with core components."""
-        self.document_manager = None
-        self.session_manager = None
-        self.query_processor = None
-        self.ollama_client = None
+        """Initialize CLI; core components are created lazily."""
+        self._document_manager = None
+        self._session_manager = None
+        self._query_processor = None
+        self._ollama_client = None
+        # One lock per component, so independent components can be created
+        # by different threads at the same time
+        self._component_locks = {
+            name: threading.Lock()
+            for name in ('ollama_client', 'document_manager', 'session_manager', 'query_processor')
+        }
         self.current_session_id = None
+    
+    @property
+    def ollama_client(self):
+        """Ollama client, created on first access."""
+        with self._component_locks['ollama_client']:
+            if self._ollama_client is None:
+                from ..core.ollama_client import OllamaClient
+                self._ollama_client = self._create_component(
+                    "Инициализация Ollama клиента...", OllamaClient
+                )
+            return self._ollama_client
+    
+    @property
+    def document_manager(self):
+        """Document manager, created on first access."""
+        with self._component_locks['document_manager']:
+            if self._document_manager is None:
+                from ..core.document_manager import DocumentManager
+                self._document_manager = self._create_component(
+                    "Инициализация менеджера документов...",
+                    lambda: DocumentManager(embedding_cache=EmbeddingCache())
+                )
+            return self._document_manager
+    
+    @property
+    def session_manager(self):
+        """Session manager, created on first access."""
+        with self._component_locks['session_manager']:
+            if self._session_manager is None:
+                from ..core.session_manager import SessionManager
+                self._session_manager = self._create_component(
+                    "Инициализация менеджера сессий...", SessionManager
+                )
+            return self._session_manager
+    
+    @property
+    def query_processor(self):
+        """Query processor, created on first access together with its dependencies.
+        
+        The dependencies do not depend on each other and are created
+        concurrently, so loading the vector store overlaps with connecting
+        to Ollama.
+        """
+        with self._component_locks['query_processor']:
+            if self._query_processor is None:
+                from ..core.query_processor import QueryProcessor
+                with ThreadPoolExecutor(max_workers=3) as executor:
+                    document_manager_future = executor.submit(getattr, self, 'document_manager')
+                    session_manager_future = executor.submit(getattr, self, 'session_manager')
+                    ollama_client_future = executor.submit(getattr, self, 'ollama_client')
+                document_manager = document_manager_future.result()
+                session_manager = session_manager_future.result()
+                ollama_client = ollama_client_future.result()
+                self._query_processor = self._create_component(
+                    "Инициализация процессора запросов...",
+                    lambda: QueryProcessor(
+                        document_manager=document_manager,
+                        session_manager=session_manager,
+                        ollama_client=ollama_client
+                    )
+                )
+            return self._query_processor
+    
+    def ensure_ollama_available(self) -> None:
+        """Exit with an error message if the Ollama service is unreachable.
+        
+        Called by commands that cannot work without the LLM. The document
+        and session managers these commands use next are created while
+        Ollama is being checked, so the check adds no round trip to the
+        command start.
+        """
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            storage_futures = [
+                executor.submit(getattr, self, 'document_manager'),
+                executor.submit(getattr, self, 'session_manager')
+            ]
+            healthy = self.ollama_client.health_check()
+            
+            # Component errors have been reported; re-raise their exit
+            for future in storage_futures:
+                future.result()
+        
+        if not healthy:
+            logger.error("Failed to connect to Ollama service")
+            console.print("[red]❌ Ошибка: Не удается подключиться к Ollama сервису")
+            console.print("Убедитесь, что Ollama запущен (ollama serve)")
+            sys.exit(1)
+    
+    def start_index_warmup(self) -> threading.Thread:
+        """Load the vector index in a background thread.
         
-        self._initialize_components()
+        The index is otherwise loaded by the first search, adding its load
+        time to the first answer.
+        
+        Returns:
+            Started warmup thread.
+        """
+        thread = threading.Thread(
+            target=self.document_manager.warm_index,
+            name='index-warmup',
+            daemon=True
+        )
+        thread.start()
+        return thread
     
-    def _initialize_components(self):
-        """Initialize all core components."""
+    def _create_component(self, description: str, factory):
+        """Create a core component, exiting with recommendations on failure.
+        
+        Args:
+            description: Spinner text shown while the component initializes.
+            factory: Callable creating the component.
+            
+        Returns:
+            Created component.
+        """
         try:
             with performance_tracker("cli_initialization"):
-                with Progress(
-                    SpinnerColumn(),
-                    TextColumn("[progress.description]{task.description}"),
-                    console=console
-                ) as progress:
-                    task = progress.add_task("Инициализация компонентов...", total=None)
-                    
-                    logger.info("Starting CLI components initialization")
-                    
-                    # Initialize Ollama client
-                    progress.update(task, description="Инициализация Ollama клиента...")
-                    self.ollama_client = OllamaClient()
-                    
-                    # Check Ollama connection
-                    progress.update(task, description="Проверка подключения к Ollama...")
-                    if not self.ollama_client.health_check():
-                        logger.error("Failed to connect to Ollama service")
-                        console.print("[red]❌ Ошибка: Не удается подключиться к Ollama сервису")
-                        console.print("Убедитесь, что Ollama запущен (ollama serve)")
-                        sys.exit(1)
-                    
-                    # Initialize document manager
-                    progress.update(task, description="Инициализация менеджера документов...")
-                    self.document_manager = DocumentManager()
-                    
-                    # Initialize session manager
-                    progress.update(task, description="Инициализация менеджера сессий...")
-                    self.session_manager = SessionManager()
-                    
-                    # Initialize query processor
-                    progress.update(task, description="Инициализация процессора запросов...")
-                    self.query_processor = QueryProcessor(
-                        document_manager=self.document_manager,
-                        session_manager=self.session_manager,
-                        ollama_client=self.ollama_client
-                    )
-                    
-                    progress.update(task, description="Компоненты инициализированы ✅")
-                    logger.info("CLI components initialized successfully")
-                    
-                    # Start health monitoring
-                    health_monitor.start_monitoring()
+                with _progress_task(description):
+                    component = factory()
+            logger.info(f"CLI component initialized: {type(component).__name__}")
+            
+            # Start health monitoring along with the first component
+            health_monitor.start_monitoring()
+            return component
                 
         except Exception as e:
             error = handle_error(
@@ -115,17 +545,14 @@ class AIAgentCLI:
                     "Review configuration settings"
                 ]
             )
-            console.print(f"[red]❌ Ошибка инициализации: {e}")
-            console.print("[yellow]💡 Рекомендации:")
-            for suggestion in error.error_info.suggestions or []:
-                console.print(f"  • {suggestion}")
-            sys.exit(1)
+            _exit_with_error(f"Ошибка инициализации: {e}", error.error_info.suggestions)
 
 
 @click.group()
 @click.option('--verbose', '-v', is_flag=True, help='Включить подробный вывод')
+@click.option('--no-cache', is_flag=True, help='Не использовать кэш извлеченного из файлов текста')
 @click.pass_context
-def cli(ctx, verbose):
+def cli(ctx, verbose, no_cache):
     """Локальный AI агент для работы с нормативной документацией.
     
     Поддерживаемые форматы файлов: TXT, MD, DOCX, PDF, RTF
@@ -136,8 +563,68 @@ def cli(ctx, verbose):
     level = logging.DEBUG if verbose else logging.INFO
     logging.basicConfig(level=level, format='%(levelname)s: %(message)s')
     
-    # Initialize CLI
-    ctx.obj['cli'] = AIAgentCLI()
+    # Initialize CLI; the daemon passes its resident instance in ctx.obj.
+    # Components are created on first use, so subcommand help stays cheap.
+    if 'cli' not in ctx.obj and ctx.invoked_subcommand not in (None, 'daemon') and not ctx.resilient_parsing:
+        ctx.obj['cli'] = AIAgentCLI()
+
+
+@cli.group()
+def daemon():
+    """Управление фоновым процессом, сохраняющим компоненты между вызовами."""
+
+
+@daemon.command('start')
+def daemon_start():
+    """Запустить фоновый процесс."""
+    from .daemon import start_daemon, daemon_status, SOCKET_PATH, LOG_PATH
+    
+    info = daemon_status()
+    if info:
+        console.print(f"[yellow]⚠️ Демон уже запущен (PID {info['pid']})")
+        return
+    
+    with _progress_task("Запуск демона...") as (progress, task):
+        pid = start_daemon()
+        if pid:
+            progress.update(task, description="Демон запущен ✅")
+    
+    if not pid:
+        _exit_with_error(f"Не удалось запустить демон. Подробности: {LOG_PATH}")
+    
+    console.print(f"[green]✅ Демон запущен (PID {pid}), сокет: {SOCKET_PATH}")
+
+
+@daemon.command('stop')
+def daemon_stop():
+    """Остановить фоновый процесс."""
+    from .daemon import stop_daemon
+    
+    if stop_daemon():
+        console.print("[green]✅ Демон остановлен")
+    else:
+        console.print("[yellow]Демон не запущен")
+
+
+@daemon.command('status')
+def daemon_status_command():
+    """Показать состояние фонового процесса."""
+    from .daemon import daemon_status, SOCKET_PATH
+    from rich.panel import Panel
+    
+    info = daemon_status()
+    if not info:
+        console.print("[yellow]Демон не запущен")
+        return
+    
+    console.print(Panel(
+        f"PID: [bold]{info['pid']}[/bold]\n"
+        f"Сокет: [blue]{SOCKET_PATH}[/blue]\n"
+        f"Рабочая папка: [blue]{info['cwd']}[/blue]\n"
+        f"Время работы: {info['uptime']:.0f} с\n"
+        f"Выполнено команд: {info['requests_served']}",
+        title="Демон"
+    ))
 
 
 @cli.command()
@@ -145,14 +632,16 @@ def cli(ctx, verbose):
 @click.pass_context
 def health(ctx, format):
     """Проверить состояние системы."""
+    from rich.table import Table
+    
     try:
         # Run health checks
         health_results = health_monitor.run_all_checks()
         health_summary = health_monitor.get_health_summary()
         
         if format == 'json':
-            import json
-            console.print(json.dumps({
+            # Plain JSON for scripts, written past Rich rendering
+            console.file.write(json_dumps({
                 'summary': health_summary,
                 'checks': {
                     name: {
@@ -164,7 +653,8 @@ def health(ctx, format):
                     }
                     for name, check in health_results.items()
                 }
-            }, indent=2, ensure_ascii=False))
+            }, indent=True) + '\n')
+            console.file.flush()
         else:
             # Display as table
             table = Table(title="Состояние системы")
@@ -197,7 +687,8 @@ def health(ctx, format):
                     response_time
                 )
             
-            console.print(table)
+            # Collect the whole report and write it with a single print
+            parts = [table]
             
             # Show overall status
             overall_status = health_summary['overall_status']
@@ -208,31 +699,32 @@ def health(ctx, format):
                 'unknown': 'dim'
             }.get(overall_status, 'white')
             
-            console.print(f"\n[{status_color}]Общий статус: {overall_status.upper()}[/{status_color}]")
+            parts.append(f"\n[{status_color}]Общий статус: {overall_status.upper()}[/{status_color}]")
             
             # Show error statistics if available
             error_stats = error_notification_manager.get_error_summary()
             if error_stats['total_errors'] > 0:
-                console.print(f"\n[yellow]📊 Статистика ошибок:[/yellow]")
-                console.print(f"  Всего ошибок: {error_stats['total_errors']}")
-                console.print(f"  Уникальных кодов: {error_stats['unique_error_codes']}")
-                console.print(f"  Недавних ошибок: {error_stats['recent_error_rate']}")
+                parts.append(f"\n[yellow]📊 Статистика ошибок:[/yellow]")
+                parts.append(f"  Всего ошибок: {error_stats['total_errors']}")
+                parts.append(f"  Уникальных кодов: {error_stats['unique_error_codes']}")
+                parts.append(f"  Недавних ошибок: {error_stats['recent_error_rate']}")
                 
                 if error_stats['most_frequent_errors']:
-                    console.print("  Частые ошибки:")
+                    parts.append("  Частые ошибки:")
                     for error_code, count in error_stats['most_frequent_errors']:
-                        console.print(f"    • {error_code}: {count}")
+                        parts.append(f"    • {error_code}: {count}")
+            
+            console.print(*parts, sep="\n")
     
     except Exception as e:
-        console.print(f"[red]❌ Ошибка проверки состояния: {e}")
-        sys.exit(1)
+        _exit_with_error(f"Ошибка проверки состояния: {e}")
 
 
 @cli.command()
 @click.argument('file_path', type=click.Path(exists=True))
 @click.option('--title', '-t', help='Заголовок документа')
 @click.option('--metadata', '-m', multiple=True, help='Метаданные в формате key=value')
-@click.option('--category', '-c', type=click.Choice(['general', 'reference', 'target']), default='general', help='Категория документа')
+@click.option('--category', '-c', type=click.Choice(_CATEGORY_CHOICES), default='general', help='Категория документа')
 @click.option('--tags', help='Теги документа (через запятую)')
 @click.option('--show-text', is_flag=True, help='Показать извлеченный текст из документа')
 @click.pass_context
@@ -241,43 +733,35 @@ def upload(ctx, file_path, title, metadata, category, tags, show_text):
     
     Поддерживаемые форматы: TXT, MD, DOCX, PDF, RTF
     """
+    from ..core.document_manager import DocumentManagerError
+    from rich.panel import Panel
+    
     cli_instance = ctx.obj['cli']
     
     try:
         # Set show extracted text option in file processor
         from ..utils.file_processor import file_processor
         file_processor.show_extracted_text = show_text
+        file_processor.parse_cache = _current_parse_cache()
         
         # Parse metadata
-        metadata_dict = {}
-        for item in metadata:
-            if '=' in item:
-                key, value = item.split('=', 1)
-                metadata_dict[key] = value
+        metadata_dict = _parse_kv(metadata)
         
         if title:
             metadata_dict['title'] = title
         
         # Parse category
-        doc_category = DocumentCategory(category)
+        doc_category = _CATEGORY_MAP[category]
         
         # Parse tags
-        doc_tags = []
-        if tags:
-            doc_tags = [tag.strip() for tag in tags.split(',') if tag.strip()]
+        doc_tags = _parse_csv(tags)
         
         # Show file type info
         file_path_obj = Path(file_path)
         file_type_desc = cli_instance.document_manager.get_file_type_description(file_path_obj)
         console.print(f"[blue]📄 Тип файла: {file_type_desc}[/blue]")
         
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=console
-        ) as progress:
-            task = progress.add_task("Загрузка документа...", total=None)
-            
+        with _progress_task("Загрузка документа...") as (progress, task):
             doc_id = cli_instance.document_manager.upload_document(
                 file_path=file_path,
                 metadata=metadata_dict,
@@ -297,15 +781,8 @@ def upload(ctx, file_path, title, metadata, category, tags, show_text):
         ))
         
     except DocumentManagerError as e:
-        console.print(f"[red]❌ Ошибка загрузки: {e}")
-        
-        # Show suggestions if available
-        if hasattr(e, 'error_info') and e.error_info.suggestions:
-            console.print("[yellow]💡 Рекомендации:")
-            for suggestion in e.error_info.suggestions:
-                console.print(f"  • {suggestion}")
-        
-        sys.exit(1)
+        error_info = getattr(e, 'error_info', None)
+        _exit_with_error(f"Ошибка загрузки: {e}", error_info.suggestions if error_info else None)
     except Exception as e:
         error = handle_error(
             error=e,
@@ -320,11 +797,7 @@ def upload(ctx, file_path, title, metadata, category, tags, show_text):
                 "Check available disk space"
             ]
         )
-        console.print(f"[red]❌ Неожиданная ошибка: {e}")
-        console.print("[yellow]💡 Рекомендации:")
-        for suggestion in error.error_info.suggestions:
-            console.print(f"  • {suggestion}")
-        sys.exit(1)
+        _exit_with_error(f"Неожиданная ошибка: {e}", error.error_info.suggestions)
 
 
 @cli.command()
@@ -339,40 +812,32 @@ def upload_reference(ctx, file_path, title, tags, metadata, show_text):
     
     Поддерживаемые форматы: TXT, MD, DOCX, PDF, RTF
     """
+    from ..core.document_manager import DocumentManagerError
+    from rich.panel import Panel
+    
     cli_instance = ctx.obj['cli']
     
     try:
         # Set show extracted text option in file processor
         from ..utils.file_processor import file_processor
         file_processor.show_extracted_text = show_text
+        file_processor.parse_cache = _current_parse_cache()
         
         # Parse metadata
-        metadata_dict = {}
-        for item in metadata:
-            if '=' in item:
-                key, value = item.split('=', 1)
-                metadata_dict[key] = value
+        metadata_dict = _parse_kv(metadata)
         
         if title:
             metadata_dict['title'] = title
         
         # Parse tags
-        doc_tags = []
-        if tags:
-            doc_tags = [tag.strip() for tag in tags.split(',') if tag.strip()]
+        doc_tags = _parse_csv(tags)
         
         # Show file type info
         file_path_obj = Path(file_path)
         file_type_desc = cli_instance.document_manager.get_file_type_description(file_path_obj)
         console.print(f"[blue]📄 Тип файла: {file_type_desc}[/blue]")
         
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=console
-        ) as progress:
-            task = progress.add_task("Загрузка эталонного документа...", total=None)
-            
+        with _progress_task("Загрузка эталонного документа...") as (progress, task):
             doc_id = cli_instance.document_manager.upload_document(
                 file_path=file_path,
                 metadata=metadata_dict,
@@ -392,8 +857,7 @@ def upload_reference(ctx, file_path, title, tags, metadata, show_text):
         ))
         
     except DocumentManagerError as e:
-        console.print(f"[red]❌ Ошибка загрузки эталонного документа: {e}")
-        sys.exit(1)
+        _exit_with_error(f"Ошибка загрузки эталонного документа: {e}")
 
 
 @cli.command()
@@ -401,13 +865,16 @@ def upload_reference(ctx, file_path, title, tags, metadata, show_text):
 @click.option('--recursive', '-r', is_flag=True, help='Рекурсивный поиск файлов в подпапках')
 @click.option('--pattern', '-p', default='*.txt,*.md,*.docx,*.pdf,*.rtf', help='Шаблон файлов для загрузки (по умолчанию: *.txt,*.md,*.docx,*.pdf,*.rtf)')
 @click.option('--metadata', '-m', multiple=True, help='Общие метаданные для всех файлов в формате key=value')
-@click.option('--category', '-c', type=click.Choice(['general', 'reference', 'target']), default='general', help='Категория для всех документов')
+@click.option('--category', '-c', type=click.Choice(_CATEGORY_CHOICES), default='general', help='Категория для всех документов')
 @click.option('--tags', help='Общие теги для всех документов (через запятую)')
 @click.option('--skip-errors', is_flag=True, help='Продолжить загрузку при ошибках в отдельных файлах')
 @click.option('--dry-run', is_flag=True, help='Показать список файлов без загрузки')
 @click.option('--show-text', is_flag=True, help='Показать извлеченный текст из документов')
+@click.option('--workers', '-w', type=click.IntRange(min=1), default=_DEFAULT_UPLOAD_WORKERS, show_default=True, help='Количество параллельных потоков загрузки')
+@click.option('--batch-size', type=click.IntRange(min=1), default=_BATCH_UPLOAD_SIZE, show_default=True, help='Количество файлов в одном пакете загрузки')
+@click.option('--yes', '-y', is_flag=True, help='Не запрашивать подтверждение')
 @click.pass_context
-def batch_upload(ctx, path, recursive, pattern, metadata, category, tags, skip_errors, dry_run, show_text):
+def batch_upload(ctx, path, recursive, pattern, metadata, category, tags, skip_errors, dry_run, show_text, workers, batch_size, yes):
     """Загрузить несколько документов одновременно из папки или по списку файлов.
     
     Поддерживаемые форматы: TXT, MD, DOCX, PDF, RTF
@@ -418,22 +885,18 @@ def batch_upload(ctx, path, recursive, pattern, metadata, category, tags, skip_e
         # Set show extracted text option in file processor
         from ..utils.file_processor import file_processor
         file_processor.show_extracted_text = show_text
+        file_processor.parse_cache = _current_parse_cache()
         
         # Parse common metadata
-        metadata_dict = {}
-        for item in metadata:
-            if '=' in item:
-                key, value = item.split('=', 1)
-                metadata_dict[key] = value
+        metadata_dict = _parse_kv(metadata)
         
         # Parse category and tags
-        doc_category = DocumentCategory(category)
-        doc_tags = []
-        if tags:
-            doc_tags = [tag.strip() for tag in tags.split(',') if tag.strip()]
+        doc_category = _CATEGORY_MAP[category]
+        doc_tags = _parse_csv(tags)
         
-        # Find files to upload
-        files_to_upload = _find_files_for_batch_upload(path, pattern, recursive)
+        # Find files to upload, sizes are taken from the directory scan
+        file_sizes: Dict[Path, int] = {}
+        files_to_upload = _find_files_for_batch_upload(path, pattern, recursive, sizes=file_sizes)
         
         if not files_to_upload:
             console.print("[yellow]⚠️ Не найдено файлов для загрузки")
@@ -443,33 +906,42 @@ def batch_upload(ctx, path, recursive, pattern, metadata, category, tags, skip_e
         console.print(f"[blue]📁 Найдено файлов для загрузки: {len(files_to_upload)}")
         
         if dry_run:
-            _show_batch_upload_preview(files_to_upload)
+            _show_batch_upload_preview(files_to_upload, file_sizes)
             return
         
         # Confirm batch upload
-        if not Confirm.ask(f"Загрузить {len(files_to_upload)} файлов?"):
+        if not _confirm(f"Загрузить {len(files_to_upload)} файлов?", yes):
             console.print("[yellow]Загрузка отменена")
             return
         
         # Perform batch upload
-        results = _perform_batch_upload(cli_instance, files_to_upload, metadata_dict, doc_category, doc_tags, skip_errors)
+        results = _perform_batch_upload(
+            cli_instance, files_to_upload, metadata_dict, doc_category, doc_tags, skip_errors,
+            workers=workers, sizes=file_sizes, batch_size=batch_size
+        )
         
         # Show results
         _show_batch_upload_results(results)
         
     except Exception as e:
-        console.print(f"[red]❌ Ошибка batch загрузки: {e}")
-        sys.exit(1)
+        _exit_with_error(f"Ошибка batch загрузки: {e}")
 
 
 @cli.command()
 @click.option('--session-id', '-s', help='ID сессии (создается автоматически если не указан)')
 @click.option('--show-decision-tree', is_flag=True, help='Показать дерево решений для анализа процесса ответа')
 @click.option('--web-visualization', '-w', is_flag=True, help='Включить веб-визуализацию дерева решений')
+@click.option('--batch', 'batch_file', type=click.Path(exists=True, dir_okay=False), help='Файл с вопросами (по одному на строку) для пакетной обработки')
+@click.option('--output', '-o', type=click.Path(dir_okay=False, writable=True), help='Файл для ответов пакетной обработки в формате JSONL')
 @click.pass_context
-def query(ctx, session_id, show_decision_tree, web_visualization):
+def query(ctx, session_id, show_decision_tree, web_visualization, batch_file, output):
     """Задать вопрос AI агенту."""
+    from ..core.query_processor import QueryProcessorError
+    from rich.panel import Panel
+    from rich.prompt import Prompt
+    
     cli_instance = ctx.obj['cli']
+    cli_instance.ensure_ollama_available()
     
     # Create or use existing session
     if session_id is None:
@@ -478,13 +950,20 @@ def query(ctx, session_id, show_decision_tree, web_visualization):
     
     cli_instance.current_session_id = session_id
     
+    if batch_file:
+        _process_query_batch(cli_instance, session_id, batch_file, output)
+        return
+    
     # Set decision tree and visualization options
     if show_decision_tree:
         cli_instance.query_processor.set_decision_tree_enabled(True)
     
     if web_visualization:
         cli_instance.query_processor.set_web_visualization(True)
-        console.print(f"[blue]🌐 Веб-визуализация включена: {os.environ.get('VISUALIZATION_URL', 'http://localhost:8501')}")
+        console.print(f"[blue]🌐 Веб-визуализация включена: {_visualization_url()}")
+    
+    # Load the index while the user types the first question
+    cli_instance.start_index_warmup()
     
     try:
         # Interactive query loop
@@ -501,33 +980,26 @@ def query(ctx, session_id, show_decision_tree, web_visualization):
         while True:
             user_input = Prompt.ask("\n[bold blue]Ваш вопрос")
             
-            if user_input.lower() in ['/exit', '/quit', 'exit', 'quit']:
-                break
-            elif user_input.lower() == '/help':
-                _show_help()
-                continue
-            elif user_input.lower() == '/history':
-                _show_session_history(cli_instance, session_id)
+            key = user_input.strip().lower()
+            if not key:
                 continue
-            elif user_input.lower() == '/check':
-                _document_check_mode(cli_instance, session_id)
-                continue
-            elif user_input.lower() == '/viz':
-                viz_url = os.environ.get('VISUALIZATION_URL', 'http://localhost:8501')
-                console.print(f"[blue]🌐 Открытие веб-визуализации: {viz_url}")
-                console.print("[yellow]Для просмотра деревьев решений откройте указанный URL в браузере")
+            
+            handler = _COMMAND_TABLE.get(key)
+            if handler is _EXIT_COMMAND:
+                break
+            if handler is not None:
+                handler(cli_instance, session_id)
                 continue
-            elif not user_input.strip():
+            
+            # Stream the answer unless a decision tree has to be appended
+            if not cli_instance.query_processor.decision_tree_settings['enabled']:
+                response = _stream_query_response(cli_instance, user_input, session_id)
+                if response is not None:
+                    _display_response_metadata(response)
                 continue
             
             # Process query
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[progress.description]{task.description}"),
-                console=console
-            ) as progress:
-                task = progress.add_task("Обработка запроса...", total=None)
-                
+            with _progress_task("Обработка запроса...") as (progress, task):
                 try:
                     response = cli_instance.query_processor.process_general_query(
                         query=user_input,
@@ -564,12 +1036,16 @@ def check_document(ctx, document_path, session_id, reference_docs, interactive,
     
     Поддерживаемые форматы: TXT, MD, DOCX, PDF, RTF
     """
+    from ..core.query_processor import QueryProcessorError
+    
     cli_instance = ctx.obj['cli']
+    cli_instance.ensure_ollama_available()
     
     try:
         # Set show extracted text option in file processor
         from ..utils.file_processor import file_processor
         file_processor.show_extracted_text = show_text
+        file_processor.parse_cache = _current_parse_cache()
         
         # Create or use existing session
         if session_id is None:
@@ -582,7 +1058,7 @@ def check_document(ctx, document_path, session_id, reference_docs, interactive,
             
         if web_visualization:
             cli_instance.query_processor.set_web_visualization(True)
-            console.print(f"[blue]🌐 Веб-визуализация включена: {os.environ.get('VISUALIZATION_URL', 'http://localhost:8501')}")
+            console.print(f"[blue]🌐 Веб-визуализация включена: {_visualization_url()}")
         
         # Extract document content using file processor
         document_path_obj = Path(document_path)
@@ -595,8 +1071,7 @@ def check_document(ctx, document_path, session_id, reference_docs, interactive,
             document_content, file_metadata = file_processor.extract_text(document_path_obj)
             
             if not file_processor.validate_extracted_text(document_content):
-                console.print("[red]❌ Документ пуст или содержит недопустимый текст")
-                sys.exit(1)
+                _exit_with_error("Документ пуст или содержит недопустимый текст")
                 
             # Show extraction metadata
             console.print(f"[dim]📊 Извлечено символов: {file_metadata.get('character_count', 'N/A')}[/dim]")
@@ -606,13 +1081,12 @@ def check_document(ctx, document_path, session_id, reference_docs, interactive,
                 console.print(f"[dim]📋 Таблиц: {file_metadata['tables_count']}[/dim]")
                 
         except Exception as e:
-            console.print(f"[red]❌ Ошибка извлечения текста: {e}")
-            sys.exit(1)
+            _exit_with_error(f"Ошибка извлечения текста: {e}")
         
         # Get reference document IDs
         reference_doc_ids = None
         if reference_docs:
-            reference_doc_ids = [doc_id.strip() for doc_id in reference_docs.split(',') if doc_id.strip()]
+            reference_doc_ids = _parse_csv(reference_docs)
         elif interactive:
             reference_doc_ids = _select_reference_documents_interactive(cli_instance)
             if not reference_doc_ids:
@@ -620,13 +1094,7 @@ def check_document(ctx, document_path, session_id, reference_docs, interactive,
                 return
         
         # Perform document check
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=console
-        ) as progress:
-            task = progress.add_task("Проверка документа на соответствие...", total=None)
-            
+        with _progress_task("Проверка документа на соответствие...") as (progress, task):
             try:
                 response = cli_instance.query_processor.process_document_check(
                     document_content=document_content,
@@ -639,15 +1107,13 @@ def check_document(ctx, document_path, session_id, reference_docs, interactive,
                 
             except QueryProcessorError as e:
                 progress.update(task, description="Ошибка проверки ❌")
-                console.print(f"[red]❌ Ошибка: {e}")
-                sys.exit(1)
+                _exit_with_error(f"Ошибка: {e}")
         
         # Display response
         _display_compliance_report(response, reference_doc_ids)
         
     except Exception as e:
-        console.print(f"[red]❌ Ошибка проверки документа: {e}")
-        sys.exit(1)
+        _exit_with_error(f"Ошибка проверки документа: {e}")
 
 
 @cli.command()
@@ -655,9 +1121,12 @@ def check_document(ctx, document_path, session_id, reference_docs, interactive,
 @click.option('--history', '-h', help='Показать историю сессии')
 @click.option('--clear', '-c', help='Очистить сессию')
 @click.option('--delete', '-d', help='Удалить сессию')
+@click.option('--yes', '-y', is_flag=True, help='Не запрашивать подтверждение')
 @click.pass_context
-def session(ctx, list_sessions, history, clear, delete):
+def session(ctx, list_sessions, history, clear, delete, yes):
     """Управление сессиями."""
+    from ..core.session_manager import SessionManagerError
+    
     cli_instance = ctx.obj['cli']
     
     try:
@@ -671,7 +1140,7 @@ def session(ctx, list_sessions, history, clear, delete):
             else:
                 console.print(f"[red]❌ Сессия {clear} не найдена")
         elif delete:
-            if Confirm.ask(f"Удалить сессию {delete}?"):
+            if _confirm(_DELETE_PROMPTS['session'].format(delete), yes):
                 if cli_instance.session_manager.delete_session(delete):
                     console.print(f"[green]✅ Сессия {delete} удалена")
                 else:
@@ -688,22 +1157,25 @@ def session(ctx, list_sessions, history, clear, delete):
 @click.option('--info', '-i', help='Показать информацию о документе')
 @click.option('--delete', '-d', help='Удалить документ')
 @click.option('--stats', is_flag=True, help='Показать статистику коллекции')
-@click.option('--category', '-c', type=click.Choice(['general', 'reference', 'target']), help='Фильтр по категории')
+@click.option('--category', '-c', type=click.Choice(_CATEGORY_CHOICES), help='Фильтр по категории')
 @click.option('--tags', '-t', help='Фильтр по тегам (через запятую)')
+@click.option('--yes', '-y', is_flag=True, help='Не запрашивать подтверждение')
 @click.pass_context
-def docs(ctx, list_docs, info, delete, stats, category, tags):
+def docs(ctx, list_docs, info, delete, stats, category, tags, yes):
     """Управление документами."""
+    from ..core.document_manager import DocumentManagerError
+    
     cli_instance = ctx.obj['cli']
     
     try:
         if list_docs:
-            category_filter = DocumentCategory(category) if category else None
-            tags_filter = [tag.strip() for tag in tags.split(',') if tag.strip()] if tags else None
+            category_filter = _CATEGORY_MAP[category] if category else None
+            tags_filter = _parse_csv(tags) if tags else None
             _list_documents(cli_instance, category_filter, tags_filter)
         elif info:
             _show_document_info(cli_instance, info)
         elif delete:
-            if Confirm.ask(f"Удалить документ {delete}?"):
+            if _confirm(_DELETE_PROMPTS['docs'].format(delete), yes):
                 if cli_instance.document_manager.delete_document(delete):
                     console.print(f"[green]✅ Документ {delete} удален")
                 else:
@@ -719,60 +1191,53 @@ def docs(ctx, list_docs, info, delete, stats, category, tags):
 
 @cli.command()
 @click.argument('document_id')
-@click.option('--category', '-c', type=click.Choice(['general', 'reference', 'target']), help='Новая категория документа')
+@click.option('--category', '-c', type=click.Choice(_CATEGORY_CHOICES), help='Новая категория документа')
 @click.option('--tags', '-t', help='Новые теги документа (через запятую)')
 @click.option('--add-tag', multiple=True, help='Добавить тег')
 @click.option('--remove-tag', multiple=True, help='Удалить тег')
 @click.pass_context
 def manage_doc(ctx, document_id, category, tags, add_tag, remove_tag):
     """Управление категориями и тегами документов."""
+    from ..core.document_manager import DocumentManagerError
+    
     cli_instance = ctx.obj['cli']
     
     try:
         # Check if document exists
         doc_info = cli_instance.document_manager.get_document_info(document_id)
         if not doc_info:
-            console.print(f"[red]❌ Документ {document_id} не найден")
-            sys.exit(1)
+            _exit_with_error(f"Документ {document_id} не найден")
         
         changes_made = False
         
         # Update category
         if category:
-            new_category = DocumentCategory(category)
+            new_category = _CATEGORY_MAP[category]
             if cli_instance.document_manager.update_document_category(document_id, new_category):
                 console.print(f"[green]✅ Категория документа изменена на: {category}")
                 changes_made = True
             else:
                 console.print(f"[red]❌ Не удалось изменить категорию документа")
         
-        # Update tags
-        if tags is not None:
-            new_tags = [tag.strip() for tag in tags.split(',') if tag.strip()]
-            if cli_instance.document_manager.update_document_tags(document_id, new_tags):
-                console.print(f"[green]✅ Теги документа обновлены: {', '.join(new_tags) if new_tags else 'нет тегов'}")
-                changes_made = True
-            else:
-                console.print(f"[red]❌ Не удалось обновить теги документа")
-        
-        # Handle individual tag operations
-        if add_tag or remove_tag:
+        # Update tags: --tags replaces the list, --add-tag/--remove-tag edit
+        # the result, and the final list is written with a single update
+        if tags is not None or add_tag or remove_tag:
             current_tags = doc_info.get('tags', [])
             if isinstance(current_tags, str):
                 current_tags = current_tags.split(',') if current_tags else []
             
-            # Add tags
-            for tag in add_tag:
-                if tag not in current_tags:
-                    current_tags.append(tag)
-            
-            # Remove tags
+            # Ordered set: existing tags keep their order, duplicates are dropped
+            tag_set = dict.fromkeys(_parse_csv(tags) if tags is not None else current_tags)
+            tag_set.update(dict.fromkeys(add_tag))
             for tag in remove_tag:
-                if tag in current_tags:
-                    current_tags.remove(tag)
+                tag_set.pop(tag, None)
+            new_tags = list(tag_set)
             
-            if cli_instance.document_manager.update_document_tags(document_id, current_tags):
-                console.print(f"[green]✅ Теги документа обновлены: {', '.join(current_tags) if current_tags else 'нет тегов'}")
+            if new_tags == list(current_tags):
+                console.print("[yellow]Теги документа не изменились")
+                changes_made = True
+            elif cli_instance.document_manager.update_document_tags(document_id, new_tags):
+                console.print(f"[green]✅ Теги документа обновлены: {', '.join(new_tags) if new_tags else 'нет тегов'}")
                 changes_made = True
             else:
                 console.print(f"[red]❌ Не удалось обновить теги документа")
@@ -782,14 +1247,15 @@ def manage_doc(ctx, document_id, category, tags, add_tag, remove_tag):
             console.print("Используйте --category, --tags, --add-tag или --remove-tag")
         
     except DocumentManagerError as e:
-        console.print(f"[red]❌ Ошибка управления документом: {e}")
-        sys.exit(1)
+        _exit_with_error(f"Ошибка управления документом: {e}")
 
 
 @cli.command()
 @click.pass_context
 def formats(ctx):
     """Показать поддерживаемые форматы файлов."""
+    from rich.table import Table
+    
     cli_instance = ctx.obj['cli']
     
     try:
@@ -800,16 +1266,8 @@ def formats(ctx):
         table.add_column("Описание", style="white")
         table.add_column("Возможности", style="green")
         
-        format_info = {
-            '.txt': ('Plain Text', 'Базовое извлечение текста'),
-            '.md': ('Markdown', 'Извлечение текста с подсчетом элементов'),
-            '.docx': ('Microsoft Word', 'Текст, таблицы, метаданные документа'),
-            '.pdf': ('PDF Document', 'Текст по страницам, метаданные'),
-            '.rtf': ('Rich Text Format', 'Извлечение форматированного текста')
-        }
-        
         for ext in supported_extensions:
-            desc, features = format_info.get(ext, ('Unknown', 'Basic text extraction'))
+            desc, features = _FORMAT_INFO.get(ext, ('Unknown', 'Basic text extraction'))
             table.add_row(ext.upper(), desc, features)
         
         console.print(table)
@@ -825,50 +1283,82 @@ def formats(ctx):
 
 
 @cli.command()
+@click.option('--json', '-j', 'as_json', is_flag=True, help='Вывести статус в формате JSON')
 @click.pass_context
-def status(ctx):
+def status(ctx, as_json):
     """Показать статус системы."""
-    cli_instance = ctx.obj['cli']
+    from ..core.ollama_client import OllamaConnectionError
+    from rich.panel import Panel
     
-    # Check Ollama connection
-    ollama_status = "🟢 Подключен" if cli_instance.ollama_client.health_check() else "🔴 Недоступен"
+    import psutil
     
-    # Get available models
-    try:
-        models = cli_instance.ollama_client.list_available_models()
-        models_text = f"{len(models)} моделей: {', '.join(models[:3])}" + ("..." if len(models) > 3 else "")
-    except:
-        models_text = "Недоступно"
+    cli_instance = ctx.obj['cli']
     
-    # Get document stats
-    doc_stats = cli_instance.document_manager.get_collection_stats()
+    # CPU usage is measured over the time the queries below take, instead
+    # of blocking for a separate sampling interval
+    psutil.cpu_percent(interval=None)
+    cpu_sample_start = time.monotonic()
+    
+    # The health check keeps the model listing it fetched, so listing models
+    # afterwards costs no second request; when Ollama is down the retried
+    # listing is skipped altogether
+    models = None
+    ollama_available = cli_instance.ollama_client.health_check()
+    if ollama_available:
+        try:
+            models = cli_instance.ollama_client.list_available_models()
+        except OllamaConnectionError:
+            pass
     
-    # Get session stats
-    session_stats = cli_instance.session_manager.get_session_stats()
+    # Get document and session stats
+    doc_stats, session_stats = _get_status_stats(cli_instance)
     
     # Get performance stats
-    from ..utils.performance_monitor import performance_monitor
-    perf_stats = performance_monitor.get_operation_stats()
-    
-    # Calculate average processing times
-    avg_times = {}
-    for op, stats in perf_stats.items():
-        if stats.get('count', 0) > 0:
-            avg_times[op] = stats.get('avg_duration', 0)
+    operations_count = performance_monitor.get_total_operations()
     
     # Get system resources
-    import psutil
     try:
-        cpu_percent = psutil.cpu_percent(interval=1)
+        # Too short a window gives meaningless CPU figures
+        time.sleep(max(0.0, _CPU_SAMPLE_MIN_INTERVAL - (time.monotonic() - cpu_sample_start)))
+        cpu_percent = psutil.cpu_percent(interval=None)
         memory = psutil.virtual_memory()
         disk = psutil.disk_usage('/')
-        
+        resources = {
+            'cpu_percent': cpu_percent,
+            'memory_percent': memory.percent,
+            'disk_percent': (disk.used / disk.total) * 100
+        }
+    except (psutil.Error, OSError):
+        resources = None
+    
+    if as_json:
+        # Plain JSON for scripts, written past Rich rendering
+        console.file.write(json_dumps({
+            'ollama': {'available': ollama_available, 'models': models},
+            'documents': {
+                'total_documents': doc_stats.get('total_documents', 0),
+                'total_chunks': doc_stats.get('total_chunks', 0)
+            },
+            'sessions': session_stats,
+            'resources': resources,
+            'operations': operations_count
+        }) + '\n')
+        console.file.flush()
+        return
+    
+    ollama_status = "🟢 Подключен" if ollama_available else "🔴 Недоступен"
+    if models is not None:
+        models_text = f"{len(models)} моделей: {', '.join(models[:3])}" + ("..." if len(models) > 3 else "")
+    else:
+        models_text = "Недоступно"
+    
+    if resources is not None:
         resources_text = (
-            f"CPU: {cpu_percent:.1f}% | "
-            f"RAM: {memory.percent:.1f}% | "
-            f"Диск: {(disk.used/disk.total)*100:.1f}%"
+            f"CPU: {resources['cpu_percent']:.1f}% | "
+            f"RAM: {resources['memory_percent']:.1f}% | "
+            f"Диск: {resources['disk_percent']:.1f}%"
         )
-    except:
+    else:
         resources_text = "Недоступно"
     
     status_panel = Panel(
@@ -879,25 +1369,55 @@ def status(ctx):
         f"💬 Сессии: {session_stats.get('active_sessions', 0)} активных / {session_stats.get('total_sessions', 0)} всего\n"
         f"💭 Сообщения: {session_stats.get('total_messages', 0)} всего\n"
         f"⚡ Ресурсы: {resources_text}\n"
-        f"📊 Операций выполнено: {sum(stats.get('count', 0) for stats in perf_stats.values())}",
+        f"📊 Операций выполнено: {operations_count}",
         title="Системная информация"
     )
     
     console.print(status_panel)
 
 
+def _get_status_stats(cli_instance):
+    """Get document and session stats, reusing results for a short time.
+    
+    Scripts polling ``status`` through the daemon get the stats computed
+    less than ``_STATUS_STATS_TTL`` seconds ago instead of scanning the
+    collection on every call.
+    
+    Args:
+        cli_instance: CLI instance.
+        
+    Returns:
+        Tuple of collection stats and session stats.
+    """
+    global _status_stats
+    
+    now = time.monotonic()
+    if _status_stats is not None:
+        checked_at, owner, doc_stats, session_stats = _status_stats
+        if owner is cli_instance and now - checked_at < _STATUS_STATS_TTL:
+            return doc_stats, session_stats
+    
+    doc_stats = cli_instance.document_manager.get_collection_stats()
+    session_stats = cli_instance.session_manager.get_session_stats()
+    _status_stats = (now, cli_instance, doc_stats, session_stats)
+    return doc_stats, session_stats
+
+
 @cli.command()
 @click.option('--stats', is_flag=True, help='Показать статистику производительности')
 @click.option('--slow', is_flag=True, help='Показать медленные операции')
 @click.option('--reset', is_flag=True, help='Сбросить статистику')
 @click.option('--operation', '-o', help='Статистика для конкретной операции')
+@click.option('--yes', '-y', is_flag=True, help='Не запрашивать подтверждение')
 @click.pass_context
-def performance(ctx, stats, slow, reset, operation):
+def performance(ctx, stats, slow, reset, operation, yes):
     """Управление мониторингом производительности."""
+    from rich.table import Table
+    from rich.panel import Panel
     from ..utils.performance_monitor import performance_monitor
     
     if reset:
-        if Confirm.ask("Сбросить всю статистику производительности?"):
+        if _confirm("Сбросить всю статистику производительности?", yes):
             performance_monitor.reset_stats()
             console.print("[green]✅ Статистика производительности сброшена")
         return
@@ -1004,14 +1524,27 @@ def performance(ctx, stats, slow, reset, operation):
 @click.option('--stats', is_flag=True, help='Показать статистику кэша')
 @click.option('--clear', is_flag=True, help='Очистить все кэши')
 @click.option('--cleanup', is_flag=True, help='Очистить устаревшие записи')
+@click.option('--yes', '-y', is_flag=True, help='Не запрашивать подтверждение')
 @click.pass_context
-def cache(ctx, stats, clear, cleanup):
+def cache(ctx, stats, clear, cleanup, yes):
     """Управление кэшем системы."""
+    from rich.table import Table
+    from rich.panel import Panel
     from ..utils.cache_manager import cache_manager
     
     if clear:
-        if Confirm.ask("Очистить все кэши?"):
+        if _confirm("Очистить все кэши?", yes):
             cache_manager.clear_all_caches()
+            # Reach the SQLite cache without creating the document manager
+            document_manager = ctx.obj['cli']._document_manager
+            if document_manager is not None:
+                if document_manager.embedding_cache is not None:
+                    document_manager.embedding_cache.clear()
+            else:
+                embedding_cache = EmbeddingCache()
+                embedding_cache.clear()
+                embedding_cache.close()
+            _parse_cache.clear()
             console.print("[green]✅ Все кэши очищены")
         return
     
@@ -1091,8 +1624,55 @@ def cache(ctx, stats, clear, cleanup):
         console.print("[yellow]Кэш не инициализирован")
 
 
+def _process_query_batch(cli_instance, session_id, batch_file, output):
+    """Answer questions from a file and write results as JSONL.
+    
+    Args:
+        cli_instance: CLI instance with query processor.
+        session_id: Session identifier.
+        batch_file: Path to a file with one question per line.
+        output: Path to the JSONL output file, or None for stdout.
+    """
+    from ..core.query_processor import QueryProcessorError
+    
+    queries = [line.strip() for line in Path(batch_file).read_text(encoding='utf-8').splitlines() if line.strip()]
+    if not queries:
+        console.print("[yellow]⚠️ Файл не содержит вопросов")
+        return
+    
+    with _progress_task(f"Обработка {len(queries)} вопросов...") as (progress, task):
+        try:
+            responses = cli_instance.query_processor.process_batch(queries, session_id)
+            progress.update(task, description="Ответы получены ✅")
+        except QueryProcessorError as e:
+            progress.update(task, description="Ошибка обработки ❌")
+            _exit_with_error(f"Ошибка: {e}")
+    
+    lines = [
+        json_dumps({
+            'query': response.query,
+            'response': response.response,
+            'confidence_score': response.confidence_score,
+            'relevant_documents': response.relevant_documents,
+            'processing_time': response.processing_time
+        })
+        for response in responses
+    ]
+    
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        console.print(f"[green]✅ Ответы сохранены: {output} ({len(lines)})")
+    else:
+        # Plain JSONL on stdout, without Rich markup processing
+        for line in lines:
+            click.echo(line)
+
+
 def _show_help():
     """Show help information."""
+    from rich.panel import Panel
+    
     help_text = """
 [bold]Доступные команды:[/bold]
 
@@ -1120,7 +1700,11 @@ def _show_help():
 
 def _show_session_history(cli_instance, session_id):
     """Show session history."""
+    from ..core.session_manager import SessionManagerError
+    from rich.table import Table
+    
     try:
+        # The manager returns only the last 10 messages, oldest first
         messages = cli_instance.session_manager.get_session_history(session_id, limit=10)
         
         if not messages:
@@ -1132,9 +1716,9 @@ def _show_session_history(cli_instance, session_id):
         table.add_column("Роль", style="magenta")
         table.add_column("Сообщение", style="white", max_width=60)
         
-        for message in messages[-10:]:  # Last 10 messages
+        for message in messages:
             role = "👤 Пользователь" if message.is_user_message() else "🤖 Ассистент"
-            content = message.content[:100] + "..." if len(message.content) > 100 else message.content
+            content = _ellipsize(message.content, 100)
             time_str = message.created_at.strftime("%H:%M:%S")
             
             table.add_row(time_str, role, content)
@@ -1147,6 +1731,10 @@ def _show_session_history(cli_instance, session_id):
 
 def _document_check_mode(cli_instance, session_id):
     """Document compliance check mode."""
+    from ..core.query_processor import QueryProcessorError
+    from rich.panel import Panel
+    from rich.prompt import Prompt
+    
     console.print(Panel(
         "[bold yellow]Режим проверки документов[/bold yellow]\n\n"
         "Введите путь к файлу для проверки или вставьте текст документа.\n"
@@ -1157,27 +1745,32 @@ def _document_check_mode(cli_instance, session_id):
     while True:
         user_input = Prompt.ask("\n[bold blue]Файл или текст документа")
         
-        if user_input.lower() in ['exit', 'quit']:
+        key = user_input.strip().lower()
+        if not key:
+            continue
+        if key in _CHECK_MODE_EXIT_COMMANDS:
             break
         
         # Check if it's a file path
         document_filename = None
-        if Path(user_input).exists():
+        if _looks_like_path(user_input):
+            file_path = Path(user_input)
+            document_filename = str(file_path)
             try:
-                file_path = Path(user_input)
-                document_filename = str(file_path)
-                if file_path.suffix.lower() == '.docx':
-                    if DocxDocument is None:
-                        console.print("[red]❌ Библиотека python-docx не установлена")
-                        continue
-                    doc = DocxDocument(file_path)
-                    document_content = '\n'.join([paragraph.text for paragraph in doc.paragraphs if paragraph.text.strip()])
-                else:
-                    with open(user_input, 'r', encoding='utf-8') as f:
-                        document_content = f.read()
+                document_content = _run_file_io(
+                    _read_check_document, file_path, _current_parse_cache(),
+                    description="Чтение файла..."
+                )
+            except KeyboardInterrupt:
+                console.print("\n[yellow]Чтение файла прервано")
+                continue
             except Exception as e:
                 console.print(f"[red]❌ Ошибка чтения файла: {e}")
                 continue
+            
+            if document_content is None:
+                console.print("[red]❌ Библиотека python-docx не установлена")
+                continue
         else:
             document_content = user_input
         
@@ -1186,13 +1779,7 @@ def _document_check_mode(cli_instance, session_id):
             continue
         
         # Process document check
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=console
-        ) as progress:
-            task = progress.add_task("Проверка соответствия...", total=None)
-            
+        with _progress_task("Проверка соответствия...") as (progress, task):
             try:
                 response = cli_instance.query_processor.process_document_check(
                     document_content=document_content,
@@ -1211,12 +1798,282 @@ def _document_check_mode(cli_instance, session_id):
         _display_response(response)
 
 
+@functools.lru_cache(maxsize=1)
+def _visualization_url() -> str:
+    """Get the web visualization URL.
+
+    Read on first use rather than at import, after main has loaded .env.
+    """
+    return os.environ.get('VISUALIZATION_URL', 'http://localhost:8501')
+
+
+def _show_visualization_info():
+    """Show web visualization URL."""
+    viz_url = _visualization_url()
+    console.print(f"[blue]🌐 Открытие веб-визуализации: {viz_url}")
+    console.print("[yellow]Для просмотра деревьев решений откройте указанный URL в браузере")
+
+
+# Interactive query commands; handlers take (cli_instance, session_id)
+_EXIT_COMMAND = object()
+_COMMAND_TABLE: Dict[str, Any] = {
+    sys.intern(command): handler
+    for command, handler in {
+        '/exit': _EXIT_COMMAND,
+        '/quit': _EXIT_COMMAND,
+        'exit': _EXIT_COMMAND,
+        'quit': _EXIT_COMMAND,
+        '/help': lambda cli_instance, session_id: _show_help(),
+        '/history': _show_session_history,
+        '/check': _document_check_mode,
+        '/viz': lambda cli_instance, session_id: _show_visualization_info(),
+    }.items()
+}
+
+# Inputs leaving the document check mode
+_CHECK_MODE_EXIT_COMMANDS = frozenset({'exit', 'quit', '/exit', '/quit'})
+
+
+# Inputs at least this long are document text, never a file path
+_PATH_MAX = 4096
+
+# Inputs with more spaces than this and no path separator or known file
+# extension are taken for pasted text
+_PATH_MAX_SPACES = 1
+
+_PATH_SEPARATORS = tuple(sep for sep in (os.sep, os.altsep) if sep)
+
+
+def _looks_like_path(user_input: str) -> bool:
+    """Check whether check mode input names an existing file.
+    
+    Pasted document text is recognized without touching the filesystem,
+    only plausible paths are looked up. A line of prose has several spaces
+    but neither a path separator nor a supported file extension.
+    
+    Args:
+        user_input: Line entered by the user.
+        
+    Returns:
+        True if the input is a path of an existing file or directory.
+    """
+    if len(user_input) >= _PATH_MAX or '\n' in user_input or '\0' in user_input:
+        return False
+    if (user_input.count(' ') > _PATH_MAX_SPACES
+            and not any(sep in user_input for sep in _PATH_SEPARATORS)
+            and os.path.splitext(user_input.rstrip())[1].lower() not in _FORMAT_INFO):
+        return False
+    return os.path.exists(user_input)
+
+
+_WORD_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+
+def _read_check_document(file_path: Path, parse_cache: Optional[ParseCache] = None) -> Optional[str]:
+    """Read a document entered in the compliance check mode.
+    
+    The reader is chosen by file suffix from ``_CHECK_DOCUMENT_READERS``.
+    
+    Args:
+        file_path: Path to the document file.
+        parse_cache: Optional cache of texts read before.
+        
+    Returns:
+        Document text, or None if a .docx file cannot be read because
+        neither lxml nor python-docx is installed.
+    """
+    cache_key = parse_cache.key_for(file_path) if parse_cache is not None else None
+    if cache_key is not None:
+        cached = parse_cache.get(cache_key)
+        if cached is not None:
+            return cached[0]
+    
+    reader = _CHECK_DOCUMENT_READERS.get(file_path.suffix.lower(), _read_text_file)
+    content = reader(file_path)
+    
+    if cache_key is not None and content is not None:
+        parse_cache.put(cache_key, content, {'file_type': file_path.suffix.lower().lstrip('.')})
+    return content
+
+
+def _read_text_file(file_path: Path) -> str:
+    """Read a UTF-8 text file.
+    
+    Raises:
+        ValueError: If the file is larger than _CHECK_TEXT_MAX_SIZE.
+    """
+    with open(file_path, 'r', encoding='utf-8') as f:
+        # Checked before reading: the whole text goes into one prompt
+        size = os.fstat(f.fileno()).st_size
+        if size > _CHECK_TEXT_MAX_SIZE:
+            raise ValueError(
+                f"файл слишком большой для проверки ({_format_file_size(size)}, "
+                f"максимум {_format_file_size(_CHECK_TEXT_MAX_SIZE)}, "
+                f"задается переменной AI_AGENT_CHECK_MAX_SIZE)"
+            )
+        return f.read()
+
+
+def _read_with_file_processor(file_path: Path) -> str:
+    """Read a binary document format through the file processor."""
+    from ..utils.file_processor import file_processor
+    return file_processor.extract_text(file_path)[0]
+
+
+def _read_docx_text(file_path: Path) -> Optional[str]:
+    """Read paragraph text from a .docx file.
+    
+    lxml and python-docx are imported here rather than at module level, they
+    are only needed when a .docx file is checked.
+    
+    Args:
+        file_path: Path to the .docx file.
+        
+    Returns:
+        Non-empty paragraphs joined with newlines, or None if neither lxml
+        nor python-docx is installed.
+    """
+    try:
+        return _read_docx_streaming(file_path)
+    except ImportError:
+        pass
+    
+    try:
+        from docx import Document as DocxDocument
+    except ImportError:
+        return None
+    
+    doc = DocxDocument(file_path)
+    return _join_paragraphs(paragraph.text for paragraph in doc.paragraphs)
+
+
+def _join_paragraphs(texts: Iterable[str]) -> str:
+    """Join non-empty paragraph texts with newlines.
+    
+    Texts are written to one buffer as they are produced, without first
+    collecting every paragraph string in a list.
+    
+    Args:
+        texts: Paragraph texts.
+        
+    Returns:
+        Non-empty paragraphs joined with newlines.
+    """
+    buffer = io.StringIO()
+    for text in texts:
+        if text.strip():
+            if buffer.tell():
+                buffer.write('\n')
+            buffer.write(text)
+    return buffer.getvalue()
+
+
+def _read_docx_streaming(file_path: Path) -> str:
+    """Read paragraph text from a .docx file without building the whole DOM.
+    
+    Paragraphs of word/document.xml are parsed one by one with
+    lxml.etree.iterparse and discarded right after their text is taken.
+    
+    Args:
+        file_path: Path to the .docx file.
+        
+    Returns:
+        Non-empty paragraphs joined with newlines.
+        
+    Raises:
+        ImportError: If lxml is not installed.
+    """
+    from lxml import etree
+    
+    paragraph_tag = f'{_WORD_NS}p'
+    text_tag = f'{_WORD_NS}t'
+    tab_tag = f'{_WORD_NS}tab'
+    break_tag = f'{_WORD_NS}br'
+    
+    def paragraph_texts():
+        with zipfile.ZipFile(file_path) as archive:
+            with archive.open('word/document.xml') as fh:
+                for _, paragraph in etree.iterparse(fh, events=('end',), tag=paragraph_tag):
+                    parts = []
+                    for node in paragraph.iter(text_tag, tab_tag, break_tag):
+                        if node.tag == text_tag:
+                            parts.append(node.text or '')
+                        elif node.tag == tab_tag:
+                            parts.append('\t')
+                        else:
+                            parts.append('\n')
+                    yield ''.join(parts)
+                    
+                    # Free parsed paragraphs to keep memory flat
+                    paragraph.clear()
+                    while paragraph.getprevious() is not None:
+                        del paragraph.getparent()[0]
+    
+    return _join_paragraphs(paragraph_texts())
+
+
+# Largest text file in bytes read in the check mode; the whole document is
+# sent to the model in one prompt, so larger files are rejected before reading
+_CHECK_TEXT_MAX_SIZE = int(os.getenv('AI_AGENT_CHECK_MAX_SIZE', str(10 * 1024 * 1024)))
+
+
+# Check mode readers by file suffix; other files are read as UTF-8 text
+_CHECK_DOCUMENT_READERS = {
+    '.docx': _read_docx_text,
+    '.pdf': _read_with_file_processor,
+    '.rtf': _read_with_file_processor,
+}
+
+
+def _render_response(text: str, cache: bool = True) -> "Panel":
+    """Build the panel showing a response.
+
+    Args:
+        text: Response text.
+        cache: Whether to reuse and keep the parsed Markdown. Partial
+            responses of a stream are never shown twice and are not cached.
+    """
+    from rich.panel import Panel
+
+    return Panel(_response_content(text, cache), title="🤖 Ответ", border_style="blue")
+
+
+def _response_content(text: str, cache: bool = True):
+    """Get the renderable for a response text.
+
+    Text without Markdown syntax and responses longer than
+    ``_MARKDOWN_RESPONSE_LIMIT`` are shown as plain text, parsing them as
+    Markdown gains nothing or takes seconds.
+
+    Args:
+        text: Response text.
+        cache: Whether to reuse and keep the parsed Markdown.
+    """
+    from rich.text import Text
+
+    if len(text) > _MARKDOWN_RESPONSE_LIMIT or not _MARKDOWN_SYNTAX_RE.search(text):
+        return Text(text)
+    if cache:
+        return _parse_markdown(text)
+    from rich.markdown import Markdown
+    return Markdown(text)
+
+
+@functools.lru_cache(maxsize=64)
+def _parse_markdown(text: str):
+    """Parse response Markdown; parsed documents can be rendered repeatedly."""
+    from rich.markdown import Markdown
+    return Markdown(text)
+
+
 def _display_response(response):
     """Display query response."""
-    # Create markdown content
-    response_md = Markdown(response.response)
-    
-    # Add metadata if available
+    console.print(_render_response(response.response))
+    _display_response_metadata(response)
+
+
+def _display_response_metadata(response):
+    """Display confidence, timing and sources of a query response."""
     metadata_parts = []
     if response.confidence_score:
         confidence_percent = int(response.confidence_score * 100)
@@ -1228,16 +2085,73 @@ def _display_response(response):
     if response.relevant_documents:
         metadata_parts.append(f"Источники: {len(response.relevant_documents)} док.")
     
-    # Display response with proper markdown rendering
-    console.print(Panel(response_md, title="🤖 Ответ", border_style="blue"))
-    
-    # Display metadata separately if available
     if metadata_parts:
         console.print(f"[dim]ℹ️ {' | '.join(metadata_parts)}[/dim]")
 
 
+def _stream_query_response(cli_instance, query: str, session_id: str):
+    """Process a query showing the answer while it is being generated.
+
+    The spinner is shown until the first chunk arrives. The live view is
+    re-rendered at most every ``_STREAM_REFRESH_INTERVAL`` seconds so the
+    growing Markdown is not re-parsed for every token.
+
+    Args:
+        cli_instance: CLI instance.
+        query: User query.
+        session_id: Session identifier.
+
+    Returns:
+        Query response, or None if processing failed.
+    """
+    from ..core.query_processor import QueryProcessorError
+    from rich.live import Live
+    
+    progress = _get_progress()
+    task = _start_progress_task("Обработка запроса...")
+    live = None
+    parts = []
+    last_refresh = 0.0
+    try:
+        stream = cli_instance.query_processor.process_general_query_stream(
+            query=query,
+            session_id=session_id
+        )
+        while True:
+            try:
+                chunk = next(stream)
+            except StopIteration as stop:
+                return stop.value
+            
+            parts.append(chunk)
+            if live is None:
+                # Only one live display can be active on the console
+                _finish_progress_task(task)
+                task = None
+                live = Live(console=console, auto_refresh=False)
+                live.start()
+            
+            now = time.monotonic()
+            if now - last_refresh >= _STREAM_REFRESH_INTERVAL:
+                live.update(_render_response(''.join(parts), cache=False), refresh=True)
+                last_refresh = now
+    except QueryProcessorError as e:
+        if task is not None:
+            progress.update(task, description="Ошибка обработки ❌")
+        console.print(f"[red]❌ Ошибка: {e}")
+        return None
+    finally:
+        if task is not None:
+            _finish_progress_task(task)
+        if live is not None:
+            live.update(_render_response(''.join(parts)), refresh=True)
+            live.stop()
+
+
 def _list_sessions(cli_instance):
     """List all sessions."""
+    from rich.table import Table
+    
     sessions = cli_instance.session_manager.list_sessions()
     
     if not sessions:
@@ -1257,7 +2171,7 @@ def _list_sessions(cli_instance):
         status = "🟢 Активна" if session['is_active'] else "🔴 Неактивна"
         
         table.add_row(
-            session['id'][:8] + "...",
+            _short_id(session['id']),
             created,
             updated,
             str(session['message_count']),
@@ -1269,6 +2183,8 @@ def _list_sessions(cli_instance):
 
 def _list_documents(cli_instance, category_filter=None, tags_filter=None):
     """List all documents."""
+    from rich.table import Table
+    
     documents = cli_instance.document_manager.list_documents(
         category_filter=category_filter,
         tags_filter=tags_filter
@@ -1300,20 +2216,12 @@ def _list_documents(cli_instance, category_filter=None, tags_filter=None):
     for doc in documents:
         upload_date = doc['upload_date'][:19].replace('T', ' ') if doc['upload_date'] else "Неизвестно"
         
-        # Format tags
-        doc_tags = doc.get('tags', [])
-        if isinstance(doc_tags, str):
-            doc_tags = doc_tags.split(',') if doc_tags else []
-        tags_str = ', '.join(doc_tags[:2]) if doc_tags else "нет"
-        if len(doc_tags) > 2:
-            tags_str += f" +{len(doc_tags) - 2}"
-        
         table.add_row(
-            doc['id'][:8] + "...",
-            doc['title'][:25] + ("..." if len(doc['title']) > 25 else ""),
+            _short_id(doc['id']),
+            _ellipsize(doc['title'], 25),
             doc['file_type'],
-            doc.get('category', 'general'),
-            tags_str,
+            doc.get('category') or 'general',
+            _format_tags(doc.get('tags'), limit=2),
             str(doc['chunk_count']),
             upload_date
         )
@@ -1323,6 +2231,8 @@ def _list_documents(cli_instance, category_filter=None, tags_filter=None):
 
 def _show_document_info(cli_instance, doc_id):
     """Show document information."""
+    from rich.panel import Panel
+    
     doc_info = cli_instance.document_manager.get_document_info(doc_id)
     
     if not doc_info:
@@ -1347,6 +2257,8 @@ def _show_document_info(cli_instance, doc_id):
 
 def _show_collection_stats(cli_instance):
     """Show collection statistics."""
+    from rich.panel import Panel
+    
     stats = cli_instance.document_manager.get_collection_stats()
     
     stats_text = f"""
@@ -1358,72 +2270,179 @@ def _show_collection_stats(cli_instance):
     console.print(Panel(stats_text, title="Статистика коллекции"))
 
 
-def _find_files_for_batch_upload(path: str, pattern: str, recursive: bool) -> List[Path]:
+def _find_files_for_batch_upload(
+    path: str,
+    pattern: str,
+    recursive: bool,
+    sizes: Optional[Dict[Path, int]] = None
+) -> List[Path]:
     """Find files for batch upload based on pattern and recursion settings.
     
+    The directory tree is walked once with os.scandir, skipping hidden
+    subdirectories. Plain extension patterns like ``*.txt`` are matched by
+    suffix lookup, the other patterns are compiled into one regular
+    expression matched against the file name.
+    
     Args:
         path: Path to search (file or directory).
         pattern: File patterns to match (comma-separated).
         recursive: Whether to search recursively.
+        sizes: Optional dict filled with the size of every found file, taken
+            from the scan so that later steps do not stat the files again.
         
     Returns:
         List of file paths to upload.
     """
     path_obj = Path(path)
-    files_to_upload = []
     
-    # Parse patterns
-    patterns = [p.strip() for p in pattern.split(',')]
+    try:
+        path_stat = path_obj.stat()
+    except OSError:
+        return []
     
-    if path_obj.is_file():
+    if stat.S_ISREG(path_stat.st_mode):
         # Single file provided
-        files_to_upload.append(path_obj)
-    elif path_obj.is_dir():
-        # Directory provided - find matching files
-        for pattern_str in patterns:
-            if recursive:
-                files_to_upload.extend(path_obj.rglob(pattern_str))
-            else:
-                files_to_upload.extend(path_obj.glob(pattern_str))
+        if sizes is not None:
+            sizes[path_obj] = path_stat.st_size
+        return [path_obj]
+    if not stat.S_ISDIR(path_stat.st_mode):
+        return []
+    
+    # Parse patterns
+    patterns = _parse_csv(pattern)
+    suffixes = frozenset(p[1:].lower() for p in patterns if _SUFFIX_PATTERN_RE.match(p))
+    name_patterns = [p for p in patterns if not _SUFFIX_PATTERN_RE.match(p)]
+    name_match = _compile_name_patterns(name_patterns)
     
-    # Remove duplicates and sort
-    files_to_upload = sorted(list(set(files_to_upload)))
+    # Every directory entry is visited once, so matches need no dedup step
+    found_entries = []
+    stack = [str(path_obj)]
     
-    # Filter out non-files (in case glob matched directories)
-    files_to_upload = [f for f in files_to_upload if f.is_file()]
+    while stack:
+        current_dir = stack.pop()
+        try:
+            with os.scandir(current_dir) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        # Hidden directories (.git, .venv, ...) hold no documents
+                        if recursive and not entry.name.startswith('.'):
+                            stack.append(entry.path)
+                    elif entry.is_file():
+                        name = entry.name
+                        if (os.path.splitext(name)[1].lower() in suffixes or
+                                (name_match is not None and name_match(os.path.normcase(name)))):
+                            found_entries.append(entry)
+        except OSError as e:
+            logger.warning(f"Cannot scan directory {current_dir}: {e}")
+    
+    # scandir order is arbitrary, keep uploads deterministic; plain strings
+    # sort much faster than Path objects
+    found_entries.sort(key=lambda entry: entry.path)
+    files_to_upload = [Path(entry.path) for entry in found_entries]
+    
+    if sizes is not None and found_entries:
+        # Each stat is a round trip on network shares, overlap them
+        workers = min(_SCAN_STAT_WORKERS, len(found_entries))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='cli-stat') as executor:
+            found_sizes = executor.map(_entry_size, found_entries)
+            for file_path, size in zip(files_to_upload, found_sizes):
+                if size is not None:
+                    sizes[file_path] = size
     
     return files_to_upload
 
 
-def _show_batch_upload_preview(files: List[Path]) -> None:
+def _entry_size(entry: os.DirEntry) -> Optional[int]:
+    """Get the size of a scanned file, or None if it cannot be stat-ed."""
+    try:
+        return entry.stat().st_size
+    except OSError:
+        return None
+
+
+def _compile_name_patterns(patterns: List[str]):
+    """Compile shell patterns into a single matcher.
+    
+    Names and patterns are normalized with os.path.normcase, as fnmatch does.
+    
+    Args:
+        patterns: Shell-style file name patterns.
+        
+    Returns:
+        Match function of the combined expression, or None if there are no
+        patterns.
+    """
+    if not patterns:
+        return None
+    return re.compile(
+        '|'.join(fnmatch.translate(os.path.normcase(p)) for p in patterns)
+    ).match
+
+
+def _show_batch_upload_preview(files: List[Path], sizes: Optional[Dict[Path, int]] = None) -> None:
     """Show preview of files that will be uploaded.
     
     Args:
         files: List of file paths.
+        sizes: File sizes collected while searching for the files.
     """
+    from rich.table import Table
+    
     table = Table(title="Предварительный просмотр загрузки")
     table.add_column("№", style="cyan", width=4)
     table.add_column("Файл", style="white")
     table.add_column("Размер", style="green", width=10)
     table.add_column("Тип", style="magenta", width=8)
     
-    for i, file_path in enumerate(files, 1):
+    def make_row(i: int, file_path: Path) -> Sequence[str]:
         try:
-            size = file_path.stat().st_size
+            size = sizes[file_path] if sizes and file_path in sizes else os.stat(file_path).st_size
             size_str = _format_file_size(size)
-        except:
+        except OSError:
             size_str = "Неизвестно"
         
-        table.add_row(
-            str(i),
+        return (
+            str(i + 1),
             str(file_path),
             size_str,
             file_path.suffix[1:] if file_path.suffix else "unknown"
         )
     
+    _add_file_table_rows(table, files, make_row, gap_column=1)
     console.print(table)
 
 
+def _add_file_table_rows(table, items: Sequence[Any], make_row, gap_column: int = 0) -> None:
+    """Add rows for a list of files, eliding the middle of long lists.
+    
+    Lists longer than _FILE_TABLE_ROW_LIMIT show only their first and last
+    rows around a row with the number of hidden files, so huge batches
+    neither build nor print thousands of rows. Rows are only created for
+    the shown items.
+    
+    Args:
+        table: Rich table to add rows to.
+        items: Items to show.
+        make_row: Function building the row cells from an item index and item.
+        gap_column: Column of the hidden files row holding its label.
+    """
+    count = len(items)
+    if count <= _FILE_TABLE_ROW_LIMIT:
+        head, tail = count, 0
+    else:
+        head, tail = _FILE_TABLE_HEAD_ROWS, _FILE_TABLE_TAIL_ROWS
+    
+    for i in range(head):
+        table.add_row(*make_row(i, items[i]))
+    
+    if tail:
+        gap = [''] * len(table.columns)
+        gap[gap_column] = f"… скрыто файлов: {count - head - tail}"
+        table.add_row(*gap)
+        for i in range(count - tail, count):
+            table.add_row(*make_row(i, items[i]))
+
+
 def _format_file_size(size_bytes: int) -> str:
     """Format file size in human readable format.
     
@@ -1433,14 +2452,29 @@ def _format_file_size(size_bytes: int) -> str:
     Returns:
         Formatted size string.
     """
-    if size_bytes < 1024:
+    # Every 10 bits of the size is one 1024x unit step
+    unit = min((size_bytes.bit_length() - 1) // 10, len(_SIZE_UNITS) - 1) if size_bytes > 0 else 0
+    if unit == 0:
         return f"{size_bytes} B"
-    elif size_bytes < 1024 * 1024:
-        return f"{size_bytes / 1024:.1f} KB"
-    elif size_bytes < 1024 * 1024 * 1024:
-        return f"{size_bytes / (1024 * 1024):.1f} MB"
-    else:
-        return f"{size_bytes / (1024 * 1024 * 1024):.1f} GB"
+    return f"{size_bytes / (1 << (10 * unit)):.1f} {_SIZE_UNITS[unit]}"
+
+
+def _make_upload_progress():
+    """Create the progress bar of a batch upload.
+    
+    Returns:
+        Progress instance with bar, percentage, count and remaining time.
+    """
+    from rich.progress import Progress, BarColumn, TextColumn, TimeRemainingColumn
+    
+    return Progress(
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
+        TextColumn("({task.completed}/{task.total})"),
+        TimeRemainingColumn(),
+        console=console
+    )
 
 
 def _perform_batch_upload(
@@ -1449,10 +2483,20 @@ def _perform_batch_upload(
     common_metadata: Dict[str, str],
     category: DocumentCategory,
     tags: List[str],
-    skip_errors: bool
+    skip_errors: bool,
+    workers: int = 1,
+    sizes: Optional[Dict[Path, int]] = None,
+    batch_size: int = _BATCH_UPLOAD_SIZE
 ) -> Dict[str, Any]:
     """Perform batch upload of files with progress tracking.
     
+    Files are first uploaded in batches of ``batch_size`` with one batched
+    DocumentManager call each. Files of failed batches are then uploaded one
+    by one, concurrently by a thread pool so that Ollama embedding requests
+    of different files overlap, and failures are reported per file. Without
+    ``skip_errors`` no batch is started after a failed one. Results keep the
+    input file order.
+    
     Args:
         cli_instance: CLI instance with document manager.
         files: List of files to upload.
@@ -1460,13 +2504,14 @@ def _perform_batch_upload(
         category: Category for all files.
         tags: Tags for all files.
         skip_errors: Whether to continue on individual file errors.
+        workers: Number of parallel upload workers.
+        sizes: File sizes collected while searching for the files; files
+            missing from it are reported without a size.
+        batch_size: Number of files per batched upload call.
         
     Returns:
         Results dictionary with success/failure counts and details.
     """
-    from rich.progress import Progress, BarColumn, TextColumn, TimeRemainingColumn
-    import os
-    
     results = {
         'total_files': len(files),
         'successful': [],
@@ -1474,23 +2519,45 @@ def _perform_batch_upload(
         'skipped': []
     }
     
+    # Created before the progress bar starts, its spinner cannot nest in it
+    document_manager = cli_instance.document_manager
+    
+    # Metadata shared by all files, each file only adds its own path
+    base_metadata = {**common_metadata, 'batch_upload': 'true'}
+    
+    def metadata_for(file_path: Path) -> Dict[str, str]:
+        return {**base_metadata, 'original_path': str(file_path)}
+    
+    def success_outcome(file_path: Path, doc_id: str) -> Dict[str, Any]:
+        return {
+            'file': str(file_path),
+            'name': file_path.name,
+            'doc_id': doc_id,
+            'size': sizes.get(file_path) if sizes else None
+        }
+    
+    def upload_one(file_path: Path) -> Dict[str, Any]:
+        doc_id = document_manager.upload_document(
+            file_path=str(file_path),
+            metadata=metadata_for(file_path),
+            category=category,
+            tags=tags
+        )
+        return success_outcome(file_path, doc_id)
+    
     # Skip progress bar in tests
     use_progress = not os.getenv('PYTEST_CURRENT_TEST')
     
     if use_progress:
-        progress_context = Progress(
-            TextColumn("[progress.description]{task.description}"),
-            BarColumn(),
-            TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
-            TextColumn("({task.completed}/{task.total})"),
-            TimeRemainingColumn(),
-            console=console
-        )
+        progress_context = _make_upload_progress()
     else:
         # Simple context manager for tests
         from contextlib import nullcontext
         progress_context = nullcontext()
     
+    # Outcomes are collected by input index so the report keeps file order
+    outcomes: Dict[int, Any] = {}
+    
     with progress_context as progress:
         
         if use_progress and progress:
@@ -1501,56 +2568,94 @@ def _perform_batch_upload(
         else:
             upload_task = None
         
-        for i, file_path in enumerate(files):
+        def show_completed(completed: int) -> None:
             if use_progress and progress and upload_task is not None:
-                progress.update(
-                    upload_task, 
-                    description=f"Загрузка: {file_path.name}",
-                    completed=i
-                )
-            
+                progress.update(upload_task, completed=completed)
+        
+        stopped = False
+        batch_size = max(1, batch_size)
+        # Files past a failed batch are not uploaded unless errors are skipped
+        fallback_end = len(files)
+        for offset in range(0, len(files), batch_size):
+            batch = files[offset:offset + batch_size]
+            uploaded_before = len(outcomes)
             try:
-                # Prepare metadata for this file
-                file_metadata = common_metadata.copy()
-                file_metadata['original_path'] = str(file_path)
-                file_metadata['batch_upload'] = 'true'
-                
-                # Upload document
-                doc_id = cli_instance.document_manager.upload_document(
-                    file_path=str(file_path),
-                    metadata=file_metadata,
+                doc_ids = list(document_manager.upload_documents(
+                    [(file_path, metadata_for(file_path)) for file_path in batch],
                     category=category,
-                    tags=tags
-                )
-                
-                results['successful'].append({
-                    'file': str(file_path),
-                    'doc_id': doc_id,
-                    'size': file_path.stat().st_size
-                })
-                
+                    tags=tags,
+                    max_workers=max(1, workers),
+                    progress_callback=lambda completed, total: show_completed(uploaded_before + completed)
+                ))
             except Exception as e:
-                error_info = {
-                    'file': str(file_path),
-                    'error': str(e)
-                }
+                logger.warning(f"Batched upload failed, uploading its files one by one: {e}")
+                show_completed(uploaded_before)
+                if not skip_errors:
+                    fallback_end = offset + len(batch)
+                    break
+                continue
+            
+            # The batch is stored, its files must never reach the per-file fallback
+            for i, file_path in enumerate(batch, offset):
+                if i - offset < len(doc_ids):
+                    outcomes[i] = success_outcome(file_path, doc_ids[i - offset])
+                else:
+                    outcomes[i] = {
+                        'file': str(file_path),
+                        'name': file_path.name,
+                        'error': "не получен ID документа"
+                    }
+        
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            future_to_index = {
+                executor.submit(upload_one, file_path): i
+                for i, file_path in enumerate(files[:fallback_end])
+                if i not in outcomes
+            }
+            
+            for future in as_completed(future_to_index):
+                if future.cancelled():
+                    continue
                 
-                if skip_errors:
-                    results['failed'].append(error_info)
+                i = future_to_index[future]
+                file_path = files[i]
+                
+                try:
+                    outcomes[i] = future.result()
+                    description = f"Загружен: {file_path.name}"
+                except Exception as e:
+                    outcomes[i] = {
+                        'file': str(file_path),
+                        'name': file_path.name,
+                        'error': str(e)
+                    }
                     logger.warning(f"Failed to upload {file_path}: {e}")
-                else:
-                    results['failed'].append(error_info)
-                    if use_progress and progress and upload_task is not None:
-                        progress.update(upload_task, description=f"Ошибка: {file_path.name}")
-                    break
+                    description = f"Ошибка: {file_path.name}"
+                    
+                    if not skip_errors and not stopped:
+                        # Do not start pending uploads; in-flight ones finish
+                        # and are still reported
+                        stopped = True
+                        for pending in future_to_index:
+                            pending.cancel()
+                
+                if use_progress and progress and upload_task is not None:
+                    progress.update(upload_task, description=description, advance=1)
         
         if use_progress and progress and upload_task is not None:
             progress.update(
                 upload_task, 
                 completed=len(files),
-                description="Загрузка завершена"
+                description="Загрузка завершена" if not stopped else "Загрузка прервана"
             )
     
+    for i in sorted(outcomes):
+        outcome = outcomes[i]
+        if 'error' in outcome:
+            results['failed'].append(outcome)
+        else:
+            results['successful'].append(outcome)
+    
     return results
 
 
@@ -1560,6 +2665,9 @@ def _show_batch_upload_results(results: Dict[str, Any]) -> None:
     Args:
         results: Results dictionary from batch upload.
     """
+    from rich.table import Table
+    from rich.panel import Panel
+    
     total = results['total_files']
     successful = len(results['successful'])
     failed = len(results['failed'])
@@ -1597,12 +2705,11 @@ def _show_batch_upload_results(results: Dict[str, Any]) -> None:
         success_table.add_column("ID документа", style="cyan")
         success_table.add_column("Размер", style="green")
         
-        for item in results['successful']:
-            success_table.add_row(
-                Path(item['file']).name,
-                item['doc_id'][:8] + "...",
-                _format_file_size(item['size'])
-            )
+        _add_file_table_rows(success_table, results['successful'], lambda i, item: (
+            item['name'],
+            _short_id(item['doc_id']),
+            _format_file_size(item['size']) if item['size'] is not None else '—'
+        ))
         
         console.print(success_table)
     
@@ -1612,11 +2719,10 @@ def _show_batch_upload_results(results: Dict[str, Any]) -> None:
         error_table.add_column("Файл", style="white")
         error_table.add_column("Ошибка", style="red")
         
-        for item in results['failed']:
-            error_table.add_row(
-                Path(item['file']).name,
-                item['error'][:50] + ("..." if len(item['error']) > 50 else "")
-            )
+        _add_file_table_rows(error_table, results['failed'], lambda i, item: (
+            item['name'],
+            _ellipsize(item['error'], 50)
+        ))
         
         console.print(error_table)
 
@@ -1630,6 +2736,10 @@ def _select_reference_documents_interactive(cli_instance) -> Optional[List[str]]
     Returns:
         List of selected document IDs or None if cancelled.
     """
+    from rich.table import Table
+    from rich.panel import Panel
+    from rich.prompt import Prompt
+    
     try:
         # Get all reference documents
         reference_docs = cli_instance.document_manager.get_reference_documents()
@@ -1654,16 +2764,11 @@ def _select_reference_documents_interactive(cli_instance) -> Optional[List[str]]
         table.add_column("Чанков", style="green", width=8)
         
         for i, doc in enumerate(reference_docs, 1):
-            doc_tags = doc.get('tags', [])
-            if isinstance(doc_tags, str):
-                doc_tags = doc_tags.split(',') if doc_tags else []
-            tags_str = ', '.join(doc_tags) if doc_tags else "нет"
-            
             table.add_row(
                 str(i),
-                doc['id'][:8] + "...",
-                doc['title'][:40] + ("..." if len(doc['title']) > 40 else ""),
-                tags_str,
+                _short_id(doc['id']),
+                _ellipsize(doc['title'], 40),
+                _format_tags(doc.get('tags')),
                 str(doc['chunk_count'])
             )
         
@@ -1686,31 +2791,26 @@ def _select_reference_documents_interactive(cli_instance) -> Optional[List[str]]
         # Parse selection
         try:
             selected_indices = [int(x.strip()) for x in selection.split(',') if x.strip()]
-            selected_docs = []
+            valid_range = range(1, len(reference_docs) + 1)
             
-            for idx in selected_indices:
-                if 1 <= idx <= len(reference_docs):
-                    selected_docs.append(reference_docs[idx - 1]['id'])
-                else:
-                    console.print(f"[yellow]⚠️ Номер {idx} вне диапазона, пропущен")
+            out_of_range = [idx for idx in selected_indices if idx not in valid_range]
+            if out_of_range:
+                skipped = ', '.join(map(str, out_of_range))
+                console.print(f"[yellow]⚠️ Номера вне диапазона, пропущены: {skipped}")
+            
+            # Keep the documents themselves, their titles are shown below
+            selected_docs = [reference_docs[idx - 1] for idx in selected_indices if idx in valid_range]
             
             if not selected_docs:
                 console.print("[red]❌ Не выбрано ни одного документа")
                 return None
             
             # Show selected documents
-            selected_titles = []
-            for doc_id in selected_docs:
-                for doc in reference_docs:
-                    if doc['id'] == doc_id:
-                        selected_titles.append(doc['title'])
-                        break
-            
             console.print(f"\n[green]✅ Выбрано документов: {len(selected_docs)}")
-            for title in selected_titles:
-                console.print(f"  • {title}")
+            for doc in selected_docs:
+                console.print(f"  • {doc['title']}")
             
-            return selected_docs
+            return [doc['id'] for doc in selected_docs]
             
         except ValueError:
             console.print("[red]❌ Неверный формат выбора")
@@ -1728,6 +2828,8 @@ def _display_compliance_report(response, reference_doc_ids=None):
         response: Query response with compliance analysis.
         reference_doc_ids: List of reference document IDs used.
     """
+    from rich.panel import Panel
+    
     # Create enhanced markdown content for compliance report
     report_content = response.response
     
@@ -1755,21 +2857,23 @@ def _display_compliance_report(response, reference_doc_ids=None):
     elif response.relevant_documents:
         metadata_parts.append(f"Использовано документов: {len(response.relevant_documents)}")
     
-    # Display main report
-    console.print(Panel(
-        Markdown(report_content), 
+    # Main report, printed together with the lines below in one call
+    parts = [Panel(
+        _response_content(report_content), 
         title="📋 Отчет о соответствии", 
         border_style="blue"
-    ))
+    )]
     
-    # Display metadata
+    # Metadata
     if metadata_parts:
-        console.print(f"[dim]ℹ️ {' | '.join(metadata_parts)}[/dim]")
+        parts.append(f"[dim]ℹ️ {' | '.join(metadata_parts)}[/dim]")
     
-    # Display source documents if available
+    # Source documents if available
     if response.relevant_documents:
-        console.print(f"\n[bold]📚 Источники ({len(response.relevant_documents)} документов):[/bold]")
+        parts.append(f"\n[bold]📚 Источники ({len(response.relevant_documents)} документов):[/bold]")
         for i, doc_id in enumerate(response.relevant_documents[:5], 1):  # Show first 5
-            console.print(f"  {i}. {doc_id[:8]}...")
+            parts.append(f"  {i}. {_short_id(doc_id)}")
         if len(response.relevant_documents) > 5:
-            console.print(f"  ... и еще {len(response.relevant_documents) - 5} документов")
\ No newline at end of file
+            parts.append(f"  ... и еще {len(response.relevant_documents) - 5} документов")
+    
+    console.print(*parts, sep="\n")
\ No newline at end of file
@@ -0,0 +1,518 @@
+"""Background daemon keeping CLI components resident between invocations."""
+
+import os
+import sys
+import json
+import time
+import shutil
+import signal
+import socket
+import struct
+import threading
+import subprocess
+import socketserver
+from pathlib import Path
+from typing import Optional, List, Dict, Any, Tuple
+
+from ..utils.logging_config import get_logger
+
+
+logger = get_logger(__name__)
+
+SOCKET_PATH = Path(os.getenv('AI_AGENT_SOCKET', str(Path.home() / '.ai_agent' / 'cli.sock')))
+LOG_PATH = SOCKET_PATH.with_suffix('.log')
+
+# Commands executed by the daemon. Every command writing to ChromaDB is
+# here: while the daemon runs it must be the only process writing to the
+# persist directory of its working directory.
+FORWARDED_COMMANDS = frozenset({
+    'status', 'docs', 'formats', 'health', 'session',
+    'upload', 'upload-reference', 'manage-doc', 'batch-upload'
+})
+
+# Commands whose --delete asks for confirmation; the client asks and
+# forwards the command with --yes
+CONFIRMED_DELETE_COMMANDS = frozenset({'docs', 'session'})
+
+# Options that print local help
+LOCAL_ONLY_OPTIONS = frozenset({'--help'})
+
+# Short option letters of LOCAL_ONLY_OPTIONS
+_LOCAL_ONLY_SHORT = frozenset(
+    option[1] for option in LOCAL_ONLY_OPTIONS if not option.startswith('--')
+)
+
+# Message framing: 1-byte type, 4-byte big-endian length, payload
+MSG_REQUEST = b'q'
+MSG_OUTPUT = b'o'
+MSG_EXIT = b'x'
+MSG_REFUSED = b'r'
+MSG_INFO = b'i'
+
+_HEADER = struct.Struct('>cI')
+
+
+def send_message(sock: socket.socket, kind: bytes, payload: bytes) -> None:
+    """Send a framed message.
+
+    Args:
+        sock: Connected socket.
+        kind: One-byte message type.
+        payload: Message payload.
+    """
+    sock.sendall(_HEADER.pack(kind, len(payload)) + payload)
+
+
+def recv_message(sock: socket.socket) -> Optional[Tuple[bytes, bytes]]:
+    """Receive a framed message.
+
+    Args:
+        sock: Connected socket.
+
+    Returns:
+        Tuple of message type and payload, or None if the peer closed the connection.
+    """
+    header = _recv_exact(sock, _HEADER.size)
+    if header is None:
+        return None
+    kind, length = _HEADER.unpack(header)
+    payload = _recv_exact(sock, length)
+    if payload is None:
+        return None
+    return kind, payload
+
+
+def _recv_exact(sock: socket.socket, size: int) -> Optional[bytes]:
+    """Read exactly ``size`` bytes from a socket."""
+    chunks = []
+    remaining = size
+    while remaining:
+        chunk = sock.recv(remaining)
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b''.join(chunks)
+
+
+class _SocketWriter:
+    """File-like object streaming console output to the client."""
+
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+
+    def write(self, text: str) -> int:
+        if text:
+            send_message(self.sock, MSG_OUTPUT, text.encode('utf-8'))
+        return len(text)
+
+    def flush(self) -> None:
+        pass
+
+    def isatty(self) -> bool:
+        return False
+
+
+class _RequestHandler(socketserver.BaseRequestHandler):
+    """Handle one client connection."""
+
+    def handle(self):
+        message = recv_message(self.request)
+        if message is None or message[0] != MSG_REQUEST:
+            return
+
+        request = json.loads(message[1].decode('utf-8'))
+        cli_daemon = self.server.cli_daemon
+        op = request.get('op')
+
+        if op == 'ping':
+            send_message(self.request, MSG_INFO, json.dumps(cli_daemon.get_info()).encode('utf-8'))
+        elif op == 'stop':
+            send_message(self.request, MSG_INFO, json.dumps(cli_daemon.get_info()).encode('utf-8'))
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+        elif op == 'run':
+            cli_daemon.run_command(self.request, request)
+
+
+class _DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Threaded Unix socket server; commands are serialized by CLIDaemon."""
+
+    daemon_threads = True
+
+
+class CLIDaemon:
+    """Executes forwarded CLI commands with a resident AIAgentCLI instance."""
+
+    def __init__(self, socket_path: Path = SOCKET_PATH):
+        """Initialize daemon.
+
+        Args:
+            socket_path: Path of the Unix socket to listen on.
+        """
+        self.socket_path = Path(socket_path)
+        self.cwd = os.getcwd()
+        self.started_at = time.time()
+        self.requests_served = 0
+        self._lock = threading.Lock()  # ChromaDB and the CLI are not re-entrant
+        self._commands = None
+        self._cli_instance = None
+
+    def get_info(self) -> Dict[str, Any]:
+        """Get daemon status information.
+
+        Returns:
+            Dictionary with pid, working directory, uptime and request count.
+        """
+        return {
+            'pid': os.getpid(),
+            'cwd': self.cwd,
+            'uptime': time.time() - self.started_at,
+            'requests_served': self.requests_served
+        }
+
+    def serve_forever(self) -> None:
+        """Initialize components and serve requests until stopped."""
+        # Never take the socket over from a daemon that still answers
+        if daemon_status(self.socket_path) is not None:
+            logger.error(f"Another CLI daemon is already listening on {self.socket_path}")
+            return
+
+        from . import commands
+
+        self._commands = commands
+        self._cli_instance = commands.AIAgentCLI()
+        self._cli_instance.start_index_warmup()
+
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+        if self.socket_path.exists():
+            self.socket_path.unlink()  # Left behind by a daemon that died
+
+        # The socket is created by bind(); a private umask makes it 0600 from
+        # the start instead of tightening it after it is already listening
+        old_umask = os.umask(0o177)
+        try:
+            server = _DaemonServer(str(self.socket_path), _RequestHandler)
+        finally:
+            os.umask(old_umask)
+        server.cli_daemon = self
+
+        def _terminate(signum, frame):
+            threading.Thread(target=server.shutdown, daemon=True).start()
+
+        signal.signal(signal.SIGTERM, _terminate)
+        logger.info(f"CLI daemon listening on {self.socket_path}")
+
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+            if self.socket_path.exists():
+                self.socket_path.unlink()
+            logger.info("CLI daemon stopped")
+
+    def run_command(self, sock: socket.socket, request: Dict[str, Any]) -> None:
+        """Run a forwarded command and stream its output back.
+
+        Args:
+            sock: Client socket.
+            request: Request with command arguments and client terminal info.
+        """
+        # Relative data paths only match when both sides share the directory
+        if request.get('cwd') != self.cwd:
+            send_message(sock, MSG_REFUSED, b'')
+            return
+
+        from rich.console import Console
+
+        commands = self._commands
+        request_console = Console(
+            file=_SocketWriter(sock),
+            force_terminal=request.get('tty', False),
+            force_interactive=False,
+            width=request.get('width') or 80
+        )
+
+        with self._lock:
+            saved_console = commands.console
+            saved_progress = commands._shared_progress
+            commands.console = request_console
+            commands._shared_progress = None
+            try:
+                exit_code = self._invoke(request.get('args', []), request_console)
+            finally:
+                commands.console = saved_console
+                commands._shared_progress = saved_progress
+                # Other commands may add, change or delete documents and
+                # sessions, so status must not reuse stats computed before them
+                if _command_name(request.get('args', [])) != 'status':
+                    commands._status_stats = None
+            self.requests_served += 1
+
+        send_message(sock, MSG_EXIT, str(exit_code).encode('utf-8'))
+
+    def _invoke(self, args: List[str], request_console) -> int:
+        """Invoke the click group in-process.
+
+        Args:
+            args: Command line arguments.
+            request_console: Console bound to the client connection.
+
+        Returns:
+            Process exit code for the client.
+        """
+        import click
+
+        try:
+            self._commands.cli.main(
+                args=args,
+                prog_name='docai',
+                obj={'cli': self._cli_instance},
+                standalone_mode=False
+            )
+            return 0
+        except SystemExit as e:
+            if e.code is None:
+                return 0
+            return e.code if isinstance(e.code, int) else 1
+        except click.exceptions.Exit as e:
+            return e.exit_code
+        except click.ClickException as e:
+            request_console.print(f"[red]{e.format_message()}")
+            return e.exit_code
+        except click.Abort:
+            return 1
+        except Exception as e:
+            logger.error(f"Daemon command failed: {e}")
+            request_console.print(f"[red]❌ Ошибка: {e}")
+            return 1
+
+
+def _connect(socket_path: Path = SOCKET_PATH) -> Optional[socket.socket]:
+    """Connect to the daemon socket.
+
+    Returns:
+        Connected socket or None if the daemon is not running.
+    """
+    if not socket_path.exists():
+        return None
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(socket_path))
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+def _command_name(args: List[str]) -> Optional[str]:
+    """Get the subcommand name from command line arguments."""
+    for arg in args:
+        if not arg.startswith('-'):
+            return arg
+    return None
+
+
+def _has_local_only_option(args: List[str]) -> bool:
+    """Check whether the arguments request an option that must run in-process.
+
+    Long options are matched with and without an ``=value`` part. Short
+    options are matched by letter inside a group of short flags, so an
+    unrelated glued value containing the letter only makes the command run
+    in-process.
+    """
+    for arg in args:
+        if arg == '--':
+            break
+        if arg.startswith('--'):
+            if arg.split('=', 1)[0] in LOCAL_ONLY_OPTIONS:
+                return True
+        elif arg.startswith('-') and _LOCAL_ONLY_SHORT.intersection(arg[1:]):
+            return True
+    return False
+
+
+def _command_params(args: List[str]) -> Optional[Dict[str, Any]]:
+    """Parse the options of a subcommand the way click does.
+
+    Returns:
+        Parameter values by name, or None if the arguments are invalid.
+    """
+    import click
+    from .commands import cli
+
+    name = _command_name(args)
+    command = cli.get_command(None, name)
+    try:
+        ctx = command.make_context(name, list(args[args.index(name) + 1:]), resilient_parsing=True)
+    except click.ClickException:
+        return None
+    return ctx.params
+
+
+def _serves_directory(socket_path: Path) -> bool:
+    """Check whether a running daemon serves the current directory."""
+    info = daemon_status(socket_path)
+    return info is not None and info.get('cwd') == os.getcwd()
+
+
+def _with_yes(args: List[str]) -> List[str]:
+    """Insert --yes right after the subcommand name."""
+    index = args.index(_command_name(args)) + 1
+    return [*args[:index], '--yes', *args[index:]]
+
+
+def forward_to_daemon(args: List[str], socket_path: Path = SOCKET_PATH) -> Optional[int]:
+    """Execute a command through the daemon if it is running.
+
+    Confirmations are asked here, on the client terminal, and the command
+    is forwarded with --yes. The prompt of a batch upload depends on the
+    files found, so a batch upload without --yes is refused while the
+    daemon serves the directory instead of writing from a second process.
+
+    Args:
+        args: Command line arguments (without program name).
+        socket_path: Path of the daemon socket.
+
+    Returns:
+        Exit code of the command, or None if it must run in-process.
+    """
+    name = _command_name(args)
+    if name not in FORWARDED_COMMANDS or _has_local_only_option(args):
+        return None
+
+    if name == 'batch-upload' or name in CONFIRMED_DELETE_COMMANDS:
+        params = _command_params(args)
+        if params is None:
+            return None  # click reports the usage error in-process
+
+        if name == 'batch-upload' and not params.get('yes') and not params.get('dry_run'):
+            if not _serves_directory(socket_path):
+                return None
+            sys.stderr.write(
+                "❌ Демон работает с базой знаний этой папки. Добавьте --yes, чтобы "
+                "выполнить загрузку в демоне, или остановите его: docai daemon stop\n"
+            )
+            return 1
+
+        if name in CONFIRMED_DELETE_COMMANDS and params.get('delete') and not params.get('yes'):
+            if not _serves_directory(socket_path):
+                return None
+            from .commands import _confirm, _DELETE_PROMPTS
+            if not _confirm(_DELETE_PROMPTS[name].format(params['delete'])):
+                return 0
+            args = _with_yes(args)
+
+    sock = _connect(socket_path)
+    if sock is None:
+        return None
+
+    request = {
+        'op': 'run',
+        'args': list(args),
+        'cwd': os.getcwd(),
+        'tty': sys.stdout.isatty(),
+        'width': shutil.get_terminal_size().columns
+    }
+
+    with sock:
+        send_message(sock, MSG_REQUEST, json.dumps(request).encode('utf-8'))
+        while True:
+            message = recv_message(sock)
+            if message is None:
+                sys.stderr.write("❌ Соединение с демоном прервано\n")
+                return 1
+
+            kind, payload = message
+            if kind == MSG_OUTPUT:
+                sys.stdout.write(payload.decode('utf-8'))
+                sys.stdout.flush()
+            elif kind == MSG_EXIT:
+                return int(payload.decode('utf-8'))
+            elif kind == MSG_REFUSED:
+                return None
+
+
+def _request(op: str, socket_path: Path = SOCKET_PATH) -> Optional[Dict[str, Any]]:
+    """Send a control request to the daemon.
+
+    Returns:
+        Daemon info dictionary, or None if the daemon is not running.
+    """
+    sock = _connect(socket_path)
+    if sock is None:
+        return None
+
+    with sock:
+        send_message(sock, MSG_REQUEST, json.dumps({'op': op}).encode('utf-8'))
+        message = recv_message(sock)
+
+    if message is None or message[0] != MSG_INFO:
+        return None
+    return json.loads(message[1].decode('utf-8'))
+
+
+def daemon_status(socket_path: Path = SOCKET_PATH) -> Optional[Dict[str, Any]]:
+    """Get information about the running daemon.
+
+    Returns:
+        Daemon info dictionary, or None if the daemon is not running.
+    """
+    return _request('ping', socket_path)
+
+
+def stop_daemon(socket_path: Path = SOCKET_PATH) -> bool:
+    """Ask the running daemon to stop.
+
+    Returns:
+        True if a daemon was running and acknowledged the request.
+    """
+    return _request('stop', socket_path) is not None
+
+
+def start_daemon(socket_path: Path = SOCKET_PATH, timeout: float = 60.0) -> Optional[int]:
+    """Start the daemon in a background process.
+
+    Args:
+        socket_path: Path of the Unix socket to listen on.
+        timeout: Seconds to wait for the daemon to become ready.
+
+    Returns:
+        PID of the daemon, or None if it failed to start.
+    """
+    socket_path.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+    env = dict(os.environ, AI_AGENT_SOCKET=str(socket_path))
+
+    with open(socket_path.with_suffix('.log'), 'a', encoding='utf-8') as log_file:
+        process = subprocess.Popen(
+            [sys.executable, '-m', 'ai_agent.cli.daemon'],
+            cwd=os.getcwd(),
+            env=env,
+            stdin=subprocess.DEVNULL,
+            stdout=log_file,
+            stderr=subprocess.STDOUT,
+            start_new_session=True
+        )
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            return None
+        if daemon_status(socket_path) is not None:
+            return process.pid
+        time.sleep(0.2)
+
+    process.terminate()
+    return None
+
+
+def main() -> None:
+    """Daemon process entry point."""
+    from ..main import setup_environment
+
+    setup_environment()
+    CLIDaemon(SOCKET_PATH).serve_forever()
+
+
+if __name__ == '__main__':
+    main()
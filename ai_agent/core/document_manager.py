@@ -4,8 +4,9 @@ import os
 import uuid
 import time
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Callable
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import hashlib
 
 import chromadb
@@ -21,6 +22,7 @@ from ..utils.error_handling import (
 )
 from ..utils.health_monitor import health_monitor, HealthCheck, HealthStatus
 from ..utils.cache_manager import cache_manager
+from ..utils.embedding_cache import EmbeddingCache
 from ..utils.chunk_optimizer import optimized_chunker
 from ..utils.async_processor import async_processor
 from ..utils.performance_monitor import performance_tracker
@@ -43,7 +45,9 @@ class DocumentManager:
         storage_path: str = "data/documents",
         chroma_path: str = "data/chroma_db",
         chunk_size: int = 1000,
-        chunk_overlap: int = 200
+        chunk_overlap: int = 200,
+        embedding_cache: Optional[EmbeddingCache] = None,
+        embedding_workers: int = 4
     ):
         """Initialize document manager.
         
@@ -52,11 +56,16 @@ class DocumentManager:
             chroma_path: Path for ChromaDB storage.
             chunk_size: Size of text chunks for vectorization.
             chunk_overlap: Overlap between chunks.
+            embedding_cache: Persistent cache for query and chunk embeddings.
+            embedding_workers: Concurrent embedding requests for the chunks
+                of one uploaded document.
         """
         self.storage_path = Path(storage_path)
         self.chroma_path = Path(chroma_path)
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
+        self.embedding_cache = embedding_cache
+        self.embedding_workers = max(1, embedding_workers)
         
         # Create directories if they don't exist
         self.storage_path.mkdir(parents=True, exist_ok=True)
@@ -114,6 +123,63 @@ class DocumentManager:
             }
         )
         
+        self._validate_upload_file(file_path)
+        
+        try:
+            document, chunks = self._prepare_document(file_path, metadata, category, tags)
+            doc_id = document.id
+            
+            self._store_document_chunks(document, chunks)
+            
+            processing_time = time.time() - start_time
+            logger.info(
+                f"Document uploaded successfully: {doc_id}",
+                extra={
+                    'operation': 'upload_document',
+                    'document_id': doc_id,
+                    'processing_time': processing_time,
+                    'content_length': len(document.content),
+                    'chunk_count': len(chunks),
+                    'category': category.value
+                }
+            )
+            
+            return doc_id
+            
+        except DocumentManagerError:
+            # Re-raise DocumentManagerError as-is
+            raise
+        except Exception as e:
+            processing_time = time.time() - start_time
+            error = handle_error(
+                error=e,
+                error_code="DOCUMENT_UPLOAD_FAILED",
+                category=ErrorCategory.PROCESSING,
+                severity=ErrorSeverity.HIGH,
+                details={
+                    'file_path': str(file_path),
+                    'processing_time': processing_time,
+                    'category': category.value
+                },
+                suggestions=[
+                    "Check file permissions and accessibility",
+                    "Verify ChromaDB connection",
+                    "Check available disk space",
+                    "Try uploading a smaller file first"
+                ],
+                context={'operation': 'upload_document', 'file_path': str(file_path)}
+            )
+            raise DocumentManagerError(error.error_info, e)
+    
+    def _validate_upload_file(self, file_path: Path) -> None:
+        """Check that a file exists and has a supported format.
+        
+        Args:
+            file_path: Path to the document file.
+            
+        Raises:
+            DocumentManagerError: If the file cannot be uploaded.
+        """
         # Validate file existence
         if not file_path.exists():
             error = create_error(
@@ -148,53 +214,76 @@ class DocumentManager:
                 ]
             )
             raise DocumentManagerError(error.error_info, error)
+    
+    def _prepare_document(
+        self,
+        file_path: Path,
+        metadata: Optional[Dict[str, Any]],
+        category: DocumentCategory,
+        tags: Optional[List[str]]
+    ) -> Tuple[Document, List[str]]:
+        """Extract, store and chunk a document without embedding it.
         
-        try:
-            # Extract file content using file processor
-            content, file_metadata = file_processor.extract_text(file_path)
-            
-            # Validate extracted content
-            if not file_processor.validate_extracted_text(content):
-                error = create_error(
-                    error_code="DOCUMENT_EMPTY_OR_INVALID_CONTENT",
-                    message="Document content is empty or invalid",
-                    category=ErrorCategory.VALIDATION,
-                    severity=ErrorSeverity.MEDIUM,
-                    details={
-                        'file_path': str(file_path),
-                        'content_length': len(content) if content else 0,
-                        'file_metadata': file_metadata
-                    },
-                    suggestions=[
-                        "Check if the file contains readable text content",
-                        "Verify file is not corrupted",
-                        "Try opening the file manually to check content",
-                        "Check file encoding if it's a text file"
-                    ]
-                )
-                raise DocumentManagerError(error.error_info, error)
-            
-            # Generate document ID
-            doc_id = str(uuid.uuid4())
-            
-            # Merge file metadata with user metadata
-            combined_metadata = {**(metadata or {}), **file_metadata}
-            
-            # Create document object
-            document = Document(
-                id=doc_id,
-                title=file_path.stem,
-                content=content,
-                file_path=file_path,
-                file_type=file_path.suffix[1:],  # Remove the dot
-                category=category,
-                tags=tags or [],
-                metadata=combined_metadata
-            )
+        If chunking fails, the stored copy of the file is removed again.
+        
+        Args:
+            file_path: Path to the document file.
+            metadata: Additional metadata for the document.
+            category: Document category.
+            tags: List of tags for the document.
             
-            # Store file and process chunks
-            self._store_document_file(document, content)
+        Returns:
+            Tuple of the document object and its text chunks.
             
+        Raises:
+            DocumentManagerError: If the extracted content is empty or invalid.
+        """
+        # Extract file content using file processor
+        content, file_metadata = file_processor.extract_text(file_path)
+        
+        # Validate extracted content
+        if not file_processor.validate_extracted_text(content):
+            error = create_error(
+                error_code="DOCUMENT_EMPTY_OR_INVALID_CONTENT",
+                message="Document content is empty or invalid",
+                category=ErrorCategory.VALIDATION,
+                severity=ErrorSeverity.MEDIUM,
+                details={
+                    'file_path': str(file_path),
+                    'content_length': len(content) if content else 0,
+                    'file_metadata': file_metadata
+                },
+                suggestions=[
+                    "Check if the file contains readable text content",
+                    "Verify file is not corrupted",
+                    "Try opening the file manually to check content",
+                    "Check file encoding if it's a text file"
+                ]
+            )
+            raise DocumentManagerError(error.error_info, error)
+        
+        # Generate document ID
+        doc_id = str(uuid.uuid4())
+        
+        # Merge file metadata with user metadata
+        combined_metadata = {**(metadata or {}), **file_metadata}
+        
+        # Create document object
+        document = Document(
+            id=doc_id,
+            title=file_path.stem,
+            content=content,
+            file_path=file_path,
+            file_type=file_path.suffix[1:],  # Remove the dot
+            category=category,
+            tags=tags or [],
+            metadata=combined_metadata
+        )
+        
+        # Store file and process chunks
+        self._store_document_file(document, content)
+        
+        try:
             # Use optimized chunking or async processing for large documents
             if async_processor.should_process_async(content):
                 # For very large documents, use async processing
@@ -219,48 +308,12 @@ class DocumentManager:
                 # Use optimized chunking for regular documents
                 chunks, chunk_metadata = optimized_chunker.chunk_document(content, file_path.name)
                 logger.debug(f"Optimized chunking: {chunk_metadata}")
-            
-            self._store_document_chunks(document, chunks)
-            
-            processing_time = time.time() - start_time
-            logger.info(
-                f"Document uploaded successfully: {doc_id}",
-                extra={
-                    'operation': 'upload_document',
-                    'document_id': doc_id,
-                    'processing_time': processing_time,
-                    'content_length': len(content),
-                    'chunk_count': len(chunks),
-                    'category': category.value
-                }
-            )
-            
-            return doc_id
-            
-        except DocumentManagerError:
-            # Re-raise DocumentManagerError as-is
+        except BaseException:
+            # The stored copy belongs to no uploaded document yet
+            document.file_path.unlink(missing_ok=True)
             raise
-        except Exception as e:
-            processing_time = time.time() - start_time
-            error = handle_error(
-                error=e,
-                error_code="DOCUMENT_UPLOAD_FAILED",
-                category=ErrorCategory.PROCESSING,
-                severity=ErrorSeverity.HIGH,
-                details={
-                    'file_path': str(file_path),
-                    'processing_time': processing_time,
-                    'category': category.value
-                },
-                suggestions=[
-                    "Check file permissions and accessibility",
-                    "Verify ChromaDB connection",
-                    "Check available disk space",
-                    "Try uploading a smaller file first"
-                ],
-                context={'operation': 'upload_document', 'file_path': str(file_path)}
-            )
-            raise DocumentManagerError(error.error_info, e)
+        
+        return document, chunks
     
     def delete_document(self, document_id: str) -> bool:
         """Delete a document and its chunks.
@@ -272,16 +325,8 @@ class DocumentManager:
             True if deleted successfully, False otherwise.
         """
         try:
-            # Delete from ChromaDB
-            chunk_ids = [f"{document_id}_chunk_{i}" for i in range(1000)]  # Max chunks assumption
-            
-            # Get existing chunk IDs for this document
-            existing_chunks = self.collection.get(
-                where={"document_id": document_id}
-            )
-            
-            if existing_chunks['ids']:
-                self.collection.delete(ids=existing_chunks['ids'])
+            # Delete all chunks of the document from ChromaDB in one request
+            self.collection.delete(where={"document_id": document_id})
             
             # Delete stored file
             for file_path in self.storage_path.glob(f"{document_id}_*"):
@@ -351,16 +396,16 @@ class DocumentManager:
             if category_filter:
                 where_clause['category'] = category_filter.value
             
-            # Get chunks with optional filtering
+            # Get chunk metadata with optional filtering in a single query;
+            # chunk texts and embeddings are not needed for the listing
             if where_clause:
-                all_chunks = self.collection.get(where=where_clause)
+                all_chunks = self.collection.get(where=where_clause, include=['metadatas'])
             else:
-                all_chunks = self.collection.get()
+                all_chunks = self.collection.get(include=['metadatas'])
             
             # Group by document_id
             documents = {}
-            for i, chunk_id in enumerate(all_chunks['ids']):
-                metadata = all_chunks['metadatas'][i]
+            for metadata in all_chunks['metadatas']:
                 doc_id = metadata['document_id']
                 
                 # Apply tags filter if specified
@@ -439,13 +484,7 @@ class DocumentManager:
             return cache_result
         
         try:
-            # Check embedding cache first
-            query_embedding = cache_manager.query_cache.get_embedding(query)
-            if query_embedding is None:
-                # Generate query embedding using Ollama
-                query_embedding = self.ollama_client.generate_embeddings(query)
-                # Cache the embedding
-                cache_manager.query_cache.cache_embedding(query, query_embedding)
+            query_embedding = self._get_query_embedding(query)
             
             # Build where clause for filtering
             where_clause = {}
@@ -465,30 +504,7 @@ class DocumentManager:
             results = self.collection.query(**search_params)
             
             # Format and filter results
-            similar_chunks = []
-            for i in range(len(results['documents'][0])):
-                metadata = results['metadatas'][0][i]
-                
-                # Apply tags filter if specified
-                if tags_filter:
-                    doc_tags = metadata.get('tags', [])
-                    if isinstance(doc_tags, str):
-                        doc_tags = doc_tags.split(',') if doc_tags else []
-                    if not any(tag in doc_tags for tag in tags_filter):
-                        continue
-                
-                chunk_data = {
-                    'id': results['ids'][0][i],
-                    'content': results['documents'][0][i],
-                    'metadata': metadata,
-                    'distance': results['distances'][0][i],
-                    'relevance_score': max(0.0, min(1.0, 1.0 - results['distances'][0][i]))  # Convert distance to similarity, clamp to [0,1]
-                }
-                similar_chunks.append(chunk_data)
-                
-                # Stop when we have enough results
-                if len(similar_chunks) >= top_k:
-                    break
+            similar_chunks = self._format_search_results(results, 0, top_k, tags_filter)
             
             processing_time = time.time() - start_time
             logger.info(
@@ -557,6 +573,163 @@ class DocumentManager:
             )
             raise DocumentManagerError(error.error_info, e)
     
+    def search_similar_chunks_batch(
+        self,
+        queries: List[str],
+        top_k: int = 5,
+        category_filter: Optional[DocumentCategory] = None,
+        tags_filter: Optional[List[str]] = None,
+        max_workers: int = 4
+    ) -> List[List[Dict[str, Any]]]:
+        """Search similar chunks for several queries with one ChromaDB query.
+        
+        Query embeddings are generated concurrently with the same endpoint as
+        the stored chunk embeddings, then all of them are searched in a single
+        collection.query call.
+        
+        Args:
+            queries: Search queries.
+            top_k: Number of top results to return per query.
+            category_filter: Filter by document category.
+            tags_filter: Filter by document tags.
+            max_workers: Maximum number of concurrent embedding requests.
+            
+        Returns:
+            List of similar chunk lists, one per query in input order.
+            
+        Raises:
+            DocumentManagerError: If search fails.
+        """
+        if not queries:
+            return []
+        
+        start_time = time.time()
+        
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(queries)))) as executor:
+                query_embeddings = list(executor.map(self._get_query_embedding, queries))
+            
+            search_params = {
+                'query_embeddings': query_embeddings,
+                'n_results': top_k * 2,  # Get more results for filtering
+                'include': ['documents', 'metadatas', 'distances']
+            }
+            if category_filter:
+                search_params['where'] = {'category': category_filter.value}
+            
+            results = self.collection.query(**search_params)
+            
+            batch_results = [
+                self._format_search_results(results, i, top_k, tags_filter)
+                for i in range(len(queries))
+            ]
+            
+            logger.info(
+                f"Searched similar chunks for {len(queries)} queries",
+                extra={
+                    'operation': 'search_similar_chunks_batch',
+                    'processing_time': time.time() - start_time,
+                    'query_count': len(queries),
+                    'top_k': top_k
+                }
+            )
+            
+            return batch_results
+            
+        except Exception as e:
+            error = handle_error(
+                error=e,
+                error_code="DOCUMENT_BATCH_SEARCH_FAILED",
+                category=ErrorCategory.PROCESSING,
+                severity=ErrorSeverity.HIGH,
+                details={
+                    'query_count': len(queries),
+                    'processing_time': time.time() - start_time,
+                    'top_k': top_k
+                },
+                suggestions=[
+                    "Check Ollama service status",
+                    "Check ChromaDB connection",
+                    "Try with fewer queries"
+                ],
+                context={'operation': 'search_similar_chunks_batch'}
+            )
+            raise DocumentManagerError(error.error_info, e)
+    
+    def _get_query_embedding(self, query: str) -> List[float]:
+        """Get query embedding from the caches or generate it with Ollama.
+        
+        The in-memory cache is checked first, then the persistent cache that
+        survives between CLI runs.
+        
+        Args:
+            query: Search query.
+            
+        Returns:
+            Query embedding.
+        """
+        query_embedding = cache_manager.query_cache.get_embedding(query)
+        if query_embedding is not None:
+            return query_embedding
+        
+        if self.embedding_cache is not None:
+            query_embedding = self.embedding_cache.get(query)
+        
+        if query_embedding is None:
+            # Generate query embedding using Ollama
+            query_embedding = self.ollama_client.generate_embeddings(query)
+            if self.embedding_cache is not None:
+                self.embedding_cache.put(query, query_embedding)
+        
+        cache_manager.query_cache.cache_embedding(query, query_embedding)
+        return query_embedding
+    
+    def _format_search_results(
+        self,
+        results: Dict[str, Any],
+        query_index: int,
+        top_k: int,
+        tags_filter: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Format ChromaDB query results for one query.
+        
+        Args:
+            results: Raw collection.query results.
+            query_index: Index of the query in the results.
+            top_k: Number of top results to return.
+            tags_filter: Filter by document tags.
+            
+        Returns:
+            List of similar chunks with metadata.
+        """
+        similar_chunks = []
+        for i in range(len(results['documents'][query_index])):
+            metadata = results['metadatas'][query_index][i]
+            
+            # Apply tags filter if specified
+            if tags_filter:
+                doc_tags = metadata.get('tags', [])
+                if isinstance(doc_tags, str):
+                    doc_tags = doc_tags.split(',') if doc_tags else []
+                if not any(tag in doc_tags for tag in tags_filter):
+                    continue
+            
+            distance = results['distances'][query_index][i]
+            chunk_data = {
+                'id': results['ids'][query_index][i],
+                'content': results['documents'][query_index][i],
+                'metadata': metadata,
+                'distance': distance,
+                'relevance_score': max(0.0, min(1.0, 1.0 - distance))  # Convert distance to similarity, clamp to [0,1]
+            }
+            similar_chunks.append(chunk_data)
+            
+            # Stop when we have enough results
+            if len(similar_chunks) >= top_k:
+                break
+        
+        return similar_chunks
+    
     def get_supported_file_types(self) -> List[str]:
         """Get list of supported file types.
         
@@ -636,32 +809,26 @@ class DocumentManager:
         """
         try:
             chunk_ids = []
-            chunk_embeddings = []
             chunk_documents = []
             chunk_metadatas = []
             
+            chunk_embeddings = self._get_cached_chunk_embeddings(chunks)
+            missing = [i for i, embedding in enumerate(chunk_embeddings) if embedding is None]
+            if missing:
+                missing_chunks = [chunks[i] for i in missing]
+                # Embedding requests are independent, overlap their round trips
+                with ThreadPoolExecutor(max_workers=min(self.embedding_workers, len(missing))) as executor:
+                    generated = list(executor.map(self.ollama_client.generate_embeddings, missing_chunks))
+                for i, embedding in zip(missing, generated):
+                    chunk_embeddings[i] = embedding
+                self._cache_chunk_embeddings(missing_chunks, generated)
+            
             for i, chunk in enumerate(chunks):
                 chunk_id = f"{document.id}_chunk_{i}"
                 
-                # Generate embedding for chunk
-                embedding = self.ollama_client.generate_embeddings(chunk)
-                
-                # Prepare metadata
-                metadata = {
-                    'document_id': document.id,
-                    'chunk_index': i,
-                    'title': document.title,
-                    'file_type': document.file_type,
-                    'category': document.category.value,
-                    'tags': ','.join(document.tags) if document.tags else '',
-                    'upload_date': document.created_at.isoformat(),
-                    **document.metadata
-                }
-                
                 chunk_ids.append(chunk_id)
-                chunk_embeddings.append(embedding)
                 chunk_documents.append(chunk)
-                chunk_metadatas.append(metadata)
+                chunk_metadatas.append(self._build_chunk_metadata(document, i))
                 
                 # Update document object
                 document.add_chunk(chunk, chunk_id)
@@ -683,35 +850,87 @@ class DocumentManager:
             logger.error(f"Failed to store document chunks: {e}")
             raise DocumentManagerError(f"Chunk storage failed: {e}")
     
+    def _get_cached_chunk_embeddings(self, chunks: List[str]) -> List[Optional[List[float]]]:
+        """Look up chunk embeddings in the persistent cache.
+        
+        Embeddings are deterministic per model and text, so re-uploaded
+        documents and repeated boilerplate chunks need no Ollama requests.
+        
+        Args:
+            chunks: List of text chunks.
+            
+        Returns:
+            Cached embeddings aligned with ``chunks``, None for misses.
+        """
+        if self.embedding_cache is None:
+            return [None] * len(chunks)
+        return self.embedding_cache.get_many(chunks)
+    
+    def _cache_chunk_embeddings(self, chunks: List[str], embeddings: List[List[float]]) -> None:
+        """Store generated chunk embeddings in the persistent cache.
+        
+        Args:
+            chunks: List of text chunks.
+            embeddings: Embeddings aligned with ``chunks``.
+        """
+        if self.embedding_cache is not None:
+            self.embedding_cache.put_many(chunks, embeddings)
+    
+    def _build_chunk_metadata(self, document: Document, chunk_index: int) -> Dict[str, Any]:
+        """Build ChromaDB metadata for a document chunk.
+        
+        Args:
+            document: Document object.
+            chunk_index: Index of the chunk in the document.
+            
+        Returns:
+            Chunk metadata.
+        """
+        return {
+            'document_id': document.id,
+            'chunk_index': chunk_index,
+            'title': document.title,
+            'file_type': document.file_type,
+            'category': document.category.value,
+            'tags': ','.join(document.tags) if document.tags else '',
+            'upload_date': document.created_at.isoformat(),
+            **document.metadata
+        }
+    
     def batch_upload_documents(
         self, 
         file_paths: List[str], 
         common_metadata: Optional[Dict[str, Any]] = None,
         category: DocumentCategory = DocumentCategory.GENERAL,
         tags: Optional[List[str]] = None,
-        progress_callback: Optional[callable] = None
+        progress_callback: Optional[callable] = None,
+        max_workers: int = 4
     ) -> List[Dict[str, Any]]:
         """Upload multiple documents in batch.
         
+        Files are uploaded concurrently; each upload already embeds its
+        chunks in parallel, so the pool is kept small. Results and progress
+        callbacks follow the order of ``file_paths``.
+        
         Args:
             file_paths: List of file paths to upload.
             common_metadata: Common metadata to apply to all documents.
             category: Category to apply to all documents.
             tags: Tags to apply to all documents.
             progress_callback: Optional callback function for progress updates.
+            max_workers: Maximum number of files uploaded at the same time.
             
         Returns:
             List of results for each file upload.
         """
-        results = []
         common_metadata = common_metadata or {}
         
-        for i, file_path in enumerate(file_paths):
+        def upload_one(index: int, file_path: str) -> Dict[str, Any]:
             try:
                 # Prepare metadata for this file
                 file_metadata = common_metadata.copy()
                 file_metadata['batch_upload'] = 'true'
-                file_metadata['batch_index'] = str(i)
+                file_metadata['batch_index'] = str(index)
                 
                 # Upload document
                 doc_id = self.upload_document(
@@ -721,7 +940,7 @@ class DocumentManager:
                     tags=tags
                 )
                 
-                result = {
+                return {
                     'success': True,
                     'file_path': file_path,
                     'document_id': doc_id,
@@ -729,21 +948,188 @@ class DocumentManager:
                 }
                 
             except Exception as e:
-                result = {
+                logger.error(f"Failed to upload {file_path} in batch: {e}")
+                return {
                     'success': False,
                     'file_path': file_path,
                     'document_id': None,
                     'error': str(e)
                 }
-                logger.error(f"Failed to upload {file_path} in batch: {e}")
+        
+        results = []
+        if not file_paths:
+            return results
+        
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(file_paths)))) as executor:
+            futures = [
+                executor.submit(upload_one, i, file_path)
+                for i, file_path in enumerate(file_paths)
+            ]
+            
+            # Callbacks run on the calling thread, in input order
+            for i, future in enumerate(futures):
+                result = future.result()
+                results.append(result)
+                
+                if progress_callback:
+                    progress_callback(i + 1, len(file_paths), file_paths[i], result)
+        
+        return results
+    
+    def upload_documents(
+        self,
+        items: List[Tuple[Path, Optional[Dict[str, Any]]]],
+        category: DocumentCategory = DocumentCategory.GENERAL,
+        tags: Optional[List[str]] = None,
+        max_workers: int = 4,
+        progress_callback: Optional[Callable[[int, int], None]] = None
+    ) -> List[str]:
+        """Upload several documents with batched embedding and storage.
+        
+        Files are extracted and chunked in parallel, the chunks of all files
+        are embedded concurrently and written to ChromaDB with as few ``add``
+        calls as the collection allows. The upload is all-or-nothing: if any
+        file fails, nothing is added and stored copies are removed, so the
+        caller can retry the files one by one.
+        
+        Args:
+            items: Pairs of file path and per-file metadata.
+            category: Category to apply to all documents.
+            tags: Tags to apply to all documents.
+            max_workers: Maximum number of concurrent extraction and
+                embedding tasks.
+            progress_callback: Optional callback called with the number of
+                fully embedded files and the total number of files.
             
-            results.append(result)
+        Returns:
+            Document IDs in input order.
             
-            # Call progress callback if provided
-            if progress_callback:
-                progress_callback(i + 1, len(file_paths), file_path, result)
+        Raises:
+            DocumentManagerError: If any document cannot be uploaded.
+        """
+        if not items:
+            return []
         
-        return results
+        start_time = time.time()
+        workers = max(1, max_workers)
+        prepared: List[Tuple[Document, List[str]]] = []
+        added_ids: List[str] = []
+        
+        try:
+            for file_path, _ in items:
+                self._validate_upload_file(Path(file_path))
+            
+            with ThreadPoolExecutor(max_workers=min(workers, len(items))) as executor:
+                futures = [
+                    executor.submit(self._prepare_document, Path(file_path), metadata, category, tags)
+                    for file_path, metadata in items
+                ]
+            errors = [future.exception() for future in futures if future.exception() is not None]
+            prepared = [future.result() for future in futures if future.exception() is None]
+            if errors:
+                raise errors[0]
+            
+            # Chunks of all documents in one list, with the owning document index
+            all_chunks = []
+            chunk_owner = []
+            for doc_index, (_, chunks) in enumerate(prepared):
+                all_chunks.extend(chunks)
+                chunk_owner.extend([doc_index] * len(chunks))
+            
+            # Stored embeddings come from the same endpoint as query embeddings
+            embeddings = self._get_cached_chunk_embeddings(all_chunks)
+            missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+            remaining = [len(chunks) for _, chunks in prepared]
+            for i, embedding in enumerate(embeddings):
+                if embedding is not None:
+                    remaining[chunk_owner[i]] -= 1
+            completed_files = sum(1 for count in remaining if count == 0)
+            if completed_files and progress_callback:
+                progress_callback(completed_files, len(items))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                future_to_index = {
+                    executor.submit(self.ollama_client.generate_embeddings, all_chunks[i]): i
+                    for i in missing
+                }
+                for future in as_completed(future_to_index):
+                    i = future_to_index[future]
+                    embeddings[i] = future.result()
+                    
+                    owner = chunk_owner[i]
+                    remaining[owner] -= 1
+                    if remaining[owner] == 0:
+                        completed_files += 1
+                        if progress_callback:
+                            progress_callback(completed_files, len(items))
+            self._cache_chunk_embeddings(
+                [all_chunks[i] for i in missing], [embeddings[i] for i in missing]
+            )
+            
+            chunk_ids = []
+            chunk_metadatas = []
+            for document, chunks in prepared:
+                for i, chunk in enumerate(chunks):
+                    chunk_id = f"{document.id}_chunk_{i}"
+                    chunk_ids.append(chunk_id)
+                    chunk_metadatas.append(self._build_chunk_metadata(document, i))
+                    document.add_chunk(chunk, chunk_id)
+            
+            batch_size = self.chroma_client.get_max_batch_size()
+            for offset in range(0, len(chunk_ids), batch_size):
+                window = slice(offset, offset + batch_size)
+                self.collection.add(
+                    ids=chunk_ids[window],
+                    embeddings=embeddings[window],
+                    documents=all_chunks[window],
+                    metadatas=chunk_metadatas[window]
+                )
+                added_ids.extend(chunk_ids[window])
+            
+            logger.info(
+                f"Uploaded {len(prepared)} documents in batch",
+                extra={
+                    'operation': 'upload_documents',
+                    'processing_time': time.time() - start_time,
+                    'document_count': len(prepared),
+                    'chunk_count': len(chunk_ids)
+                }
+            )
+            
+            return [document.id for document, _ in prepared]
+            
+        except Exception as e:
+            # Leave no partially uploaded batch behind
+            if added_ids:
+                try:
+                    self.collection.delete(ids=added_ids)
+                except Exception as cleanup_error:
+                    logger.error(f"Failed to remove partially uploaded chunks: {cleanup_error}")
+            for document, _ in prepared:
+                try:
+                    document.file_path.unlink(missing_ok=True)
+                except OSError:
+                    pass
+            
+            if isinstance(e, DocumentManagerError):
+                raise
+            error = handle_error(
+                error=e,
+                error_code="DOCUMENT_BATCH_UPLOAD_FAILED",
+                category=ErrorCategory.PROCESSING,
+                severity=ErrorSeverity.HIGH,
+                details={
+                    'file_count': len(items),
+                    'processing_time': time.time() - start_time,
+                    'category': category.value
+                },
+                suggestions=[
+                    "Check Ollama service status",
+                    "Verify ChromaDB connection",
+                    "Upload the files one by one to find the failing file"
+                ],
+                context={'operation': 'upload_documents'}
+            )
+            raise DocumentManagerError(error.error_info, e)
     
     def update_document_category(self, document_id: str, category: DocumentCategory) -> bool:
         """Update document category.
@@ -923,6 +1309,32 @@ class DocumentManager:
             category_filter=DocumentCategory.REFERENCE
         )
     
+    def warm_index(self) -> bool:
+        """Load the vector index into memory ahead of the first search.
+        
+        ChromaDB loads the HNSW index of a persistent collection lazily on
+        the first query, which makes the first search noticeably slower on
+        large collections. A top-1 query with a stored embedding forces the
+        load.
+        
+        Returns:
+            True if the index was loaded, False if the collection is empty
+            or the query failed.
+        """
+        start_time = time.time()
+        try:
+            sample = self.collection.get(limit=1, include=['embeddings'])
+            embeddings = sample.get('embeddings')
+            if embeddings is None or len(embeddings) == 0:
+                return False
+            
+            self.collection.query(query_embeddings=[list(embeddings[0])], n_results=1, include=[])
+            logger.info(f"Vector index warmed up in {time.time() - start_time:.2f}s")
+            return True
+        except Exception as e:
+            logger.warning(f"Vector index warmup failed: {e}")
+            return False
+    
     def get_collection_stats(self) -> Dict[str, Any]:
         """Get statistics about the document collection.
         
@@ -930,28 +1342,22 @@ class DocumentManager:
             Collection statistics.
         """
         try:
-            collection_data = self.collection.get()
+            collection_data = self.collection.get(include=['metadatas'])
             total_chunks = len(collection_data['ids'])
             
-            # Count unique documents and categories
+            # Count unique documents and categories in one pass
             document_ids = set()
             category_counts = {}
-            
-            for metadata in collection_data['metadatas']:
-                document_ids.add(metadata['document_id'])
-                category = metadata.get('category', 'general')
-                category_counts[category] = category_counts.get(category, 0) + 1
-            
-            # Convert chunk counts to document counts
             documents_by_category = {}
-            processed_docs = set()
             
             for metadata in collection_data['metadatas']:
                 doc_id = metadata['document_id']
-                if doc_id not in processed_docs:
-                    category = metadata.get('category', 'general')
+                category = metadata.get('category', 'general')
+                category_counts[category] = category_counts.get(category, 0) + 1
+                
+                if doc_id not in document_ids:
+                    document_ids.add(doc_id)
                     documents_by_category[category] = documents_by_category.get(category, 0) + 1
-                    processed_docs.add(doc_id)
             
             return {
                 'total_documents': len(document_ids),
@@ -2,7 +2,8 @@
 
 import os
 import time
-from typing import List, Optional, Dict, Any
+import threading
+from typing import List, Optional, Dict, Any, Tuple, Iterator
 from datetime import datetime
 import ollama
 from ollama import Client
@@ -38,20 +39,54 @@ class OllamaClient:
         self.client = Client(host=self.host)
         self.default_model = os.getenv("OLLAMA_DEFAULT_MODEL", "qwen2.5vl:latest")
         
+        # Recent health check and model listing results are reused for a few seconds
+        self.health_check_ttl = float(os.getenv("OLLAMA_HEALTH_CHECK_TTL", "5"))
+        self._last_health: Optional[Tuple[float, bool]] = None
+        self._last_models: Optional[Tuple[float, List[str]]] = None
+        
+        # Concurrent embedding requests beyond what the server runs in
+        # parallel only fill its queue; excess callers wait here instead
+        self.embedding_concurrency = max(1, int(os.getenv("OLLAMA_EMBEDDING_CONCURRENCY", "4")))
+        self._embedding_slots = threading.BoundedSemaphore(self.embedding_concurrency)
+        
         # Register health check
         health_monitor.register_health_check("ollama_service", self._health_check)
         
-    @with_retry(OLLAMA_RETRY_CONFIG, exceptions=(Exception,), logger=logger)
     def health_check(self) -> bool:
         """Check if Ollama service is available.
         
+        A result obtained less than ``health_check_ttl`` seconds ago (by a
+        previous health check or a successful model listing) is reused
+        instead of querying Ollama again.
+        
+        Returns:
+            True if service is healthy, False otherwise.
+        """
+        if self._last_health is not None:
+            checked_at, healthy = self._last_health
+            if time.monotonic() - checked_at < self.health_check_ttl:
+                return healthy
+        
+        healthy = self._check_connection()
+        self._last_health = (time.monotonic(), healthy)
+        return healthy
+    
+    @with_retry(OLLAMA_RETRY_CONFIG, exceptions=(Exception,), logger=logger)
+    def _check_connection(self) -> bool:
+        """Query Ollama to check that the service is reachable.
+        
         Returns:
             True if service is healthy, False otherwise.
         """
         try:
             start_time = time.time()
-            # Try to list models to check connectivity
-            self.client.list()
+            # Try to list models to check connectivity; the listing is kept
+            # so a following list_available_models needs no second request
+            response = self.client.list()
+            try:
+                self._last_models = (time.monotonic(), [model['name'] for model in response['models']])
+            except (KeyError, TypeError):
+                pass
             
             processing_time = time.time() - start_time
             logger.debug(
@@ -79,10 +114,32 @@ class OllamaClient:
             )
             return False
     
-    @with_retry(OLLAMA_RETRY_CONFIG, exceptions=(Exception,), logger=logger)
     def list_available_models(self) -> List[str]:
         """Get list of available models.
         
+        A listing obtained less than ``health_check_ttl`` seconds ago is
+        reused, so checking the model before every generation does not
+        query Ollama each time.
+        
+        Returns:
+            List of model names.
+            
+        Raises:
+            OllamaConnectionError: If unable to connect to Ollama.
+        """
+        if self._last_models is not None:
+            listed_at, models = self._last_models
+            if time.monotonic() - listed_at < self.health_check_ttl:
+                return list(models)
+        
+        models = self._fetch_models()
+        self._last_models = (time.monotonic(), models)
+        return list(models)
+    
+    @with_retry(OLLAMA_RETRY_CONFIG, exceptions=(Exception,), logger=logger)
+    def _fetch_models(self) -> List[str]:
+        """Query Ollama for the list of available models.
+        
         Returns:
             List of model names.
             
@@ -96,6 +153,9 @@ class OllamaClient:
             response = self.client.list()
             models = [model['name'] for model in response['models']]
             
+            # A successful listing proves the service is reachable
+            self._last_health = (time.monotonic(), True)
+            
             processing_time = time.time() - start_time
             logger.info(
                 f"Retrieved {len(models)} available models",
@@ -261,7 +321,95 @@ class OllamaClient:
                 context={'operation': 'generate_response', 'model': model}
             )
             raise OllamaConnectionError(error.error_info, e)
-    
+
+    def generate_response_stream(
+        self,
+        prompt: str,
+        model: Optional[str] = None,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None
+    ) -> Iterator[str]:
+        """Generate response using Ollama model, yielding text as it is produced.
+
+        Args:
+            prompt: User prompt/query.
+            model: Model name to use. If None, uses default model.
+            system_prompt: System prompt for context.
+            temperature: Sampling temperature (0.0 to 1.0).
+            max_tokens: Maximum tokens to generate.
+
+        Yields:
+            Chunks of generated response text.
+
+        Raises:
+            OllamaConnectionError: If unable to connect to Ollama.
+            ValueError: If model is not available.
+        """
+        model = model or self.default_model
+        start_time = time.time()
+
+        if not self.check_model_availability(model):
+            error = create_error(
+                error_code="OLLAMA_MODEL_NOT_AVAILABLE",
+                message=f"Model '{model}' is not available",
+                category=ErrorCategory.VALIDATION,
+                severity=ErrorSeverity.HIGH,
+                details={'requested_model': model},
+                suggestions=[
+                    f"Pull the model using: ollama pull {model}",
+                    "Check available models with: ollama list"
+                ]
+            )
+            raise ValueError(error.error_info.message)
+
+        messages = []
+        if system_prompt:
+            messages.append({'role': 'system', 'content': system_prompt})
+        messages.append({'role': 'user', 'content': prompt})
+
+        options = {'temperature': temperature}
+        if max_tokens:
+            options['num_predict'] = max_tokens
+
+        response_length = 0
+        try:
+            for part in self.client.chat(model=model, messages=messages, options=options, stream=True):
+                content = part['message']['content']
+                if content:
+                    response_length += len(content)
+                    yield content
+        except Exception as e:
+            error = handle_error(
+                error=e,
+                error_code="OLLAMA_RESPONSE_GENERATION_FAILED",
+                category=ErrorCategory.EXTERNAL_SERVICE,
+                severity=ErrorSeverity.HIGH,
+                details={
+                    'model': model,
+                    'prompt_length': len(prompt),
+                    'processing_time': time.time() - start_time,
+                    'received_length': response_length
+                },
+                suggestions=[
+                    "Check Ollama service status",
+                    "Verify model is properly loaded"
+                ],
+                context={'operation': 'generate_response_stream', 'model': model}
+            )
+            raise OllamaConnectionError(error.error_info, e)
+
+        logger.info(
+            f"Streamed response successfully",
+            extra={
+                'operation': 'generate_response_stream',
+                'model': model,
+                'processing_time': time.time() - start_time,
+                'prompt_length': len(prompt),
+                'response_length': response_length
+            }
+        )
+
     @with_retry(EMBEDDING_RETRY_CONFIG, exceptions=(Exception,), logger=logger, should_retry=is_temporary_error)
     def generate_embeddings(self, text: str, model: str = "nomic-embed-text") -> List[float]:
         """Generate embeddings for text.
@@ -294,10 +442,11 @@ class OllamaClient:
             return cached_embedding
         
         try:
-            response = self.client.embeddings(
-                model=model,
-                prompt=text
-            )
+            with self._embedding_slots:
+                response = self.client.embeddings(
+                    model=model,
+                    prompt=text
+                )
             
             embeddings = response['embedding']
             processing_time = time.time() - start_time
@@ -352,6 +501,7 @@ class OllamaClient:
         try:
             logger.info(f"Pulling model {model}...")
             self.client.pull(model)
+            self._last_models = None
             logger.info(f"Model {model} pulled successfully")
             return True
         except Exception as e:
@@ -4,7 +4,8 @@ import uuid
 import logging
 import time
 import os
-from typing import List, Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Generator
 
 from ..models.query_response import QueryResponse
 from ..models.message import MessageType
@@ -135,48 +136,84 @@ class QueryProcessor:
                     response_metadata={}
                 )
             
-            # Create response object
-            response_id = str(uuid.uuid4())
-            response = QueryResponse(
-                id=response_id,
+            response = self._create_general_response(
                 query=query,
-                response=response_text,
                 session_id=session_id,
-                processing_time=processing_time
+                response_text=response_text,
+                relevant_chunks=relevant_chunks,
+                processing_time=processing_time,
+                user_message_id=user_message_id,
+                decision_tree_output=decision_tree_output
             )
             
-            # Add decision tree to response if available
-            if decision_tree_output:
-                response.response = f"{response_text}\n\n{decision_tree_output}"
+            logger.info(f"Processed general query in {processing_time:.2f}s")
+            return response
             
-            # Add relevant document IDs
-            for chunk in relevant_chunks:
-                doc_id = chunk['metadata'].get('document_id')
-                if doc_id:
-                    response.add_relevant_document(doc_id)
+        except OllamaConnectionError as e:
+            logger.error(f"Ollama connection error: {e}")
+            raise QueryProcessorError(f"AI service unavailable: {e}")
+        except DocumentManagerError as e:
+            logger.error(f"Document search error: {e}")
+            raise QueryProcessorError(f"Document search failed: {e}")
+        except SessionManagerError as e:
+            logger.error(f"Session error: {e}")
+            raise QueryProcessorError(f"Session management failed: {e}")
+        except Exception as e:
+            logger.error(f"Unexpected error processing query: {e}")
+            raise QueryProcessorError(f"Query processing failed: {e}")
+    
+    def process_general_query_stream(
+        self,
+        query: str,
+        session_id: str
+    ) -> Generator[str, None, QueryResponse]:
+        """Process a general user query, yielding the answer as it is generated.
+        
+        The decision tree is not generated for streamed answers. When the
+        generator is exhausted, its return value (``StopIteration.value``) is
+        the final query response, already recorded in the session.
+        
+        Args:
+            query: User query.
+            session_id: Session identifier.
             
-            # Set confidence score based on relevance
-            if relevant_chunks:
-                avg_relevance = sum(chunk.get('relevance_score', 0) for chunk in relevant_chunks) / len(relevant_chunks)
-                response.set_confidence_score(min(avg_relevance, 1.0))
-            else:
-                response.set_confidence_score(0.3)  # Low confidence without relevant docs
+        Yields:
+            Chunks of the generated answer.
             
-            # Add assistant message to session
-            assistant_metadata = {
-                'response_id': response_id,
-                'relevant_documents': response.relevant_documents,
-                'confidence_score': response.confidence_score,
-                'processing_time': processing_time
-            }
-            self.session_manager.add_assistant_message(
+        Returns:
+            Query response with answer and metadata.
+            
+        Raises:
+            QueryProcessorError: If processing fails.
+        """
+        start_time = time.time()
+        
+        try:
+            user_message_id = self.session_manager.add_user_message(session_id, query)
+            relevant_chunks = self._get_relevant_context(query)
+            context = self._build_context_string(relevant_chunks)
+            history = self._get_conversation_context(session_id)
+            full_prompt = self._build_query_prompt(query, context, history)
+            
+            parts = []
+            for chunk in self.ollama_client.generate_response_stream(
+                prompt=full_prompt,
+                system_prompt=self.system_prompt
+            ):
+                parts.append(chunk)
+                yield chunk
+            
+            processing_time = time.time() - start_time
+            response = self._create_general_response(
+                query=query,
                 session_id=session_id,
-                content=response_text,
-                metadata=assistant_metadata,
-                parent_message_id=user_message_id
+                response_text=''.join(parts),
+                relevant_chunks=relevant_chunks,
+                processing_time=processing_time,
+                user_message_id=user_message_id
             )
             
-            logger.info(f"Processed general query in {processing_time:.2f}s")
+            logger.info(f"Processed streamed general query in {processing_time:.2f}s")
             return response
             
         except OllamaConnectionError as e:
@@ -192,6 +229,147 @@ class QueryProcessor:
             logger.error(f"Unexpected error processing query: {e}")
             raise QueryProcessorError(f"Query processing failed: {e}")
     
+    def _create_general_response(
+        self,
+        query: str,
+        session_id: str,
+        response_text: str,
+        relevant_chunks: List[Dict[str, Any]],
+        processing_time: float,
+        user_message_id: str,
+        decision_tree_output: str = ""
+    ) -> QueryResponse:
+        """Build the response for a general query and record it in the session.
+        
+        Args:
+            query: User query.
+            session_id: Session identifier.
+            response_text: Generated answer.
+            relevant_chunks: Document chunks used as context.
+            processing_time: Time spent processing the query.
+            user_message_id: ID of the user message in the session.
+            decision_tree_output: Rendered decision tree appended to the answer.
+            
+        Returns:
+            Query response with answer and metadata.
+        """
+        response_id = str(uuid.uuid4())
+        response = QueryResponse(
+            id=response_id,
+            query=query,
+            response=response_text,
+            session_id=session_id,
+            processing_time=processing_time
+        )
+        
+        # Add decision tree to response if available
+        if decision_tree_output:
+            response.response = f"{response_text}\n\n{decision_tree_output}"
+        
+        # Add relevant document IDs
+        for chunk in relevant_chunks:
+            doc_id = chunk['metadata'].get('document_id')
+            if doc_id:
+                response.add_relevant_document(doc_id)
+        
+        # Set confidence score based on relevance
+        if relevant_chunks:
+            avg_relevance = sum(chunk.get('relevance_score', 0) for chunk in relevant_chunks) / len(relevant_chunks)
+            response.set_confidence_score(min(avg_relevance, 1.0))
+        else:
+            response.set_confidence_score(0.3)  # Low confidence without relevant docs
+        
+        # Add assistant message to session
+        assistant_metadata = {
+            'response_id': response_id,
+            'relevant_documents': response.relevant_documents,
+            'confidence_score': response.confidence_score,
+            'processing_time': processing_time
+        }
+        self.session_manager.add_assistant_message(
+            session_id=session_id,
+            content=response_text,
+            metadata=assistant_metadata,
+            parent_message_id=user_message_id
+        )
+        
+        return response
+    
+    def process_batch(
+        self,
+        queries: List[str],
+        session_id: str,
+        max_workers: int = 4
+    ) -> List[QueryResponse]:
+        """Process several independent queries at once.
+        
+        Document retrieval for all queries is done in one batched search and
+        responses are generated concurrently. Queries do not see each other in
+        the conversation history; they are added to the session in input order.
+        
+        Args:
+            queries: User queries.
+            session_id: Session identifier.
+            max_workers: Maximum number of concurrent generation requests.
+            
+        Returns:
+            Query responses in input order.
+            
+        Raises:
+            QueryProcessorError: If processing fails.
+        """
+        if not queries:
+            return []
+        
+        start_time = time.time()
+        
+        try:
+            # Get relevant context for all queries in one search
+            try:
+                chunk_lists = self.document_manager.search_similar_chunks_batch(queries, top_k=5)
+            except DocumentManagerError as e:
+                logger.warning(f"Failed to get relevant context: {e}")
+                chunk_lists = [[] for _ in queries]
+            
+            def generate(index: int) -> str:
+                context = self._build_context_string(chunk_lists[index])
+                prompt = self._build_query_prompt(queries[index], context, "")
+                return self.ollama_client.generate_response(
+                    prompt=prompt,
+                    system_prompt=self.system_prompt
+                )
+            
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(queries)))) as executor:
+                response_texts = list(executor.map(generate, range(len(queries))))
+            
+            processing_time = (time.time() - start_time) / len(queries)
+            
+            responses = []
+            for query, relevant_chunks, response_text in zip(queries, chunk_lists, response_texts):
+                user_message_id = self.session_manager.add_user_message(session_id, query)
+                response = self._create_general_response(
+                    query=query,
+                    session_id=session_id,
+                    response_text=response_text,
+                    relevant_chunks=relevant_chunks,
+                    processing_time=processing_time,
+                    user_message_id=user_message_id
+                )
+                responses.append(response)
+            
+            logger.info(f"Processed {len(queries)} batched queries in {time.time() - start_time:.2f}s")
+            return responses
+            
+        except OllamaConnectionError as e:
+            logger.error(f"Ollama connection error: {e}")
+            raise QueryProcessorError(f"AI service unavailable: {e}")
+        except SessionManagerError as e:
+            logger.error(f"Session error: {e}")
+            raise QueryProcessorError(f"Session management failed: {e}")
+        except Exception as e:
+            logger.error(f"Unexpected error processing query batch: {e}")
+            raise QueryProcessorError(f"Batch query processing failed: {e}")
+    
     def process_document_check(
         self, 
         document_content: str, 
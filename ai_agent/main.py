@@ -46,6 +46,12 @@ def main():
         # Logging is automatically configured by logging_manager
         logger.info("Starting AI Agent application")
         
+        # Run the command in the daemon when one is serving this directory
+        from .cli.daemon import forward_to_daemon
+        exit_code = forward_to_daemon(sys.argv[1:])
+        if exit_code is not None:
+            sys.exit(exit_code)
+        
         # Start CLI
         cli()
         
@@ -349,27 +349,27 @@ class OptimizedChunker:
                 chunks.append(content[start:])
                 break
             
-            # Try to find good boundary
-            chunk_text = content[start:end]
+            # Try to find good boundary; search the window in place rather
+            # than copying it
             boundary_pos = -1
             
             if config.paragraph_boundary:
                 # Look for paragraph boundary
-                boundary_pos = chunk_text.rfind('\n\n')
+                boundary_pos = content.rfind('\n\n', start, end) - start
                 if boundary_pos < config.chunk_size // 3:  # Too close to start
                     boundary_pos = -1
             
             if boundary_pos == -1 and config.sentence_boundary:
                 # Look for sentence boundary
                 for punct in ['. ', '! ', '? ']:
-                    pos = chunk_text.rfind(punct)
+                    pos = content.rfind(punct, start, end) - start
                     if pos > config.chunk_size // 2:  # Good position
                         boundary_pos = pos + len(punct) - 1
                         break
             
             if boundary_pos == -1:
                 # Look for word boundary
-                boundary_pos = chunk_text.rfind(' ')
+                boundary_pos = content.rfind(' ', start, end) - start
                 if boundary_pos < config.chunk_size // 2:
                     boundary_pos = config.chunk_size
             
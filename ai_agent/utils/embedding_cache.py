@@ -0,0 +1,212 @@
+"""Persistent cache of text embeddings."""
+
+import os
+import hashlib
+import sqlite3
+import threading
+from array import array
+from pathlib import Path
+from typing import Optional, List, Dict, Any
+
+from .logging_config import get_logger
+
+
+logger = get_logger(__name__)
+
+# Keys per SELECT, below SQLite's default limit of host parameters
+_LOOKUP_BATCH_SIZE = 500
+
+DEFAULT_EMBEDDING_CACHE_PATH = Path(
+    os.getenv('AI_AGENT_EMBED_CACHE', str(Path.home() / '.ai_agent' / 'embed_cache.sqlite'))
+)
+
+
+class EmbeddingCache:
+    """SQLite-backed embedding cache shared between CLI runs.
+
+    Entries are keyed by ``sha256(model + '\\0' + text)`` and stored as
+    float32 bytes. Cache failures are logged and never propagated, a broken
+    cache only means embeddings are requested from Ollama again.
+    """
+
+    def __init__(self, path: Path = DEFAULT_EMBEDDING_CACHE_PATH):
+        """Initialize embedding cache.
+
+        Args:
+            path: Path of the SQLite database file. Created on first use.
+        """
+        self.path = Path(path)
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0}
+
+    @staticmethod
+    def make_key(text: str, model: str = "nomic-embed-text") -> bytes:
+        """Generate cache key for a text.
+
+        Args:
+            text: Embedded text.
+            model: Embedding model.
+
+        Returns:
+            SHA-256 digest of model and text.
+        """
+        return hashlib.sha256(f"{model}\0{text}".encode('utf-8', errors='surrogatepass')).digest()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database, creating it if needed. Must be called under the lock."""
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(str(self.path), check_same_thread=False)
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (key BLOB PRIMARY KEY, vec BLOB NOT NULL)"
+            )
+            connection.commit()
+            self._connection = connection
+        return self._connection
+
+    def get(self, text: str, model: str = "nomic-embed-text") -> Optional[List[float]]:
+        """Get cached embedding.
+
+        Args:
+            text: Embedded text.
+            model: Embedding model.
+
+        Returns:
+            Cached embedding or None.
+        """
+        key = self.make_key(text, model)
+        try:
+            with self._lock:
+                row = self._connect().execute(
+                    "SELECT vec FROM embeddings WHERE key = ?", (key,)
+                ).fetchone()
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"Embedding cache read failed: {e}")
+            return None
+
+        if row is None:
+            self._stats['misses'] += 1
+            return None
+
+        self._stats['hits'] += 1
+        vec = array('f')
+        vec.frombytes(row[0])
+        return vec.tolist()
+
+    def get_many(self, texts: List[str], model: str = "nomic-embed-text") -> List[Optional[List[float]]]:
+        """Get cached embeddings for several texts.
+
+        Keys are looked up with a few ``IN`` queries instead of one query
+        per text.
+
+        Args:
+            texts: Embedded texts.
+            model: Embedding model.
+
+        Returns:
+            List of cached embeddings aligned with ``texts``, None for misses.
+        """
+        keys = [self.make_key(text, model) for text in texts]
+        found: Dict[bytes, bytes] = {}
+        try:
+            with self._lock:
+                connection = self._connect()
+                unique_keys = list(dict.fromkeys(keys))
+                for start in range(0, len(unique_keys), _LOOKUP_BATCH_SIZE):
+                    batch = unique_keys[start:start + _LOOKUP_BATCH_SIZE]
+                    placeholders = ','.join('?' * len(batch))
+                    found.update(connection.execute(
+                        f"SELECT key, vec FROM embeddings WHERE key IN ({placeholders})", batch
+                    ).fetchall())
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"Embedding cache read failed: {e}")
+            return [None] * len(texts)
+
+        results: List[Optional[List[float]]] = []
+        for key in keys:
+            if key not in found:
+                results.append(None)
+                continue
+            vec = array('f')
+            vec.frombytes(found[key])
+            results.append(vec.tolist())
+
+        hits = sum(1 for result in results if result is not None)
+        self._stats['hits'] += hits
+        self._stats['misses'] += len(results) - hits
+        return results
+
+    def put(self, text: str, embedding: List[float], model: str = "nomic-embed-text") -> None:
+        """Store embedding.
+
+        Args:
+            text: Embedded text.
+            embedding: Embedding vector.
+            model: Embedding model.
+        """
+        key = self.make_key(text, model)
+        vec = array('f', embedding).tobytes()
+        try:
+            with self._lock:
+                connection = self._connect()
+                connection.execute(
+                    "INSERT OR REPLACE INTO embeddings (key, vec) VALUES (?, ?)", (key, vec)
+                )
+                connection.commit()
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"Embedding cache write failed: {e}")
+
+    def put_many(
+        self,
+        texts: List[str],
+        embeddings: List[List[float]],
+        model: str = "nomic-embed-text"
+    ) -> None:
+        """Store several embeddings in one transaction.
+
+        Args:
+            texts: Embedded texts.
+            embeddings: Embedding vectors aligned with ``texts``.
+            model: Embedding model.
+        """
+        rows = [
+            (self.make_key(text, model), array('f', embedding).tobytes())
+            for text, embedding in zip(texts, embeddings)
+        ]
+        if not rows:
+            return
+        try:
+            with self._lock:
+                connection = self._connect()
+                connection.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, vec) VALUES (?, ?)", rows
+                )
+                connection.commit()
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"Embedding cache write failed: {e}")
+
+    def clear(self) -> None:
+        """Remove all cached embeddings."""
+        try:
+            with self._lock:
+                connection = self._connect()
+                connection.execute("DELETE FROM embeddings")
+                connection.commit()
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"Embedding cache clear failed: {e}")
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics.
+
+        Returns:
+            Dictionary with hit and miss counts and the database path.
+        """
+        return {**self._stats, 'path': str(self.path)}
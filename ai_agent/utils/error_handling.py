@@ -1,15 +1,14 @@
 """Enhanced error handling utilities with retry mechanisms."""
 
+import sys
 import time
 import random
 import logging
 import socket
-import requests
 from typing import Optional, Callable, Any, Type, Union, List, Dict
 from functools import wraps
 from dataclasses import dataclass
 from enum import Enum
-import asyncio
 from datetime import datetime, timedelta
 
 # Import logger after other imports to avoid circular imports
@@ -262,11 +261,18 @@ def is_network_error(exception: Exception) -> bool:
         socket.error,
         socket.timeout,
         TimeoutError,
-        requests.exceptions.ConnectionError,
-        requests.exceptions.Timeout,
-        requests.exceptions.HTTPError,
     )
     
+    # requests is slow to import; if nothing imported it, none of its
+    # exceptions can have been raised
+    requests = sys.modules.get('requests')
+    if requests is not None:
+        network_error_types += (
+            requests.exceptions.ConnectionError,
+            requests.exceptions.Timeout,
+            requests.exceptions.HTTPError,
+        )
+    
     if isinstance(exception, network_error_types):
         return True
     
@@ -31,6 +31,7 @@ except ImportError:
     Image = None
 
 from ..utils.logging_config import get_logger
+from ..utils.parse_cache import ParseCache
 from ..utils.error_handling import (
     create_error, ErrorCategory, ErrorSeverity, ProcessingError
 )
@@ -55,13 +56,25 @@ class FileProcessor:
         '.rtf': 'application/rtf'
     }
     
-    def __init__(self, show_extracted_text: bool = False):
+    # Human-readable file type names
+    FILE_TYPE_DESCRIPTIONS = {
+        '.txt': 'Plain Text',
+        '.md': 'Markdown',
+        '.docx': 'Microsoft Word Document',
+        '.pdf': 'PDF Document',
+        '.rtf': 'Rich Text Format'
+    }
+    
+    def __init__(self, show_extracted_text: bool = False, parse_cache: Optional[ParseCache] = None):
         """Initialize file processor.
         
         Args:
             show_extracted_text: Whether to show extracted text during processing.
+            parse_cache: Optional cache of extraction results. Files that did
+                not change since they were cached are not parsed again.
         """
         self.show_extracted_text = show_extracted_text
+        self.parse_cache = parse_cache
         
     def is_supported_format(self, file_path: Path) -> bool:
         """Check if file format is supported.
@@ -92,14 +105,7 @@ class FileProcessor:
             File type description.
         """
         ext = file_path.suffix.lower()
-        descriptions = {
-            '.txt': 'Plain Text',
-            '.md': 'Markdown',
-            '.docx': 'Microsoft Word Document',
-            '.pdf': 'PDF Document',
-            '.rtf': 'Rich Text Format'
-        }
-        return descriptions.get(ext, f'Unknown ({ext})')
+        return self.FILE_TYPE_DESCRIPTIONS.get(ext, f'Unknown ({ext})')
     
     def extract_text(self, file_path: Path) -> Tuple[str, Dict[str, Any]]:
         """Extract text content from file.
@@ -145,21 +151,33 @@ class FileProcessor:
             )
             raise FileProcessorError(error.error_info, error)
         
+        parse_cache = self.parse_cache
+        cache_key = parse_cache.key_for(file_path) if parse_cache is not None else None
+        if cache_key is not None:
+            cached = parse_cache.get(cache_key)
+            if cached is not None:
+                logger.debug(f"Using cached text of {file_path.name}")
+                return cached
+        
         try:
             ext = file_path.suffix.lower()
             
             if ext == '.txt':
-                return self._extract_text_file(file_path)
+                result = self._extract_text_file(file_path)
             elif ext == '.md':
-                return self._extract_markdown_file(file_path)
+                result = self._extract_markdown_file(file_path)
             elif ext == '.docx':
-                return self._extract_docx_file(file_path)
+                result = self._extract_docx_file(file_path)
             elif ext == '.pdf':
-                return self._extract_pdf_file(file_path)
+                result = self._extract_pdf_file(file_path)
             elif ext == '.rtf':
-                return self._extract_rtf_file(file_path)
+                result = self._extract_rtf_file(file_path)
             else:
                 raise FileProcessorError(f"Handler not implemented for {ext}")
+            
+            if cache_key is not None:
+                parse_cache.put(cache_key, *result)
+            return result
                 
         except FileProcessorError:
             raise
@@ -1,7 +1,6 @@
 """Health monitoring and system diagnostics."""
 
 import time
-import psutil
 import threading
 from typing import Dict, Any, List, Optional, Callable
 from dataclasses import dataclass
@@ -49,6 +48,8 @@ class HealthMonitor:
         self.max_history_size = 1000
         self.monitoring_active = False
         self.monitor_thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._stop_event = threading.Event()
         
         # System thresholds
         self.cpu_warning_threshold = 80.0
@@ -79,31 +80,40 @@ class HealthMonitor:
         logger.debug(f"Registered health check: {name}")
     
     def start_monitoring(self):
-        """Start background health monitoring."""
-        if self.monitoring_active:
-            return
+        """Start background health monitoring.
         
-        self.monitoring_active = True
-        self.monitor_thread = threading.Thread(target=self._monitoring_loop, daemon=True)
-        self.monitor_thread.start()
+        Safe to call from several threads, only one monitoring thread is started.
+        """
+        with self._start_lock:
+            if self.monitoring_active:
+                return
+            
+            self.monitoring_active = True
+            self._stop_event.clear()
+            self.monitor_thread = threading.Thread(target=self._monitoring_loop, daemon=True)
+            self.monitor_thread.start()
         logger.info("Health monitoring started")
     
     def stop_monitoring(self):
         """Stop background health monitoring."""
         self.monitoring_active = False
+        self._stop_event.set()
         if self.monitor_thread and self.monitor_thread.is_alive():
             self.monitor_thread.join(timeout=5)
         logger.info("Health monitoring stopped")
     
     def _monitoring_loop(self):
-        """Background monitoring loop."""
-        while self.monitoring_active:
+        """Background monitoring loop.
+        
+        The first checks run one interval after start, so short CLI commands
+        finish without competing with them (the Ollama check is a network
+        request). Stopping wakes the loop immediately.
+        """
+        while not self._stop_event.wait(self.check_interval):
             try:
                 self.run_all_checks()
-                time.sleep(self.check_interval)
             except Exception as e:
                 logger.error(f"Error in health monitoring loop: {e}")
-                time.sleep(self.check_interval)
     
     def run_all_checks(self) -> Dict[str, HealthCheck]:
         """Run all registered health checks.
@@ -207,6 +217,9 @@ class HealthMonitor:
     def _check_cpu_usage(self) -> HealthCheck:
         """Check CPU usage."""
         try:
+            # Imported on first check rather than with the CLI
+            import psutil
+            
             cpu_percent = psutil.cpu_percent(interval=1)
             
             if cpu_percent >= self.cpu_critical_threshold:
@@ -243,6 +256,8 @@ class HealthMonitor:
     def _check_memory_usage(self) -> HealthCheck:
         """Check memory usage."""
         try:
+            import psutil
+            
             memory = psutil.virtual_memory()
             
             if memory.percent >= self.memory_critical_threshold:
@@ -280,6 +295,8 @@ class HealthMonitor:
     def _check_disk_usage(self) -> HealthCheck:
         """Check disk usage."""
         try:
+            import psutil
+            
             disk = psutil.disk_usage('/')
             disk_percent = (disk.used / disk.total) * 100
             
@@ -318,6 +335,8 @@ class HealthMonitor:
     def _check_process_health(self) -> HealthCheck:
         """Check process health."""
         try:
+            import psutil
+            
             current_process = psutil.Process()
             
             # Get process info
@@ -0,0 +1,32 @@
+"""JSON serialization helpers."""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(obj: Any, indent: bool = False) -> str:
+    """Serialize an object to a JSON string.
+    
+    Uses orjson when it is installed and falls back to the standard
+    library. Non-ASCII characters are kept as is in both cases, values
+    that are not JSON types are converted with ``str``.
+    
+    Args:
+        obj: Object to serialize.
+        indent: Indent nested values by two spaces instead of writing
+            compact JSON.
+        
+    Returns:
+        JSON string.
+    """
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if indent else 0
+        return orjson.dumps(obj, default=str, option=option).decode('utf-8')
+    if indent:
+        return json.dumps(obj, ensure_ascii=False, indent=2, default=str)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'), default=str)
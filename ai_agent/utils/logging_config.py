@@ -7,7 +7,8 @@ import logging.handlers
 from pathlib import Path
 from typing import Optional, Dict, Any
 from datetime import datetime
-import json
+
+from .json_utils import dumps as json_dumps
 
 
 class CustomFormatter(logging.Formatter):
@@ -101,7 +102,7 @@ class JSONFormatter(logging.Formatter):
             if hasattr(record, field):
                 log_entry[field] = getattr(record, field)
         
-        return json.dumps(log_entry, ensure_ascii=False)
+        return json_dumps(log_entry)
 
 
 class LoggingManager:
@@ -0,0 +1,179 @@
+"""Persistent cache of text extracted from document files."""
+
+import os
+import json
+import hashlib
+import tempfile
+from pathlib import Path
+from typing import Optional, Dict, Any, Tuple
+
+from .logging_config import get_logger
+
+
+logger = get_logger(__name__)
+
+DEFAULT_PARSE_CACHE_PATH = Path(
+    os.getenv('AI_AGENT_PARSE_CACHE', str(Path.home() / '.ai_agent' / 'parsed'))
+)
+
+# Entries kept on disk; the oldest are removed once there are more
+DEFAULT_PARSE_CACHE_MAX_ENTRIES = int(os.getenv('AI_AGENT_PARSE_CACHE_MAX_ENTRIES', '1000'))
+
+
+class ParseCache:
+    """Directory of extracted texts shared between CLI runs.
+
+    Entries are keyed by ``sha1(path:mtime_ns:size)``, so editing or
+    replacing a file makes its old entry unreachable. Unreachable entries
+    are not tracked; instead the number of entries is bounded and the
+    oldest written ones are removed on ``put``. Entries hold document text
+    in plain form and are not removed with the document, ``cache --clear``
+    deletes all of them. Cache failures are logged and never propagated, a
+    broken cache only means the file is parsed again.
+    """
+
+    def __init__(
+        self,
+        path: Path = DEFAULT_PARSE_CACHE_PATH,
+        max_entries: int = DEFAULT_PARSE_CACHE_MAX_ENTRIES
+    ):
+        """Initialize parse cache.
+
+        Args:
+            path: Directory holding cache entries. Created on first write,
+                readable by the owner only.
+            max_entries: Maximum number of entries kept on disk.
+        """
+        self.path = Path(path)
+        self.max_entries = max(1, max_entries)
+        self._stats = {'hits': 0, 'misses': 0}
+        self._entry_count: Optional[int] = None  # Counted on first write
+
+    @staticmethod
+    def make_key(file_path: Path, st: os.stat_result) -> str:
+        """Generate cache key for a file.
+
+        Args:
+            file_path: Path to the file.
+            st: Stat result of the file.
+
+        Returns:
+            Hex SHA-1 digest of the absolute path, mtime and size.
+        """
+        identity = f"{Path(file_path).absolute()}:{st.st_mtime_ns}:{st.st_size}"
+        return hashlib.sha1(identity.encode('utf-8', errors='surrogatepass')).hexdigest()
+
+    def key_for(self, file_path: Path) -> Optional[str]:
+        """Get the cache key for the current state of a file.
+
+        Take the key before parsing: a file changed during parsing is then
+        stored under its old state and parsed again next time.
+
+        Args:
+            file_path: Path to the file.
+
+        Returns:
+            Cache key, or None if the file cannot be stat-ed.
+        """
+        try:
+            return self.make_key(file_path, os.stat(file_path))
+        except OSError:
+            return None
+
+    def get(self, key: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Get cached extraction result.
+
+        Args:
+            key: Cache key from key_for.
+
+        Returns:
+            Tuple of (text, metadata), or None if not cached.
+        """
+        try:
+            with open(self.path / f"{key}.json", 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            self._stats['misses'] += 1
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Parse cache read failed: {e}")
+            self._stats['misses'] += 1
+            return None
+
+        self._stats['hits'] += 1
+        return entry['content'], entry['metadata']
+
+    def put(self, key: str, content: str, metadata: Dict[str, Any]) -> None:
+        """Store extraction result.
+
+        The entry is written to a temporary file and renamed into place, so
+        concurrent readers never see a partial entry.
+
+        Args:
+            key: Cache key from key_for.
+            content: Extracted text.
+            metadata: Extraction metadata.
+        """
+        try:
+            if self._entry_count is None:
+                # Extracted texts may be confidential, keep them private
+                self.path.mkdir(parents=True, exist_ok=True, mode=0o700)
+                os.chmod(self.path, 0o700)
+                self._entry_count = sum(1 for _ in self.path.glob('*.json'))
+            entry_path = self.path / f"{key}.json"
+            is_new = not entry_path.exists()
+            fd, tmp_path = tempfile.mkstemp(dir=self.path, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump({'content': content, 'metadata': metadata}, f, ensure_ascii=False, default=str)
+                os.replace(tmp_path, entry_path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Parse cache write failed: {e}")
+            return
+
+        if is_new:
+            self._entry_count += 1
+            if self._entry_count > self.max_entries:
+                self._prune()
+
+    def _prune(self) -> None:
+        """Remove the oldest entries, leaving room for a tenth of the limit.
+
+        Pruning in steps keeps the directory scan off most writes.
+        """
+        keep = self.max_entries - self.max_entries // 10
+        try:
+            entries = []
+            for entry in os.scandir(self.path):
+                if entry.name.endswith('.json'):
+                    try:
+                        entries.append((entry.stat().st_mtime_ns, Path(entry.path)))
+                    except FileNotFoundError:
+                        pass  # Removed by another process
+            entries.sort()
+            for _, entry_path in entries[:max(0, len(entries) - keep)]:
+                entry_path.unlink(missing_ok=True)
+            self._entry_count = min(len(entries), keep)
+        except OSError as e:
+            logger.warning(f"Parse cache pruning failed: {e}")
+            self._entry_count = None
+
+    def clear(self) -> None:
+        """Remove all cached extraction results."""
+        try:
+            for entry in self.path.glob('*.json'):
+                entry.unlink(missing_ok=True)
+            self._entry_count = None
+        except OSError as e:
+            logger.warning(f"Parse cache clear failed: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics.
+
+        Returns:
+            Dictionary with hit and miss counts and the cache directory.
+        """
+        return {**self._stats, 'path': str(self.path)}
@@ -1,7 +1,6 @@
 """Performance monitoring utilities."""
 
 import time
-import psutil
 import threading
 from typing import Dict, Any, Optional, Callable
 from dataclasses import dataclass, field
@@ -39,6 +38,7 @@ class PerformanceMetrics:
         
         # Get memory usage after operation
         try:
+            import psutil
             process = psutil.Process()
             self.memory_after = process.memory_info().rss / 1024 / 1024  # MB
             if self.memory_before is not None:
@@ -72,10 +72,21 @@ class PerformanceMonitor:
         })
         self._lock = threading.Lock()
         
-        # Start background monitoring
-        self._monitoring_active = True
-        self._monitor_thread = threading.Thread(target=self._background_monitor, daemon=True)
-        self._monitor_thread.start()
+        # Background monitoring starts with the first tracked operation, so
+        # short CLI runs like --help start no thread and do not load psutil
+        self._monitoring_active = False
+        self._monitor_started = False
+        self._monitor_thread: Optional[threading.Thread] = None
+    
+    def _start_background_monitor(self) -> None:
+        """Start the background monitoring thread unless it was started before."""
+        with self._lock:
+            if self._monitor_started:
+                return
+            self._monitor_started = True
+            self._monitoring_active = True
+            self._monitor_thread = threading.Thread(target=self._background_monitor, daemon=True)
+            self._monitor_thread.start()
     
     def start_operation(self, operation: str, **metadata) -> PerformanceMetrics:
         """Start monitoring an operation.
@@ -93,8 +104,12 @@ class PerformanceMonitor:
             metadata=metadata
         )
         
+        if not self._monitor_started:
+            self._start_background_monitor()
+        
         # Get initial memory usage
         try:
+            import psutil
             process = psutil.Process()
             metrics.memory_before = process.memory_info().rss / 1024 / 1024  # MB
             metrics.cpu_percent = process.cpu_percent()
@@ -199,6 +214,8 @@ class PerformanceMonitor:
     
     def _background_monitor(self):
         """Background monitoring thread."""
+        import psutil
+        
         while self._monitoring_active:
             try:
                 # Monitor system resources
@@ -251,6 +268,15 @@ class PerformanceMonitor:
             else:
                 return {op: dict(stats) for op, stats in self.operation_stats.items()}
     
+    def get_total_operations(self) -> int:
+        """Get the number of finished operations of all kinds.
+        
+        Returns:
+            Total operation count.
+        """
+        with self._lock:
+            return sum(stats['count'] for stats in self.operation_stats.values())
+    
     def get_recent_metrics(self, operation: Optional[str] = None, 
                           limit: int = 100) -> list:
         """Get recent performance metrics.
@@ -297,9 +323,13 @@ class PerformanceMonitor:
     
     def stop_monitoring(self):
         """Stop background monitoring."""
-        self._monitoring_active = False
-        if self._monitor_thread.is_alive():
-            self._monitor_thread.join(timeout=5)
+        with self._lock:
+            # A monitor stopped before its first operation is never started
+            self._monitor_started = True
+            self._monitoring_active = False
+            monitor_thread = self._monitor_thread
+        if monitor_thread is not None and monitor_thread.is_alive():
+            monitor_thread.join(timeout=5)
 
 
 # Global performance monitor instance
@@ -20,7 +20,8 @@ with patch.dict('sys.modules', {
     from ai_agent.cli.commands import (
         _find_files_for_batch_upload,
         _format_file_size,
-        _perform_batch_upload
+        _perform_batch_upload,
+        _add_file_table_rows
     )
 from ai_agent.core.document_manager import DocumentManagerError
 
@@ -83,6 +84,11 @@ class TestBatchUploadHelpers:
             nested_dir.mkdir()
             (nested_dir / 'nested_file.txt').write_text('nested content')
             
+            # Hidden directories are not searched
+            hidden_dir = tmp_path / '.git'
+            hidden_dir.mkdir()
+            (hidden_dir / 'description.txt').write_text('hidden content')
+            
             files = _find_files_for_batch_upload(str(tmp_path), '*.txt', True)
             
             assert len(files) == 3
@@ -90,7 +96,40 @@ class TestBatchUploadHelpers:
             assert 'file1.txt' in file_names
             assert 'sub_file.txt' in file_names
             assert 'nested_file.txt' in file_names
-    
+
+    def test_find_files_for_batch_upload_mixed_patterns(self):
+        """Test suffix patterns and name patterns in one walk."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_path = Path(tmp_dir)
+
+            (tmp_path / 'notes.txt').write_text('content')
+            (tmp_path / 'UPPER.TXT').write_text('content')
+            (tmp_path / 'report_2024.pdf').write_text('content')
+            (tmp_path / 'other.pdf').write_text('content')
+            (tmp_path / 'folder.txt').mkdir()
+
+            files = _find_files_for_batch_upload(str(tmp_path), '*.txt, report_*.pdf', False)
+
+            assert [f.name for f in files] == ['UPPER.TXT', 'notes.txt', 'report_2024.pdf']
+
+    def test_find_files_for_batch_upload_collects_sizes(self):
+        """Test file sizes are collected during the directory scan."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_path = Path(tmp_dir)
+
+            (tmp_path / 'small.txt').write_text('abc')
+            (tmp_path / 'large.txt').write_text('x' * 2048)
+
+            sizes = {}
+            files = _find_files_for_batch_upload(str(tmp_path), '*.txt', False, sizes=sizes)
+
+            assert sizes == {tmp_path / 'large.txt': 2048, tmp_path / 'small.txt': 3}
+            assert set(files) == set(sizes)
+
+            single_sizes = {}
+            _find_files_for_batch_upload(str(tmp_path / 'small.txt'), '*.txt', False, sizes=single_sizes)
+            assert single_sizes == {tmp_path / 'small.txt': 3}
+
     def test_format_file_size(self):
         """Test file size formatting."""
         assert _format_file_size(500) == "500 B"
@@ -98,6 +137,27 @@ class TestBatchUploadHelpers:
         assert _format_file_size(1536) == "1.5 KB"
         assert _format_file_size(1024 * 1024) == "1.0 MB"
         assert _format_file_size(1024 * 1024 * 1024) == "1.0 GB"
+        assert _format_file_size(3 * 1024 ** 4) == "3.0 TB"
+
+
+    def test_add_file_table_rows_elides_long_lists(self):
+        """Test long file tables show only their first and last rows."""
+        from rich.table import Table
+
+        files = [f'file_{i}.txt' for i in range(1000)]
+        make_row = Mock(side_effect=lambda i, name: (str(i + 1), name))
+        table = Table('№', 'Файл')
+
+        _add_file_table_rows(table, files, make_row, gap_column=1)
+
+        assert table.row_count == 100 + 1 + 20
+        assert make_row.call_count == 120
+        assert table.columns[1]._cells[100] == '… скрыто файлов: 880'
+        assert table.columns[1]._cells[-1] == 'file_999.txt'
+
+        short_table = Table('№', 'Файл')
+        _add_file_table_rows(short_table, files[:200], lambda i, name: (str(i + 1), name))
+        assert short_table.row_count == 200
 
 
 class TestDocumentManagerBatchUpload:
@@ -185,6 +245,117 @@ class TestDocumentManagerBatchUpload:
         assert results[2]['success'] is True
         assert results[2]['document_id'] == 'doc_id_file3.docx'
     
+    def test_upload_documents_batches_storage(self, mock_document_manager, tmp_path):
+        """Test batched upload embeds all chunks and adds them in windows."""
+        mock_document_manager.storage_path = tmp_path / 'storage'
+        mock_document_manager.storage_path.mkdir()
+        mock_document_manager.chroma_client.get_max_batch_size.return_value = 1
+        mock_document_manager.ollama_client.generate_embeddings.return_value = [0.1, 0.2]
+        progress_callback = Mock()
+
+        file1 = tmp_path / 'first.txt'
+        file2 = tmp_path / 'second.txt'
+        file1.write_text('Первый документ о закупках. ' * 5)
+        file2.write_text('Второй документ о поставках. ' * 5)
+
+        doc_ids = mock_document_manager.upload_documents(
+            [(file1, {'source': 'a'}), (file2, {'source': 'b'})],
+            progress_callback=progress_callback
+        )
+
+        assert len(doc_ids) == 2
+        add_calls = mock_document_manager.collection.add.call_args_list
+        assert len(add_calls) == 2
+        assert add_calls[0].kwargs['ids'] == [f'{doc_ids[0]}_chunk_0']
+        assert add_calls[0].kwargs['metadatas'][0]['source'] == 'a'
+        assert add_calls[1].kwargs['ids'] == [f'{doc_ids[1]}_chunk_0']
+        assert progress_callback.call_args_list[-1].args == (2, 2)
+        mock_document_manager.upload_document.assert_not_called()
+
+    def test_store_document_chunks_embeds_concurrently(self, mock_document_manager):
+        """Test chunks of one document are embedded in parallel and stored in order."""
+        import threading
+        from ai_agent.models.document import Document
+
+        barrier = threading.Barrier(2, timeout=5)
+
+        def generate_embeddings(chunk):
+            barrier.wait()  # Fails unless both chunks are embedded at once
+            return [float(len(chunk))]
+
+        mock_document_manager.ollama_client.generate_embeddings.side_effect = generate_embeddings
+        document = Document(
+            id='doc', title='Документ', content='первый второй чанк', file_path=Path('doc.txt'), file_type='txt'
+        )
+
+        mock_document_manager._store_document_chunks(document, ['первый', 'второй чанк'])
+
+        add_kwargs = mock_document_manager.collection.add.call_args.kwargs
+        assert add_kwargs['ids'] == ['doc_chunk_0', 'doc_chunk_1']
+        assert add_kwargs['embeddings'] == [[6.0], [11.0]]
+
+    def test_store_document_chunks_reuses_cached_embeddings(self, mock_document_manager, tmp_path):
+        """Test only chunks missing from the persistent cache are embedded."""
+        from ai_agent.models.document import Document
+        from ai_agent.utils.embedding_cache import EmbeddingCache
+
+        cache = EmbeddingCache(tmp_path / 'embed_cache.sqlite')
+        cache.put('шапка', [1.0])
+        mock_document_manager.embedding_cache = cache
+        mock_document_manager.ollama_client.generate_embeddings.return_value = [2.0]
+        document = Document(
+            id='doc', title='Документ', content='шапка текст', file_path=Path('doc.txt'), file_type='txt'
+        )
+
+        mock_document_manager._store_document_chunks(document, ['шапка', 'текст'])
+
+        mock_document_manager.ollama_client.generate_embeddings.assert_called_once_with('текст')
+        add_kwargs = mock_document_manager.collection.add.call_args.kwargs
+        assert add_kwargs['embeddings'] == [[1.0], [2.0]]
+        assert cache.get('текст') == [2.0]
+        cache.close()
+
+    def test_upload_documents_failure_removes_stored_files(self, mock_document_manager, tmp_path):
+        """Test a failed batch leaves no stored copies behind."""
+        mock_document_manager.storage_path = tmp_path / 'storage'
+        mock_document_manager.storage_path.mkdir()
+        mock_document_manager.ollama_client.generate_embeddings.side_effect = Exception("Connection refused")
+
+        file1 = tmp_path / 'first.txt'
+        file1.write_text('Первый документ о закупках. ' * 5)
+
+        with pytest.raises(DocumentManagerError):
+            mock_document_manager.upload_documents([(file1, None)])
+
+        assert list(mock_document_manager.storage_path.iterdir()) == []
+        mock_document_manager.collection.add.assert_not_called()
+
+    def test_upload_documents_failed_preparation_removes_stored_file(self, mock_document_manager, tmp_path):
+        """Test a file failing after it was stored leaves no copy behind."""
+        from ai_agent.utils.chunk_optimizer import optimized_chunker
+
+        mock_document_manager.storage_path = tmp_path / 'storage'
+        mock_document_manager.storage_path.mkdir()
+        mock_document_manager.ollama_client.generate_embeddings.return_value = [0.1]
+
+        file1 = tmp_path / 'first.txt'
+        file2 = tmp_path / 'second.txt'
+        file1.write_text('Первый документ о закупках. ' * 5)
+        file2.write_text('Второй документ о поставках. ' * 5)
+        chunk_document = optimized_chunker.chunk_document
+
+        def failing_chunk_document(content, filename=None, custom_config=None):
+            if filename == 'second.txt':
+                raise RuntimeError("Chunking failed")
+            return chunk_document(content, filename, custom_config)
+
+        with patch.object(optimized_chunker, 'chunk_document', side_effect=failing_chunk_document):
+            with pytest.raises(DocumentManagerError):
+                mock_document_manager.upload_documents([(file1, None), (file2, None)])
+
+        assert list(mock_document_manager.storage_path.iterdir()) == []
+        mock_document_manager.collection.add.assert_not_called()
+
     def test_batch_upload_documents_with_progress_callback(self, mock_document_manager):
         """Test batch upload with progress callback."""
         # Setup
@@ -217,6 +388,29 @@ class TestDocumentManagerBatchUpload:
         assert args[2] == 'file2.md'  # current file
         assert args[3]['success'] is True  # result
 
+    def test_batch_upload_documents_keeps_input_order(self, mock_document_manager):
+        """Test concurrent batch upload reports results in input order."""
+        import time
+
+        file_paths = ['slow.txt', 'fast.txt']
+        progress_callback = Mock()
+
+        def upload_side_effect(file_path, metadata=None, category=None, tags=None):
+            if file_path == 'slow.txt':
+                time.sleep(0.05)
+            return f'doc_{file_path}'
+
+        mock_document_manager.upload_document.side_effect = upload_side_effect
+
+        results = mock_document_manager.batch_upload_documents(
+            file_paths, progress_callback=progress_callback
+        )
+
+        assert [r['document_id'] for r in results] == ['doc_slow.txt', 'doc_fast.txt']
+        assert [c[0][:3] for c in progress_callback.call_args_list] == [
+            (1, 2, 'slow.txt'), (2, 2, 'fast.txt')
+        ]
+
 
 class TestBatchUploadCLI:
     """Test CLI batch upload functionality."""
@@ -261,7 +455,116 @@ class TestBatchUploadCLI:
             # Check successful uploads
             assert results['successful'][0]['doc_id'] == 'doc_id_1'
             assert results['successful'][1]['doc_id'] == 'doc_id_2'
+            assert results['successful'][1]['name'] == 'file2.md'
     
+    def test_perform_batch_upload_uses_batched_api(self, mock_cli_instance):
+        """Test files are uploaded with one batched call when it succeeds."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_path = Path(tmp_dir)
+            file1 = tmp_path / 'file1.txt'
+            file2 = tmp_path / 'file2.md'
+            file1.write_text('content1')
+            file2.write_text('content2')
+
+            mock_cli_instance.document_manager.upload_documents.return_value = ['doc_id_1', 'doc_id_2']
+
+            from ai_agent.models.document import DocumentCategory
+            results = _perform_batch_upload(
+                mock_cli_instance, [file1, file2], {'author': 'test'}, DocumentCategory.GENERAL, [],
+                skip_errors=False
+            )
+
+            assert [item['doc_id'] for item in results['successful']] == ['doc_id_1', 'doc_id_2']
+            mock_cli_instance.document_manager.upload_document.assert_not_called()
+
+            items = mock_cli_instance.document_manager.upload_documents.call_args.args[0]
+            assert [path for path, _ in items] == [file1, file2]
+            assert items[0][1] == {'author': 'test', 'original_path': str(file1), 'batch_upload': 'true'}
+
+    def test_perform_batch_upload_in_batches(self, mock_cli_instance):
+        """Test files are split into batches and only a failed batch is retried per file."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_path = Path(tmp_dir)
+            files = []
+            for i in range(3):
+                file_path = tmp_path / f'file{i}.txt'
+                file_path.write_text(f'content{i}')
+                files.append(file_path)
+
+            def upload_documents_side_effect(items, **kwargs):
+                if len(items) == 1:
+                    raise DocumentManagerError("Batch failed")
+                return [f"batch_{path.stem}" for path, _ in items]
+
+            document_manager = mock_cli_instance.document_manager
+            document_manager.upload_documents.side_effect = upload_documents_side_effect
+            document_manager.upload_document.return_value = 'single_file2'
+
+            from ai_agent.models.document import DocumentCategory
+            results = _perform_batch_upload(
+                mock_cli_instance, files, {}, DocumentCategory.GENERAL, [],
+                skip_errors=False, batch_size=2
+            )
+
+            assert [item['doc_id'] for item in results['successful']] == [
+                'batch_file0', 'batch_file1', 'single_file2'
+            ]
+            assert document_manager.upload_documents.call_count == 2
+            document_manager.upload_document.assert_called_once()
+            assert document_manager.upload_document.call_args.kwargs['file_path'] == str(files[2])
+
+    def test_perform_batch_upload_never_reuploads_stored_batch(self, mock_cli_instance):
+        """Test files of a stored batch are not uploaded again when stat fails."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_path = Path(tmp_dir)
+            files = []
+            for i in range(2):
+                file_path = tmp_path / f'file{i}.txt'
+                file_path.write_text(f'content{i}')
+                files.append(file_path)
+
+            document_manager = mock_cli_instance.document_manager
+            document_manager.upload_documents.return_value = ['doc0', 'doc1']
+
+            from ai_agent.models.document import DocumentCategory
+            with patch.object(Path, 'stat', side_effect=OSError("stat failed")):
+                results = _perform_batch_upload(
+                    mock_cli_instance, files, {}, DocumentCategory.GENERAL, [],
+                    skip_errors=False, batch_size=2
+                )
+
+            document_manager.upload_document.assert_not_called()
+            assert [item['doc_id'] for item in results['successful']] == ['doc0', 'doc1']
+            assert [item['size'] for item in results['successful']] == [None, None]
+
+    def test_perform_batch_upload_stops_after_failed_batch(self, mock_cli_instance):
+        """Test a failed batch stops later batches unless errors are skipped."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_path = Path(tmp_dir)
+            files = []
+            for i in range(4):
+                file_path = tmp_path / f'file{i}.txt'
+                file_path.write_text(f'content{i}')
+                files.append(file_path)
+
+            document_manager = mock_cli_instance.document_manager
+            document_manager.upload_documents.side_effect = RuntimeError("Batch failed")
+            document_manager.upload_document.side_effect = lambda file_path, **kwargs: f'single_{Path(file_path).stem}'
+
+            from ai_agent.models.document import DocumentCategory
+            results = _perform_batch_upload(
+                mock_cli_instance, files, {}, DocumentCategory.GENERAL, [],
+                skip_errors=False, batch_size=2
+            )
+
+            document_manager.upload_documents.assert_called_once()
+            submitted = [path for path, _ in document_manager.upload_documents.call_args.args[0]]
+            assert submitted == files[:2]
+            assert sorted(
+                call.kwargs['file_path'] for call in document_manager.upload_document.call_args_list
+            ) == [str(files[0]), str(files[1])]
+            assert [item['doc_id'] for item in results['successful']] == ['single_file0', 'single_file1']
+
     def test_perform_batch_upload_with_errors_skip(self, mock_cli_instance):
         """Test batch upload with errors and skip_errors=True."""
         with tempfile.TemporaryDirectory() as tmp_dir:
@@ -330,6 +633,36 @@ class TestBatchUploadCLI:
             assert len(results['successful']) == 1
             assert len(results['failed']) == 1
 
+    def test_perform_batch_upload_parallel_keeps_order(self, mock_cli_instance):
+        """Test parallel batch upload reports results in input order."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_path = Path(tmp_dir)
+
+            files = []
+            for i in range(8):
+                file_path = tmp_path / f'file{i}.txt'
+                file_path.write_text(f'content{i}')
+                files.append(file_path)
+
+            def upload_side_effect(file_path, metadata=None, category=None, tags=None):
+                return f"doc_{Path(file_path).stem}"
+
+            mock_cli_instance.document_manager.upload_document.side_effect = upload_side_effect
+
+            # Execute
+            from ai_agent.models.document import DocumentCategory
+            results = _perform_batch_upload(
+                mock_cli_instance, files, {}, DocumentCategory.GENERAL, [],
+                skip_errors=False, workers=4
+            )
+
+            # Verify
+            assert len(results['successful']) == 8
+            assert [item['doc_id'] for item in results['successful']] == [
+                f"doc_file{i}" for i in range(8)
+            ]
+            assert mock_cli_instance.document_manager.upload_document.call_count == 8
+
 
 class TestBatchUploadIntegration:
     """Integration tests for batch upload functionality."""
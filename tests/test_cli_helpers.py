@@ -0,0 +1,705 @@
+"""Tests for CLI helper functions."""
+
+import json
+import time
+import threading
+import pytest
+from unittest.mock import Mock, patch
+
+from click.testing import CliRunner
+from rich.text import Text
+
+from ai_agent.cli import commands
+from ai_agent.cli.commands import (
+    cli,
+    _parse_kv,
+    _parse_csv,
+    _ellipsize,
+    _format_tags,
+    _join_paragraphs,
+    _document_check_mode,
+    _looks_like_path,
+    _render_response,
+    _read_check_document,
+    _select_reference_documents_interactive,
+    _confirm,
+)
+
+
+class TestParseKeyValue:
+    """Test key=value option parsing."""
+
+    def test_parse_kv(self):
+        """Test values are split on the first '='."""
+        assert _parse_kv(["author=Иванов", "formula=a=b", "empty="]) == {
+            "author": "Иванов",
+            "formula": "a=b",
+            "empty": "",
+        }
+
+    def test_parse_kv_skips_invalid_items(self):
+        """Test items without a key are ignored."""
+        assert _parse_kv(["no_separator", "=value"]) == {}
+        assert _parse_kv([]) == {}
+
+
+class TestParseCsv:
+    """Test comma-separated option parsing."""
+
+    def test_parse_csv(self):
+        """Test items are stripped and empty items dropped."""
+        assert _parse_csv(" закупки, ,44-ФЗ,") == ["закупки", "44-ФЗ"]
+        assert _parse_csv("") == []
+        assert _parse_csv(None) == []
+
+
+class TestEllipsize:
+    """Test text shortening for tables."""
+
+    def test_ellipsize(self):
+        """Test only text longer than the limit is shortened."""
+        assert _ellipsize("Договор", 7) == "Договор"
+        assert _ellipsize("Договор поставки", 7) == "Договор…"
+        assert _ellipsize("", 5) == ""
+
+
+class TestFormatTags:
+    """Test tag formatting for table cells."""
+
+    def test_string_and_list_tags(self):
+        """Test stored string and list tags format the same way."""
+        assert _format_tags("закупки,44-ФЗ,договор", limit=2) == "закупки, 44-ФЗ +1"
+        assert (
+            _format_tags(["закупки", "44-ФЗ", "договор"], limit=2)
+            == "закупки, 44-ФЗ +1"
+        )
+        assert _format_tags(["закупки", "44-ФЗ"]) == "закупки, 44-ФЗ"
+
+    def test_no_tags(self):
+        """Test empty tags are shown as "нет"."""
+        assert _format_tags("") == "нет"
+        assert _format_tags([]) == "нет"
+        assert _format_tags(None) == "нет"
+
+
+class TestJoinParagraphs:
+    """Test joining extracted paragraph texts."""
+
+    def test_join_paragraphs_skips_blank(self):
+        """Test blank paragraphs are dropped and the rest joined with newlines."""
+        texts = iter(["Первый", "", "  ", "Второй\tабзац", " Третий"])
+        assert _join_paragraphs(texts) == "Первый\nВторой\tабзац\n Третий"
+        assert _join_paragraphs([]) == ""
+
+
+class TestDocumentCheckMode:
+    """Test the interactive document check mode."""
+
+    def test_blank_input_is_skipped_and_exit_is_case_insensitive(self):
+        """Test blank lines are ignored and '/EXIT' leaves the mode."""
+        cli_instance = Mock()
+        with patch("rich.prompt.Prompt.ask", side_effect=["", "   ", " /EXIT "]) as ask:
+            _document_check_mode(cli_instance, "session")
+
+        assert ask.call_count == 3
+        cli_instance.query_processor.process_document_check.assert_not_called()
+
+
+class TestSelectReferenceDocuments:
+    """Test interactive reference document selection."""
+
+    def test_selection_keeps_order_and_skips_out_of_range(self):
+        """Test selected numbers map to document IDs in input order."""
+        cli_instance = Mock()
+        cli_instance.document_manager.get_reference_documents.return_value = [
+            {"id": f"doc{i}", "title": f"Документ {i}", "tags": "", "chunk_count": 1}
+            for i in range(1, 4)
+        ]
+        with patch("rich.prompt.Prompt.ask", return_value="3, 1, 7, 0"), patch(
+            "ai_agent.cli.commands.console"
+        ) as console:
+            assert _select_reference_documents_interactive(cli_instance) == [
+                "doc3",
+                "doc1",
+            ]
+
+        warnings = [
+            c.args[0]
+            for c in console.print.call_args_list
+            if "вне диапазона" in str(c.args[0])
+        ]
+        assert warnings == ["[yellow]⚠️ Номера вне диапазона, пропущены: 7, 0"]
+
+
+class TestProgressSpinner:
+    """Test the shared spinner is only shown for slow operations."""
+
+    def test_fast_task_never_starts_spinner(self):
+        """Test a task finishing within the delay leaves the display alone."""
+        progress = Mock()
+        with patch.object(commands, "_get_progress", return_value=progress):
+            task = commands._start_progress_task("Загрузка документа...")
+            commands._finish_progress_task(task)
+            time.sleep(commands._SPINNER_DELAY * 2)
+
+        progress.start.assert_not_called()
+        progress.stop.assert_not_called()
+
+    def test_slow_task_shows_spinner(self):
+        """Test a task outliving the delay starts and stops the display."""
+        progress = Mock()
+        with patch.object(
+            commands, "_get_progress", return_value=progress
+        ), patch.object(commands, "_SPINNER_DELAY", 0.01):
+            task = commands._start_progress_task("Загрузка документа...")
+            time.sleep(0.2)
+            commands._finish_progress_task(task)
+
+        progress.start.assert_called_once()
+        progress.stop.assert_called_once()
+
+    def test_progress_task_finishes_on_error(self):
+        """Test the task context removes its task when the block raises."""
+        progress = Mock()
+        progress.add_task.return_value = 7
+        with patch.object(commands, "_get_progress", return_value=progress):
+            with pytest.raises(SystemExit):
+                with commands._progress_task("Обработка запроса...") as (shown, task):
+                    assert (shown, task) == (progress, 7)
+                    raise SystemExit(1)
+
+        progress.remove_task.assert_called_once_with(7)
+        assert commands._active_progress_tasks == 0
+
+
+class TestExitWithError:
+    """Test error messages printed before exiting."""
+
+    def test_prints_suggestions_and_exits(self):
+        """Test the message and suggestions are printed at once and exit with 1."""
+        with patch.object(commands, "console") as mock_console:
+            with pytest.raises(SystemExit) as exc_info:
+                commands._exit_with_error(
+                    "Ошибка загрузки: нет доступа", ["Проверьте права"]
+                )
+
+        assert exc_info.value.code == 1
+
+        mock_console.print.assert_called_once_with(
+            "[red]❌ Ошибка загрузки: нет доступа",
+            "[yellow]💡 Рекомендации:",
+            "  • Проверьте права",
+            sep="\n",
+        )
+
+
+class TestLooksLikePath:
+    """Test check mode input classification."""
+
+    def test_existing_file_is_a_path(self, tmp_path):
+        """Test existing files, including names with spaces, are paths."""
+        document = tmp_path / "Договор на поставку товаров от 2024.txt"
+        document.write_text("текст", encoding="utf-8")
+        assert _looks_like_path(str(document)) is True
+        assert _looks_like_path(str(tmp_path / "missing.txt")) is False
+
+    def test_document_text_is_not_stat_ed(self):
+        """Test long or multi-line input is treated as text without a lookup."""
+        with patch("ai_agent.cli.commands.os.path.exists") as exists:
+            assert _looks_like_path("Раздел 1\nОбщие положения") is False
+            assert _looks_like_path("а" * 5000) is False
+            assert (
+                _looks_like_path("Поставщик обязан передать товар в течение 10 дней.")
+                is False
+            )
+        exists.assert_not_called()
+
+    def test_relative_name_with_spaces_is_looked_up(self, tmp_path, monkeypatch):
+        """Test a file name with spaces but a known extension is still a path."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "Договор на поставку.docx").write_bytes(b"")
+        assert _looks_like_path("Договор на поставку.docx") is True
+
+
+class TestReadCheckDocument:
+    """Test reading documents in the check mode."""
+
+    def test_reader_is_chosen_by_suffix(self, tmp_path):
+        """Test registered suffixes use their reader, others are read as text."""
+        text_file = tmp_path / "требования.txt"
+        text_file.write_text("Требования", encoding="utf-8")
+        assert _read_check_document(text_file) == "Требования"
+
+        docx_reader = Mock(return_value="Текст договора")
+        with patch.dict(commands._CHECK_DOCUMENT_READERS, {".docx": docx_reader}):
+            assert _read_check_document(tmp_path / "Договор.DOCX") == "Текст договора"
+        docx_reader.assert_called_once_with(tmp_path / "Договор.DOCX")
+
+    def test_large_text_file_is_rejected(self, tmp_path):
+        """Test text files over the size limit are rejected before reading."""
+        text_file = tmp_path / "большой.txt"
+        text_file.write_text("x" * 100, encoding="utf-8")
+
+        with patch.object(commands, "_CHECK_TEXT_MAX_SIZE", 10):
+            with pytest.raises(ValueError, match="слишком большой"):
+                _read_check_document(text_file)
+
+        with patch.object(commands, "_CHECK_TEXT_MAX_SIZE", 100):
+            assert _read_check_document(text_file) == "x" * 100
+
+
+class TestRenderResponse:
+    """Test response panels."""
+
+    def test_markdown_is_parsed_once(self):
+        """Test the same response reuses its parsed Markdown unless streaming."""
+        first = _render_response("**Ответ** на вопрос")
+        assert _render_response("**Ответ** на вопрос").renderable is first.renderable
+        assert (
+            _render_response("**Ответ** на вопрос", cache=False).renderable
+            is not first.renderable
+        )
+
+    def test_plain_text_skips_markdown(self):
+        """Test text without Markdown syntax is shown as plain text."""
+        assert isinstance(
+            _render_response("Документ соответствует требованиям.").renderable, Text
+        )
+        assert not isinstance(
+            _render_response("Требования:\n- пункт 1").renderable, Text
+        )
+        assert not isinstance(_render_response("См. [раздел 2](#r2)").renderable, Text)
+
+
+class TestManageDocTags:
+    """Test adding and removing individual document tags."""
+
+    def test_add_and_remove_tags(self):
+        """Test tags keep their order, duplicates are dropped."""
+        cli_instance = Mock()
+        cli_instance.document_manager.get_document_info.return_value = {
+            "tags": ["закупки", "44-ФЗ"]
+        }
+
+        result = CliRunner().invoke(
+            cli,
+            [
+                "manage-doc",
+                "doc1",
+                "--add-tag",
+                "договор",
+                "--add-tag",
+                "закупки",
+                "--remove-tag",
+                "44-ФЗ",
+            ],
+            obj={"cli": cli_instance},
+        )
+
+        assert result.exit_code == 0
+        cli_instance.document_manager.update_document_tags.assert_called_once_with(
+            "doc1", ["закупки", "договор"]
+        )
+
+    def test_unchanged_tags_are_not_written(self):
+        """Test no update is made when the tag set does not change."""
+        cli_instance = Mock()
+        cli_instance.document_manager.get_document_info.return_value = {
+            "tags": "закупки"
+        }
+
+        result = CliRunner().invoke(
+            cli,
+            ["manage-doc", "doc1", "--add-tag", "закупки"],
+            obj={"cli": cli_instance},
+        )
+
+        assert result.exit_code == 0
+        cli_instance.document_manager.update_document_tags.assert_not_called()
+
+    def test_replace_and_edit_tags_in_one_update(self):
+        """Test --tags with --add-tag/--remove-tag writes the combined list once."""
+        cli_instance = Mock()
+        cli_instance.document_manager.get_document_info.return_value = {
+            "tags": "старый"
+        }
+
+        result = CliRunner().invoke(
+            cli,
+            [
+                "manage-doc",
+                "doc1",
+                "--tags",
+                "закупки,44-ФЗ",
+                "--add-tag",
+                "договор",
+                "--remove-tag",
+                "44-ФЗ",
+            ],
+            obj={"cli": cli_instance},
+        )
+
+        assert result.exit_code == 0
+        cli_instance.document_manager.update_document_tags.assert_called_once_with(
+            "doc1", ["закупки", "договор"]
+        )
+
+
+class TestUploadCommands:
+    """Test single document upload commands."""
+
+    def test_upload(self, tmp_path):
+        """Test upload passes parsed options to the document manager."""
+        from ai_agent.models.document import DocumentCategory
+
+        file_path = tmp_path / "doc.txt"
+        file_path.write_text("Текст документа")
+        cli_instance = Mock()
+        cli_instance.document_manager.upload_document.return_value = "doc1"
+
+        result = CliRunner().invoke(
+            cli,
+            [
+                "upload",
+                str(file_path),
+                "--category",
+                "reference",
+                "--tags",
+                "закупки,44-ФЗ",
+                "-m",
+                "author=Иванов",
+            ],
+            obj={"cli": cli_instance},
+        )
+
+        assert result.exit_code == 0, result.output
+        cli_instance.document_manager.upload_document.assert_called_once_with(
+            file_path=str(file_path),
+            metadata={"author": "Иванов"},
+            category=DocumentCategory.REFERENCE,
+            tags=["закупки", "44-ФЗ"],
+        )
+        assert "doc1" in result.output
+
+    def test_upload_reference(self, tmp_path):
+        """Test reference upload stores the document in the reference category."""
+        from ai_agent.models.document import DocumentCategory
+
+        file_path = tmp_path / "law.txt"
+        file_path.write_text("Статья 1")
+        cli_instance = Mock()
+        cli_instance.document_manager.upload_document.return_value = "ref1"
+
+        result = CliRunner().invoke(
+            cli,
+            ["upload-reference", str(file_path), "--title", "Закон"],
+            obj={"cli": cli_instance},
+        )
+
+        assert result.exit_code == 0, result.output
+        cli_instance.document_manager.upload_document.assert_called_once_with(
+            file_path=str(file_path),
+            metadata={"title": "Закон"},
+            category=DocumentCategory.REFERENCE,
+            tags=[],
+        )
+        assert "ref1" in result.output
+
+    @pytest.mark.parametrize(
+        "command, message",
+        [
+            ("upload", "Ошибка загрузки: нет места"),
+            ("upload-reference", "Ошибка загрузки эталонного документа: нет места"),
+        ],
+    )
+    def test_upload_error_finishes_spinner_and_exits(self, tmp_path, command, message):
+        """Test a failed upload stops the spinner and exits with the error."""
+        from ai_agent.core.document_manager import DocumentManagerError
+        from ai_agent.utils.error_handling import create_error, ErrorCategory
+
+        file_path = tmp_path / "doc.txt"
+        file_path.write_text("Текст документа")
+        error = create_error("UPLOAD_FAILED", "нет места", ErrorCategory.PROCESSING)
+        cli_instance = Mock()
+        cli_instance.document_manager.upload_document.side_effect = (
+            DocumentManagerError(error.error_info)
+        )
+
+        with patch.object(commands, "_shared_progress", None):
+            result = CliRunner().invoke(
+                cli, [command, str(file_path)], obj={"cli": cli_instance}
+            )
+            progress = commands._shared_progress
+
+        assert result.exit_code == 1
+        assert message in result.output
+        assert progress is None or not progress.tasks
+
+
+class TestConfirmDelete:
+    """Test confirmation prompts can be skipped in scripts."""
+
+    def test_terminal_prompt(self):
+        """Test the prompt is shown on a terminal unless --yes was given."""
+        with patch("ai_agent.cli.commands.sys.stdin") as stdin, patch(
+            "rich.prompt.Confirm.ask", return_value=False
+        ) as ask:
+            stdin.isatty.return_value = True
+            assert _confirm("Удалить?", True) is True
+            ask.assert_not_called()
+            assert _confirm("Удалить?") is False
+            ask.assert_called_once_with("Удалить?")
+
+    def test_yes_skips_prompt(self):
+        """Test docs --delete -y deletes the document."""
+        cli_instance = Mock()
+
+        result = CliRunner().invoke(
+            cli, ["docs", "--delete", "doc1", "-y"], obj={"cli": cli_instance}
+        )
+
+        assert result.exit_code == 0
+        cli_instance.document_manager.delete_document.assert_called_once_with("doc1")
+
+    def test_performance_reset_yes(self):
+        """Test performance --reset -y resets without asking."""
+        with patch("ai_agent.utils.performance_monitor.performance_monitor") as monitor:
+            result = CliRunner().invoke(
+                cli, ["performance", "--reset", "-y"], obj={"cli": Mock()}
+            )
+
+        assert result.exit_code == 0
+        monitor.reset_stats.assert_called_once()
+
+    def test_cache_clear_skips_document_manager(self):
+        """Test cache --clear empties the embedding cache without ChromaDB."""
+        from unittest.mock import PropertyMock
+
+        cli_instance = Mock()
+        cli_instance._document_manager = None
+        type(cli_instance).document_manager = PropertyMock(
+            side_effect=AssertionError("document manager created")
+        )
+
+        with patch.object(commands, "EmbeddingCache") as embedding_cache, patch.object(
+            commands, "_parse_cache"
+        ), patch("ai_agent.utils.cache_manager.cache_manager"):
+            result = CliRunner().invoke(
+                cli, ["cache", "--clear", "-y"], obj={"cli": cli_instance}
+            )
+
+        assert result.exit_code == 0, result.output
+        embedding_cache.return_value.clear.assert_called_once()
+
+    def test_no_terminal_confirms(self):
+        """Test piped stdin is treated as confirmation."""
+        cli_instance = Mock()
+
+        with patch("rich.prompt.Confirm.ask") as ask:
+            result = CliRunner().invoke(
+                cli, ["session", "--delete", "s1"], input="", obj={"cli": cli_instance}
+            )
+
+        assert result.exit_code == 0
+        ask.assert_not_called()
+        cli_instance.session_manager.delete_session.assert_called_once_with("s1")
+
+
+class TestStatusJson:
+    """Test machine-readable status output."""
+
+    def test_status_json(self):
+        """Test --json prints one JSON object and reuses recent stats."""
+        cli_instance = Mock()
+        cli_instance.ollama_client.health_check.return_value = True
+        cli_instance.ollama_client.list_available_models.return_value = ["llama3.1"]
+        cli_instance.document_manager.get_collection_stats.return_value = {
+            "total_documents": 2,
+            "total_chunks": 10,
+        }
+        cli_instance.session_manager.get_session_stats.return_value = {
+            "total_sessions": 1,
+            "active_sessions": 1,
+            "total_messages": 4,
+        }
+
+        runner = CliRunner()
+        with patch("psutil.cpu_percent", return_value=5.0) as cpu_percent:
+            started = time.monotonic()
+            first = runner.invoke(cli, ["status", "--json"], obj={"cli": cli_instance})
+            second = runner.invoke(cli, ["status", "-j"], obj={"cli": cli_instance})
+            elapsed = time.monotonic() - started
+
+        assert first.exit_code == 0
+        assert elapsed < 1.0
+        assert all(
+            call.kwargs == {"interval": None} for call in cpu_percent.call_args_list
+        )
+        data = json.loads(first.output)
+        assert data["ollama"] == {"available": True, "models": ["llama3.1"]}
+        assert data["documents"] == {"total_documents": 2, "total_chunks": 10}
+        assert data["sessions"]["total_messages"] == 4
+        assert json.loads(second.output)["documents"] == data["documents"]
+        cli_instance.document_manager.get_collection_stats.assert_called_once()
+
+    def test_status_skips_model_listing_when_ollama_is_down(self):
+        """Test models are not listed once the health check failed."""
+        cli_instance = Mock()
+        cli_instance.ollama_client.health_check.return_value = False
+        cli_instance.document_manager.get_collection_stats.return_value = {}
+        cli_instance.session_manager.get_session_stats.return_value = {}
+
+        with patch("psutil.cpu_percent", return_value=5.0), patch(
+            "ai_agent.cli.commands._status_stats", None
+        ):
+            result = CliRunner().invoke(
+                cli, ["status", "--json"], obj={"cli": cli_instance}
+            )
+
+        assert json.loads(result.output)["ollama"] == {
+            "available": False,
+            "models": None,
+        }
+        cli_instance.ollama_client.list_available_models.assert_not_called()
+
+
+class TestHealthJson:
+    """Test machine-readable health output."""
+
+    def test_health_json(self):
+        """Test --format json prints indented JSON including datetimes."""
+        from datetime import datetime
+        from ai_agent.utils.health_monitor import HealthCheck, HealthStatus
+
+        checked_at = datetime(2024, 5, 1, 12, 30)
+        check = HealthCheck(
+            "system_cpu",
+            HealthStatus.HEALTHY,
+            "CPU [ok]",
+            {"cpu": 5.0},
+            checked_at,
+            0.01,
+        )
+
+        with patch("ai_agent.cli.commands.health_monitor") as monitor:
+            monitor.run_all_checks.return_value = {"system_cpu": check}
+            monitor.get_health_summary.return_value = {
+                "overall_status": "healthy",
+                "last_check": checked_at,
+            }
+            result = CliRunner().invoke(
+                cli, ["health", "--format", "json"], obj={"cli": Mock()}
+            )
+
+        assert result.exit_code == 0
+        assert result.output.startswith('{\n  "summary"')
+        data = json.loads(result.output)
+        assert data["checks"]["system_cpu"]["message"] == "CPU [ok]"
+        assert data["checks"]["system_cpu"]["timestamp"] == "2024-05-01T12:30:00"
+        assert data["summary"]["last_check"].startswith("2024-05-01")
+
+    def test_health_table_single_print(self):
+        """Test the table report with error statistics is written by one print."""
+        from ai_agent.utils.health_monitor import HealthCheck, HealthStatus
+
+        check = HealthCheck(
+            "system_cpu", HealthStatus.HEALTHY, "CPU ok", {}, None, 0.01
+        )
+        error_stats = {
+            "total_errors": 2,
+            "unique_error_codes": 1,
+            "recent_error_rate": 2,
+            "most_frequent_errors": [("NET_001", 2)],
+        }
+
+        with patch("ai_agent.cli.commands.health_monitor") as monitor, patch(
+            "ai_agent.cli.commands.error_notification_manager"
+        ) as notifications, patch("ai_agent.cli.commands.console") as mock_console:
+            monitor.run_all_checks.return_value = {"system_cpu": check}
+            monitor.get_health_summary.return_value = {"overall_status": "healthy"}
+            notifications.get_error_summary.return_value = error_stats
+            result = CliRunner().invoke(cli, ["health"], obj={"cli": Mock()})
+
+        assert result.exit_code == 0
+        mock_console.print.assert_called_once()
+        parts = mock_console.print.call_args.args
+        assert any("HEALTHY" in str(part) for part in parts)
+        assert any("NET_001: 2" in str(part) for part in parts)
+
+
+class TestLazyInitialization:
+    """Test commands only create the components they need."""
+
+    def test_import_and_help_skip_rich(self):
+        """Test importing the CLI and printing its help load neither rich nor psutil."""
+        import subprocess
+        import sys
+
+        code = (
+            "import sys\n"
+            "from click.testing import CliRunner\n"
+            "from ai_agent.cli.commands import cli\n"
+            "assert CliRunner().invoke(cli, ['--help']).exit_code == 0\n"
+            "assert 'psutil' not in sys.modules\n"
+            "print(sorted(m for m in sys.modules if m.split('.')[0] == 'rich'))\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        assert result.stdout.strip().splitlines()[-1] == "[]"
+
+    def test_help_skips_component_initialization(self):
+        """Test --help neither constructs components nor starts monitoring."""
+        runner = CliRunner()
+        with patch(
+            "ai_agent.cli.commands.AIAgentCLI._create_component"
+        ) as create_component, patch("ai_agent.cli.commands.health_monitor") as monitor:
+            assert runner.invoke(cli, ["--help"], obj={}).exit_code == 0
+            assert runner.invoke(cli, ["status", "--help"], obj={}).exit_code == 0
+            assert runner.invoke(cli, ["upload", "--help"], obj={}).exit_code == 0
+
+        create_component.assert_not_called()
+        monitor.start_monitoring.assert_not_called()
+
+    def test_query_processor_dependencies_are_created_concurrently(self):
+        """Test the query processor dependencies are created in parallel."""
+        barrier = threading.Barrier(3, timeout=5)
+        created = []
+
+        def create_component(description, factory):
+            created.append(description)
+            if "процессора" not in description:
+                barrier.wait()  # Fails unless all three run at the same time
+            return Mock()
+
+        cli_instance = commands.AIAgentCLI()
+        with patch.object(
+            cli_instance, "_create_component", side_effect=create_component
+        ):
+            query_processor = cli_instance.query_processor
+            assert cli_instance.query_processor is query_processor
+
+        assert len(created) == 4
+        assert created[-1] == "Инициализация процессора запросов..."
+
+    def test_ollama_check_overlaps_storage_initialization(self):
+        """Test the managers are created while Ollama is being checked."""
+        barrier = threading.Barrier(2, timeout=5)
+        ollama_client = Mock()
+        ollama_client.health_check.side_effect = lambda: barrier.wait() is not None
+
+        def create_component(description, factory):
+            if "Ollama" in description:
+                return ollama_client
+            if "документов" in description:
+                barrier.wait()  # Fails unless the health check runs meanwhile
+            return Mock()
+
+        cli_instance = commands.AIAgentCLI()
+        with patch.object(
+            cli_instance, "_create_component", side_effect=create_component
+        ):
+            cli_instance.ensure_ollama_available()
+
+        assert cli_instance._document_manager is not None
+        assert cli_instance._session_manager is not None
@@ -0,0 +1,178 @@
+"""Tests for the CLI daemon."""
+
+import os
+import socket
+import tempfile
+import threading
+import time
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+from ai_agent.cli import commands
+from ai_agent.cli import daemon as cli_daemon
+
+
+class TestMessageFraming:
+    """Test socket message framing."""
+
+    def test_send_and_receive_message(self):
+        """Test framed messages survive a round trip."""
+        left, right = socket.socketpair()
+        with left, right:
+            cli_daemon.send_message(left, cli_daemon.MSG_OUTPUT, 'Привет'.encode('utf-8'))
+            cli_daemon.send_message(left, cli_daemon.MSG_EXIT, b'0')
+
+            assert cli_daemon.recv_message(right) == (cli_daemon.MSG_OUTPUT, 'Привет'.encode('utf-8'))
+            assert cli_daemon.recv_message(right) == (cli_daemon.MSG_EXIT, b'0')
+
+    def test_receive_from_closed_socket(self):
+        """Test closed connection is reported as None."""
+        left, right = socket.socketpair()
+        left.close()
+        with right:
+            assert cli_daemon.recv_message(right) is None
+
+
+class TestForwarding:
+    """Test command forwarding to the daemon."""
+
+    def test_interactive_commands_run_locally(self, tmp_path):
+        """Test commands that prompt are never forwarded."""
+        socket_path = tmp_path / 'cli.sock'
+        assert cli_daemon.forward_to_daemon(['query'], socket_path) is None
+        assert cli_daemon.forward_to_daemon(['docs', '--delete', 'abc'], socket_path) is None
+        assert cli_daemon.forward_to_daemon(['status', '--help'], socket_path) is None
+
+    def test_delete_options_are_parsed_like_click(self):
+        """Test every click spelling of --delete and --yes is recognized."""
+        for args in (
+            ['docs', '--delete', 'abc'],
+            ['docs', '--delete=abc'],
+            ['docs', '-d', 'abc'],
+            ['docs', '-dabc'],
+        ):
+            params = cli_daemon._command_params(args)
+            assert (params['delete'], params['yes']) == ('abc', False), args
+
+        params = cli_daemon._command_params(['--verbose', 'session', '-yd', 's1'])
+        assert (params['delete'], params['yes']) == ('s1', True)
+        assert cli_daemon._with_yes(['--verbose', 'docs', '-d', 'abc']) == [
+            '--verbose', 'docs', '--yes', '-d', 'abc'
+        ]
+        assert cli_daemon._has_local_only_option(['status', '--help'])
+        assert not cli_daemon._has_local_only_option(['docs', '--delete=abc'])
+
+    def test_no_daemon_runs_locally(self, tmp_path):
+        """Test forwarding falls back when no daemon is listening."""
+        assert cli_daemon.forward_to_daemon(['status'], tmp_path / 'cli.sock') is None
+
+    def test_forward_command_to_running_daemon(self, capsys):
+        """Test a forwarded command runs with the resident CLI instance."""
+        # Unix socket paths are limited in length, keep it short
+        socket_dir = tempfile.TemporaryDirectory(prefix='aid')
+        socket_path = Path(socket_dir.name) / 'cli.sock'
+
+        resident_cli = Mock()
+        resident_cli.document_manager.get_supported_file_types.return_value = ['.txt']
+
+        server_daemon = cli_daemon.CLIDaemon(socket_path)
+        with patch('ai_agent.cli.commands.AIAgentCLI', return_value=resident_cli), \
+                patch('signal.signal'):
+            thread = threading.Thread(target=server_daemon.serve_forever, daemon=True)
+            thread.start()
+
+            for _ in range(50):
+                if cli_daemon.daemon_status(socket_path):
+                    break
+                time.sleep(0.1)
+
+            commands._status_stats = (time.monotonic(), resident_cli, {}, {})
+            exit_code = cli_daemon.forward_to_daemon(['formats'], socket_path)
+            output = capsys.readouterr().out
+
+            info = cli_daemon.daemon_status(socket_path)
+            assert cli_daemon.stop_daemon(socket_path) is True
+            thread.join(timeout=5)
+
+        assert exit_code == 0
+        assert 'TXT' in output
+        assert info['requests_served'] == 1
+        assert commands._status_stats is None
+        assert info['cwd'] == os.getcwd()
+        assert not socket_path.exists()
+        socket_dir.cleanup()
+
+
+    def test_second_daemon_does_not_take_over_socket(self):
+        """Test a running daemon keeps its socket and the socket is private."""
+        socket_dir = tempfile.TemporaryDirectory(prefix='aid')
+        socket_path = Path(socket_dir.name) / 'cli.sock'
+
+        server_daemon = cli_daemon.CLIDaemon(socket_path)
+        with patch('ai_agent.cli.commands.AIAgentCLI', return_value=Mock()), \
+                patch('signal.signal'):
+            thread = threading.Thread(target=server_daemon.serve_forever, daemon=True)
+            thread.start()
+
+            for _ in range(50):
+                if cli_daemon.daemon_status(socket_path):
+                    break
+                time.sleep(0.1)
+
+            mode = os.stat(socket_path).st_mode & 0o777
+            with patch('ai_agent.cli.commands.AIAgentCLI') as second_cli:
+                cli_daemon.CLIDaemon(socket_path).serve_forever()
+            info = cli_daemon.daemon_status(socket_path)
+
+            assert cli_daemon.stop_daemon(socket_path) is True
+            thread.join(timeout=5)
+
+        assert mode == 0o600
+        second_cli.assert_not_called()
+        assert info['pid'] == os.getpid()
+        socket_dir.cleanup()
+
+
+    def test_writes_go_through_running_daemon(self, capsys):
+        """Test deletes and uploads never write from a second process."""
+        socket_dir = tempfile.TemporaryDirectory(prefix='aid')
+        socket_path = Path(socket_dir.name) / 'cli.sock'
+
+        resident_cli = Mock()
+        resident_cli.document_manager.delete_document.return_value = True
+        resident_cli.document_manager.list_documents.return_value = []
+
+        server_daemon = cli_daemon.CLIDaemon(socket_path)
+        with patch('ai_agent.cli.commands.AIAgentCLI', return_value=resident_cli), \
+                patch('signal.signal'):
+            thread = threading.Thread(target=server_daemon.serve_forever, daemon=True)
+            thread.start()
+
+            for _ in range(50):
+                if cli_daemon.daemon_status(socket_path):
+                    break
+                time.sleep(0.1)
+
+            with patch('ai_agent.cli.commands._confirm', return_value=True) as confirm:
+                delete_code = cli_daemon.forward_to_daemon(['docs', '--delete=doc1'], socket_path)
+            list_code = cli_daemon.forward_to_daemon(['docs', '--list'], socket_path)
+            upload_code = cli_daemon.forward_to_daemon(['batch-upload', '.'], socket_path)
+            output = capsys.readouterr()
+
+            assert cli_daemon.stop_daemon(socket_path) is True
+            thread.join(timeout=5)
+
+        # Asked on the client, then forwarded with --yes
+        assert [c.args for c in confirm.call_args_list] == [
+            ('Удалить документ doc1?',), ('Удалить документ doc1?', True)
+        ]
+        assert delete_code == 0 and list_code == 0
+        # The delete ran on the daemon's own collection, which the next
+        # forwarded command reads
+        resident_cli.document_manager.delete_document.assert_called_once_with('doc1')
+        resident_cli.document_manager.list_documents.assert_called_once()
+        assert 'doc1 удален' in output.out
+        assert upload_code == 1
+        assert '--yes' in output.err
+        resident_cli.document_manager.upload_documents.assert_not_called()
+        socket_dir.cleanup()
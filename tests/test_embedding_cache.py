@@ -0,0 +1,41 @@
+"""Tests for the persistent embedding cache."""
+
+import pytest
+
+from ai_agent.utils.embedding_cache import EmbeddingCache
+
+
+def test_embedding_survives_reopen(tmp_path):
+    """Test embeddings are read back by a new cache instance."""
+    path = tmp_path / 'embed_cache.sqlite'
+    cache = EmbeddingCache(path)
+    assert cache.get('вопрос') is None
+
+    cache.put('вопрос', [0.25, -0.5, 1.0])
+    cache.close()
+
+    reopened = EmbeddingCache(path)
+    assert reopened.get('вопрос') == pytest.approx([0.25, -0.5, 1.0])
+    assert reopened.get('вопрос', model='other-model') is None
+    assert reopened.get_stats()['hits'] == 1
+    reopened.close()
+
+
+def test_clear_removes_entries(tmp_path):
+    """Test clearing the cache."""
+    cache = EmbeddingCache(tmp_path / 'embed_cache.sqlite')
+    cache.put('text', [1.0])
+    cache.clear()
+    assert cache.get('text') is None
+    cache.close()
+
+
+def test_get_many_aligns_with_texts(tmp_path):
+    """Test batched lookup returns hits and misses in input order."""
+    cache = EmbeddingCache(tmp_path / 'embed_cache.sqlite')
+    cache.put_many(['a', 'b'], [[1.0], [2.0]])
+
+    assert cache.get_many(['b', 'missing', 'a', 'b']) == [[2.0], None, [1.0], [2.0]]
+    assert cache.get_many(['a'], model='other-model') == [None]
+    assert cache.get_stats()['hits'] == 3
+    cache.close()
@@ -15,7 +15,7 @@ from ai_agent.utils.logging_config import (
 from ai_agent.utils.error_handling import (
     AIAgentError, ErrorInfo, ErrorCategory, ErrorSeverity,
     RetryConfig, with_retry, CircuitBreaker, 
-    handle_error, create_error, error_notification_manager
+    handle_error, create_error, error_notification_manager, is_network_error
 )
 from ai_agent.utils.performance_monitor import (
     PerformanceMonitor, PerformanceMetrics, performance_tracker,
@@ -244,6 +244,33 @@ class TestErrorHandling:
             assert ai_error.error_info.message == "Custom error message"
             assert ai_error.original_error is None
             mock_notify.assert_called_once()
+    
+    def test_is_network_error_requests_exceptions(self):
+        """Test requests exceptions are network errors once requests is loaded."""
+        import requests
+        
+        assert is_network_error(requests.exceptions.HTTPError("500 Server Error"))
+        assert is_network_error(ConnectionRefusedError())
+        assert not is_network_error(ValueError("bad value"))
+
+
+class TestHealthMonitor:
+    """Test background health monitoring."""
+    
+    def test_monitoring_waits_one_interval_and_stops_promptly(self):
+        """Test checks do not run at start and stopping does not wait for the interval."""
+        from ai_agent.utils.health_monitor import HealthMonitor
+        
+        monitor = HealthMonitor(check_interval=60)
+        with patch.object(monitor, 'run_all_checks') as run_all_checks:
+            monitor.start_monitoring()
+            monitor.start_monitoring()
+            start = time.monotonic()
+            monitor.stop_monitoring()
+        
+        assert time.monotonic() - start < 1
+        assert not monitor.monitor_thread.is_alive()
+        run_all_checks.assert_not_called()
 
 
 class TestPerformanceMonitor:
@@ -284,6 +311,7 @@ class TestPerformanceMonitor:
         assert stats["success_count"] == 1
         assert stats["error_count"] == 0
         assert stats["avg_duration"] > 0
+        assert monitor.get_total_operations() == 1
         
         # Test recent metrics
         recent = monitor.get_recent_metrics("test_op", limit=10)
@@ -51,6 +51,23 @@ class TestOllamaClient:
         client = OllamaClient()
         assert client.health_check() is False
 
+    @patch('ai_agent.core.ollama_client.Client')
+    def test_health_check_result_is_reused(self, mock_client_class):
+        """Test health check result is cached for the TTL."""
+        mock_client = Mock()
+        mock_client.list.return_value = {'models': [{'name': 'llama3.1'}]}
+        mock_client_class.return_value = mock_client
+
+        client = OllamaClient()
+        client.list_available_models()
+        assert client.health_check() is True
+        assert client.health_check() is True
+        mock_client.list.assert_called_once()
+
+        client.health_check_ttl = 0
+        assert client.health_check() is True
+        assert mock_client.list.call_count == 2
+
     @patch('ai_agent.core.ollama_client.Client')
     def test_list_available_models_success(self, mock_client_class):
         """Test successful model listing."""
@@ -69,6 +86,34 @@ class TestOllamaClient:
         assert models == ['llama3.1', 'phi3']
         mock_client.list.assert_called_once()
 
+    @patch('ai_agent.core.ollama_client.Client')
+    def test_list_available_models_result_is_reused(self, mock_client_class):
+        """Test model listing is cached for the TTL."""
+        mock_client = Mock()
+        mock_client.list.return_value = {'models': [{'name': 'llama3.1'}]}
+        mock_client_class.return_value = mock_client
+
+        client = OllamaClient()
+        assert client.list_available_models() == ['llama3.1']
+        assert client.check_model_availability('llama3.1') is True
+        mock_client.list.assert_called_once()
+
+        client.health_check_ttl = 0
+        assert client.list_available_models() == ['llama3.1']
+        assert mock_client.list.call_count == 2
+
+    @patch('ai_agent.core.ollama_client.Client')
+    def test_health_check_keeps_model_listing(self, mock_client_class):
+        """Test models listed by the health check are not requested again."""
+        mock_client = Mock()
+        mock_client.list.return_value = {'models': [{'name': 'llama3.1'}]}
+        mock_client_class.return_value = mock_client
+
+        client = OllamaClient()
+        assert client.health_check() is True
+        assert client.list_available_models() == ['llama3.1']
+        mock_client.list.assert_called_once()
+
     @patch('ai_agent.core.ollama_client.Client')
     def test_list_available_models_failure(self, mock_client_class):
         """Test model listing failure."""
@@ -0,0 +1,54 @@
+"""Tests for the persistent parse cache."""
+
+import os
+from unittest.mock import patch
+
+from ai_agent.utils.file_processor import FileProcessor
+from ai_agent.utils.parse_cache import ParseCache
+
+
+def test_parsed_text_is_reused_until_file_changes(tmp_path):
+    """Test a cached file is not parsed again until it is modified."""
+    document = tmp_path / 'document.txt'
+    document.write_text('Требования к поставщику', encoding='utf-8')
+    processor = FileProcessor(parse_cache=ParseCache(tmp_path / 'parsed'))
+
+    content, metadata = processor.extract_text(document)
+    with patch.object(processor, '_extract_text_file') as extract:
+        assert processor.extract_text(document) == (content, metadata)
+        extract.assert_not_called()
+
+    document.write_text('Новые требования к поставщику', encoding='utf-8')
+    st = document.stat()
+    os.utime(document, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert processor.extract_text(document)[0] == 'Новые требования к поставщику'
+    assert processor.parse_cache.get_stats()['hits'] == 1
+
+
+def test_clear_removes_entries(tmp_path):
+    """Test clearing the cache."""
+    document = tmp_path / 'document.txt'
+    document.write_text('text', encoding='utf-8')
+    cache = ParseCache(tmp_path / 'parsed')
+    key = cache.key_for(document)
+    cache.put(key, 'text', {'file_type': 'text'})
+    assert cache.get(key) == ('text', {'file_type': 'text'})
+
+    cache.clear()
+    assert cache.get(key) is None
+    assert cache.key_for(tmp_path / 'missing.txt') is None
+
+
+def test_oldest_entries_are_pruned(tmp_path):
+    """Test the number of entries stays bounded and the newest are kept."""
+    cache = ParseCache(tmp_path / 'parsed', max_entries=10)
+    for i in range(11):
+        cache.put(f'key{i}', f'text{i}', {})
+        entry = tmp_path / 'parsed' / f'key{i}.json'
+        os.utime(entry, ns=(i * 1_000_000_000, i * 1_000_000_000))
+
+    entries = sorted(p.stem for p in (tmp_path / 'parsed').glob('*.json'))
+    assert len(entries) == 9
+    assert 'key0' not in entries and 'key1' not in entries
+    assert cache.get('key10') == ('text10', {})
+    assert (tmp_path / 'parsed').stat().st_mode & 0o777 == 0o700
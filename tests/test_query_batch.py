@@ -0,0 +1,81 @@
+"""Tests for batched and streamed query processing."""
+
+from unittest.mock import Mock
+
+import pytest
+
+from ai_agent.core.query_processor import QueryProcessor, QueryProcessorError
+from ai_agent.core.session_manager import SessionManager
+
+
+@pytest.fixture
+def query_processor():
+    """Create a query processor with mocked dependencies."""
+    document_manager = Mock()
+    ollama_client = Mock()
+    return QueryProcessor(
+        document_manager=document_manager,
+        session_manager=SessionManager(),
+        ollama_client=ollama_client,
+        show_decision_tree=False
+    )
+
+
+def _chunk(doc_id, score):
+    return {'content': 'text', 'metadata': {'document_id': doc_id, 'title': doc_id}, 'relevance_score': score}
+
+
+def test_process_batch_uses_single_search(query_processor):
+    """Test all queries are searched at once and answered in order."""
+    query_processor.document_manager.search_similar_chunks_batch.return_value = [
+        [_chunk('doc1', 0.8)],
+        []
+    ]
+    query_processor.ollama_client.generate_response.side_effect = (
+        lambda prompt, system_prompt: 'ответ 1' if 'первый' in prompt else 'ответ 2'
+    )
+    session_id = query_processor.session_manager.create_session()
+
+    responses = query_processor.process_batch(['первый вопрос', 'второй вопрос'], session_id)
+
+    query_processor.document_manager.search_similar_chunks_batch.assert_called_once_with(
+        ['первый вопрос', 'второй вопрос'], top_k=5
+    )
+    assert [r.response for r in responses] == ['ответ 1', 'ответ 2']
+    assert responses[0].relevant_documents == ['doc1']
+    assert responses[0].confidence_score == pytest.approx(0.8)
+    assert responses[1].confidence_score == pytest.approx(0.3)
+
+    history = query_processor.session_manager.get_session_history(session_id)
+    assert [m.content for m in history] == ['первый вопрос', 'ответ 1', 'второй вопрос', 'ответ 2']
+
+
+def test_process_batch_generation_error(query_processor):
+    """Test generation failure is reported as QueryProcessorError."""
+    query_processor.document_manager.search_similar_chunks_batch.return_value = [[]]
+    query_processor.ollama_client.generate_response.side_effect = Exception("Connection refused")
+    session_id = query_processor.session_manager.create_session()
+
+    with pytest.raises(QueryProcessorError):
+        query_processor.process_batch(['вопрос'], session_id)
+
+
+def test_process_general_query_stream(query_processor):
+    """Test streamed chunks are yielded and the final response is returned."""
+    query_processor.document_manager.search_similar_chunks.return_value = [_chunk('doc1', 0.9)]
+    query_processor.ollama_client.generate_response_stream.return_value = iter(['От', 'вет'])
+    session_id = query_processor.session_manager.create_session()
+
+    stream = query_processor.process_general_query_stream('вопрос', session_id)
+    chunks = []
+    with pytest.raises(StopIteration) as stop:
+        while True:
+            chunks.append(next(stream))
+
+    response = stop.value.value
+    assert chunks == ['От', 'вет']
+    assert response.response == 'Ответ'
+    assert response.relevant_documents == ['doc1']
+
+    history = query_processor.session_manager.get_session_history(session_id)
+    assert [m.content for m in history] == ['вопрос', 'Ответ']